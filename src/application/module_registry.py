@@ -38,6 +38,7 @@ def register_modules(app: FastAPI):
     strategies_module = StrategiesModule(
         root=providers.DependenciesContainer(
             db_client=root_container.db_client,
+            config=root_container.config,
             pipeline_service=feature_module.service,
         ),
     )
@@ -0,0 +1,25 @@
+"""
+Decorador `njit` con fallback: si numba está instalado compila la función,
+si no la deja como Python puro (mismo resultado, sin JIT).
+`prange` cae a `range` (loops paralelos → secuenciales).
+"""
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba es opcional
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # Soporta tanto @njit como @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn):
+            return fn
+
+        return decorator
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
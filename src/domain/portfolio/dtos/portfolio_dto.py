@@ -1,7 +1,8 @@
 from typing import Dict
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class PortfolioDTO(BaseModel):
+    model_config = ConfigDict(frozen=True)
     cash_balance: float
     positions: Dict[str, float]
@@ -1,7 +1,10 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections import namedtuple
+from math import isclose
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
 
-from src.domain.portfolio.portfolio_service import PortfolioService
 from src.domain.portfolio.dtos.portfolio_dto import PortfolioDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
 from src.commons.enums.signal_enums import (
@@ -10,18 +13,88 @@ from src.commons.enums.signal_enums import (
     SignalSourceEnum,
 )
 
+if TYPE_CHECKING:
+    from src.domain.portfolio.portfolio_service import PortfolioService
 
-@pytest.fixture
+# Solo se leen .symbol y .weight de cada modelo de weights
+Weight = namedtuple("Weight", ("symbol", "weight"))
+
+# Un único event loop para todo el módulo (los tests solo awaitean mocks)
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+def _pdto(cash, positions):
+    """PortfolioDTO sin validación (inputs literales de confianza)."""
+    return PortfolioDTO.model_construct(cash_balance=cash, positions=positions)
+
+
+# Señales invariantes: los DTOs son frozen, se comparten entre tests
+BUY_AAPL_STRONG = SignalDTO.model_construct(
+    symbol="AAPL",
+    signal_source=SignalSourceEnum.MOMENTUM,
+    signal_type=SignalTypeEnum.BUY,
+    confidence=0.8,
+    strength=SignalStrengthEnum.STRONG,
+    price=150.0,
+)
+
+HOLD_SIGNAL = SignalDTO.model_construct(
+    symbol="AAPL",
+    signal_source=SignalSourceEnum.MOMENTUM,
+    signal_type=SignalTypeEnum.HOLD,
+    confidence=0.5,
+    strength=SignalStrengthEnum.MODERATE,
+    price=150.0,
+)
+
+# Estas sí pasan por validación: el test verifica que el DTO acepta
+# precios inválidos y que es el servicio quien los descarta
+NO_PRICE_SIGNAL = SignalDTO(
+    symbol="AAPL",
+    signal_source=SignalSourceEnum.TREND,
+    signal_type=SignalTypeEnum.BUY,
+    confidence=0.8,
+    strength=SignalStrengthEnum.STRONG,
+    price=None,
+)
+NEGATIVE_PRICE_SIGNAL = SignalDTO(
+    symbol="AAPL",
+    signal_source=SignalSourceEnum.TREND,
+    signal_type=SignalTypeEnum.BUY,
+    confidence=0.8,
+    strength=SignalStrengthEnum.STRONG,
+    price=-100.0,
+)
+
+
+def aret(value):
+    """Async callable que devuelve siempre `value` (sin la maquinaria de AsyncMock)."""
+    async def _ret(*args, **kwargs):
+        return value
+    return _ret
+
+
+class _SessionCM:
+    """Async context manager mínimo que imita PostgresClient.get_session()."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self.session
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+@pytest.fixture(scope="module")
 def mock_db_client():
-    """Mock del cliente de base de datos."""
-    client = MagicMock()
+    """Stub del cliente de base de datos (sin estado que resetear)."""
     session = AsyncMock()
-    client.get_session.return_value.__aenter__.return_value = session
-    client.get_session.return_value.__aexit__.return_value = None
-    return client
+    return SimpleNamespace(get_session=lambda: _SessionCM(session))
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_optimizer():
     """Mock del optimizador."""
     optimizer = MagicMock()
@@ -29,28 +102,27 @@ def mock_optimizer():
     return optimizer
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_extractor():
-    """Mock del extractor OHLCVService."""
-    extractor = MagicMock()
-    extractor.get_lastest_price = AsyncMock(return_value=150.0)
-    return extractor
+    """Mock del extractor OHLCVService (defaults en reset_mocks)."""
+    return MagicMock()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_broker():
-    """Mock del BrokerClient."""
-    broker = MagicMock()
-    broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=10000.0,
-        positions={},
-    ))
-    return broker
+    """Mock del BrokerClient (defaults en reset_mocks)."""
+    return MagicMock()
+
 
+@pytest.fixture(scope="module")
+def portfolio_service(
+    mock_db_client, mock_extractor, mock_optimizer, mock_broker
+) -> "PortfolioService":
+    """Instancia del servicio con mocks, compartida por todo el módulo."""
+    # Import diferido: arrastra SQLAlchemy / repositorios, que solo hacen
+    # falta cuando algún test del worker pide el servicio
+    from src.domain.portfolio.portfolio_service import PortfolioService
 
-@pytest.fixture
-def portfolio_service(mock_db_client, mock_extractor, mock_optimizer, mock_broker):
-    """Instancia del servicio con mocks."""
     return PortfolioService(
         db_client=mock_db_client,
         extractor=mock_extractor,
@@ -59,723 +131,319 @@ def portfolio_service(mock_db_client, mock_extractor, mock_optimizer, mock_broke
     )
 
 
-def create_mock_weights_repo(weights_dict):
-    """Helper para crear mock de weights que retorna lista de objetos."""
-    if weights_dict is None:
-        return None
-    weights_list = []
-    for symbol, weight in weights_dict.items():
-        w = MagicMock()
-        w.symbol = symbol
-        w.weight = weight
-        weights_list.append(w)
-    return weights_list
-
-
-# ==================== TESTS DE SEÑALES BUY ====================
-
-
-@pytest.mark.asyncio
-async def test_buy_signal_first_purchase(portfolio_service, mock_broker):
+@pytest.fixture(autouse=True)
+def reset_mocks(mock_extractor, mock_optimizer, mock_broker):
     """
-    Señal BUY para símbolo no existente en portfolio (primera compra).
+    Los colaboradores viven a nivel módulo: antes de cada test se resetean
+    y se restauran los defaults que los tests pueden haber pisado.
     """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=10000.0,
-        positions={},
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.15})
-        )
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        expected_order = 10000.0 * 0.15 / 150.0  # 10 units
-        assert pytest.approx(order_size, rel=1e-2) == expected_order
-        assert order_size > 0
+    for mock in (mock_extractor, mock_optimizer, mock_broker):
+        mock.reset_mock()
+    mock_extractor.get_lastest_price = aret(150.0)
+    mock_broker.get_portfolio = aret(_pdto(10000.0, {}))
 
 
-@pytest.mark.asyncio
-async def test_buy_signal_incremental_purchase(portfolio_service, mock_broker, mock_extractor):
+@pytest.fixture(autouse=True)
+def weights_repo(monkeypatch):
     """
-    Señal BUY para símbolo que ya tiene posición (compra incremental).
+    Parchea PortfolioWeightsRepository una sola vez por test.
+    Por defecto no hay weights activos; cada test setea los suyos.
     """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=5000.0,
-        positions={"AAPL": 20.0},  # 20 * 150 = 3,000
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.TREND,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.9,
-        strength=SignalStrengthEnum.EXTREME,
-        price=150.0,
+    repo = MagicMock()
+    repo.get_active_weights = aret([])
+    monkeypatch.setattr(
+        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository",
+        lambda *args, **kwargs: repo,
     )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.50})
+    return repo
+
+
+@pytest.fixture(scope="module")
+def make_signal():
+    """Factory de señales con los defaults que comparten los tests."""
+    def _make(signal_type, price=150.0, symbol="AAPL", **kwargs):
+        kwargs.setdefault("signal_source", SignalSourceEnum.MOMENTUM)
+        kwargs.setdefault("confidence", 0.8)
+        kwargs.setdefault("strength", SignalStrengthEnum.STRONG)
+        return SignalDTO.model_construct(
+            symbol=symbol,
+            signal_type=signal_type,
+            price=price,
+            **kwargs,
         )
+    return _make
 
-        mock_extractor.get_lastest_price = AsyncMock(return_value=150.0)
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        # Total portfolio value: 5000 (cash) + 20*150 (AAPL) = 8000
-        # Target: 8000 * 0.50 = 4000
-        # Current value: 20 * 150 = 3000
-        # Need: 4000 - 3000 = 1000
-        # Order size: 1000 / 150 = 6.67 units
-        expected_order = 1000.0 / 150.0
-        assert pytest.approx(order_size, rel=1e-2) == expected_order
 
+def make_price_fn(prices):
+    """Async get_lastest_price que retorna precios diferentes según el símbolo."""
+    async def _get_price(symbol, **_):
+        return prices.get(symbol, 100.0)
+    return _get_price
 
-@pytest.mark.asyncio
-async def test_buy_signal_already_above_target(portfolio_service, mock_broker, mock_extractor):
-    """
-    Señal BUY pero la posición ya está por encima del target weight.
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=2500.0,
-        positions={"AAPL": 50.0},  # 50 * 150 = 7,500
-    ))
 
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.VOLUME,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.7,
-        strength=SignalStrengthEnum.MODERATE,
-        price=150.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.50})
-        )
-
-        mock_extractor.get_lastest_price = AsyncMock(return_value=150.0)
-
-        order_size = await portfolio_service.compute_order_size(signal)
+def create_mock_weights_repo(weights_dict):
+    """Helper para crear la lista de weights (symbol, weight) del repo."""
+    if weights_dict is None:
+        return None
+    return [Weight(symbol, weight) for symbol, weight in weights_dict.items()]
 
-        # Total: 2500 + 7500 = 10000
-        # Target: 10000 * 0.50 = 5000
-        # Current: 50 * 150 = 7500
-        # Ya está por encima, no comprar
-        assert order_size == 0.0
 
+# ==================== TESTS DE SEÑALES BUY ====================
 
-@pytest.mark.asyncio
-async def test_buy_signal_zero_target_weight(portfolio_service, mock_broker):
-    """
-    Señal BUY pero el target weight es 0 (no está en el portfolio óptimo).
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=10000.0,
-        positions={},
-    ))
 
-    signal = SignalDTO(
-        symbol="TSLA",
-        signal_source=SignalSourceEnum.VOLATILITY,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.6,
-        strength=SignalStrengthEnum.WEAK,
-        price=200.0,
+BUY_CASES = [
+    # Primera compra: 10000 * 0.15 / 150 = 10 units
+    dict(
+        id="first_purchase",
+        cash=10000.0, positions={}, weights={"AAPL": 0.15},
+        expected=10.0,
+    ),
+    # Total: 5000 + 20*150 = 8000 → target 4000, current 3000
+    # Need: 1000 / 150 = 6.67 units
+    dict(
+        id="incremental_purchase",
+        cash=5000.0, positions={"AAPL": 20.0}, weights={"AAPL": 0.50},
+        expected=1000.0 / 150.0,
+    ),
+    # Total: 2500 + 7500 = 10000 → target 5000 < current 7500
+    dict(
+        id="already_above_target",
+        cash=2500.0, positions={"AAPL": 50.0}, weights={"AAPL": 0.50},
+        expected=0.0,
+    ),
+    # TSLA no está en el portfolio óptimo
+    dict(
+        id="zero_target_weight",
+        symbol="TSLA", price=200.0,
+        cash=10000.0, positions={},
+        weights={"AAPL": 0.30, "MSFT": 0.40, "GOOGL": 0.30},
+        expected=0.0,
+    ),
+    # Portfolio con valor total en 0
+    dict(
+        id="zero_total_portfolio_value",
+        cash=0.0, positions={}, weights={"AAPL": 0.15},
+        expected=0.0,
+    ),
+    # Sin cash, no puede comprar nada
+    dict(
+        id="no_cash_available",
+        cash=0.0, positions={"AAPL": 50.0}, weights={"AAPL": 0.80},
+        expected=0.0,
+    ),
+    # Total: 1000 + 3000 = 4000 → target 4000, current 3000
+    # Necesita 1000 y tiene 1000: 1000 / 150 = 6.67 units
+    dict(
+        id="exact_cash_needed",
+        cash=1000.0, positions={"AAPL": 20.0}, weights={"AAPL": 1.00},
+        expected=1000.0 / 150.0,
+    ),
+    # Cash negativo (edge case raro pero posible)
+    dict(
+        id="negative_cash_balance",
+        cash=-100.0, positions={"AAPL": 50.0}, weights={"AAPL": 0.90},
+        expected=0.0,
+    ),
+    # Total portfolio: 5000 + (20*150) + (30*200) + (10*600) = 20000
+    # Target MSFT: 20000 * 0.40 = 8000, current: 30 * 200 = 6000
+    # Need: 2000 / 200 = 10 units
+    dict(
+        id="multiple_positions",
+        symbol="MSFT", price=200.0,
+        cash=5000.0,
+        positions={"AAPL": 20.0, "MSFT": 30.0, "GOOGL": 10.0},
+        weights={"AAPL": 0.30, "MSFT": 0.40, "GOOGL": 0.30},
+        prices={"AAPL": 150.0, "MSFT": 200.0, "GOOGL": 600.0},
+        expected=2000.0 / 200.0,
+    ),
+    # Total: 300 + 7500 + 2000 = 9800 → target 7840, current 7500
+    # Necesita 340 pero solo tiene 300: 300 / 150 = 2 units
+    dict(
+        id="insufficient_cash",
+        cash=300.0,
+        positions={"AAPL": 50.0, "MSFT": 10.0},
+        weights={"AAPL": 0.80, "MSFT": 0.20},
+        prices={"AAPL": 150.0, "MSFT": 200.0},
+        expected=300.0 / 150.0,
+    ),
+    # Total: 500 + 1500 + 1000 + 1200 = 4200 → target MSFT 1680, current 1000
+    # Necesita 680 pero solo tiene 500: 500 / 200 = 2.5 units
+    dict(
+        id="partial_cash_multiple_symbols",
+        symbol="MSFT", price=200.0,
+        cash=500.0,
+        positions={"AAPL": 10.0, "MSFT": 5.0, "GOOGL": 2.0},
+        weights={"AAPL": 0.30, "MSFT": 0.40, "GOOGL": 0.30},
+        prices={"AAPL": 150.0, "MSFT": 200.0, "GOOGL": 600.0},
+        expected=500.0 / 200.0,
+    ),
+]
+
+
+@pytest.mark.parametrize("case", BUY_CASES, ids=lambda c: c["id"])
+async def test_buy_signal_order_size(
+    portfolio_service,
+    mock_broker,
+    mock_extractor,
+    weights_repo,
+    make_signal,
+    case,
+):
+    """
+    Señal BUY: el order size depende de cash, posiciones, precios y target weight.
+    """
+    mock_broker.get_portfolio = aret(_pdto(case["cash"], case["positions"]))
+    weights_repo.get_active_weights = aret(
+        create_mock_weights_repo(case["weights"])
     )
 
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
+    if "prices" in case:
+        mock_extractor.get_lastest_price = make_price_fn(case["prices"])
 
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo(
-                {"AAPL": 0.30, "MSFT": 0.40, "GOOGL": 0.30})
-        )
+    signal = make_signal(
+        SignalTypeEnum.BUY,
+        price=case.get("price", 150.0),
+        symbol=case.get("symbol", "AAPL"),
+    )
 
-        order_size = await portfolio_service.compute_order_size(signal)
+    order_size = await portfolio_service.compute_order_size(signal)
 
-        assert order_size == 0.0
+    assert isclose(order_size, case["expected"], rel_tol=1e-2), (
+        order_size, case["expected"])
 
 
 # ==================== TESTS DE SEÑALES SELL ====================
 
 
-@pytest.mark.asyncio
-async def test_sell_signal_full_position(portfolio_service, mock_broker):
+async def test_sell_signal_full_position(portfolio_service, mock_broker, make_signal):
     """
     Señal SELL con posición existente (cierre completo).
     """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=5000.0,
-        positions={"AAPL": 30.0},
-    ))
+    mock_broker.get_portfolio = aret(_pdto(5000.0, {"AAPL": 30.0}))
 
-    signal = SignalDTO(
-        symbol="AAPL",
+    signal = make_signal(
+        SignalTypeEnum.SELL,
         signal_source=SignalSourceEnum.RISK,
-        signal_type=SignalTypeEnum.SELL,
         confidence=0.85,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
     )
 
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(return_value=[])
-
-        order_size = await portfolio_service.compute_order_size(signal)
+    order_size = await portfolio_service.compute_order_size(signal)
 
-        assert order_size == -30.0
+    assert order_size == -30.0
 
 
-@pytest.mark.asyncio
-async def test_sell_signal_no_position(portfolio_service, mock_broker):
+async def test_sell_signal_no_position(portfolio_service, mock_broker, make_signal):
     """
     Señal SELL pero no hay posición del símbolo.
     """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=10000.0,
-        positions={"MSFT": 20.0},  # Solo MSFT
-    ))
+    mock_broker.get_portfolio = aret(_pdto(10000.0, {"MSFT": 20.0}))  # Solo MSFT
 
-    signal = SignalDTO(
-        symbol="AAPL",
+    signal = make_signal(
+        SignalTypeEnum.SELL,
         signal_source=SignalSourceEnum.STRUCTURE,
-        signal_type=SignalTypeEnum.SELL,
         confidence=0.75,
         strength=SignalStrengthEnum.MODERATE,
-        price=150.0,
     )
 
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(return_value=[])
-
-        order_size = await portfolio_service.compute_order_size(signal)
+    order_size = await portfolio_service.compute_order_size(signal)
 
-        assert order_size == 0.0
+    assert order_size == 0.0
 
 
 # ==================== TESTS DE CASOS EDGE ====================
 
 
-@pytest.mark.asyncio
 async def test_no_portfolio_from_broker(portfolio_service, mock_broker):
     """
     Broker no retorna portfolio (None).
     """
-    mock_broker.get_portfolio = AsyncMock(return_value=None)
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
-    )
+    mock_broker.get_portfolio = aret(None)
 
-    order_size = await portfolio_service.compute_order_size(signal)
+    order_size = await portfolio_service.compute_order_size(BUY_AAPL_STRONG)
 
     assert order_size == 0.0
 
 
-@pytest.mark.asyncio
 async def test_invalid_price_in_signal(portfolio_service):
     """
     Señal con precio inválido (None o negativo).
     """
     # --- Señal sin precio ---
-    signal_no_price = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.TREND,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=None,
-    )
-
-    order_size = await portfolio_service.compute_order_size(signal_no_price)
+    order_size = await portfolio_service.compute_order_size(NO_PRICE_SIGNAL)
     assert order_size == 0.0
 
     # --- Señal con precio negativo ---
-    signal_negative_price = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.TREND,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=-100.0,
-    )
-
-    order_size = await portfolio_service.compute_order_size(signal_negative_price)
+    order_size = await portfolio_service.compute_order_size(NEGATIVE_PRICE_SIGNAL)
     assert order_size == 0.0
 
 
-@pytest.mark.asyncio
-async def test_zero_total_portfolio_value(portfolio_service, mock_broker):
-    """
-    Portfolio con valor total en 0 o negativo.
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=0.0,
-        positions={},
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.15})
-        )
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        assert order_size == 0.0
-
-
-@pytest.mark.asyncio
-async def test_no_active_weights(portfolio_service, mock_broker):
+async def test_no_active_weights(portfolio_service, mock_broker, weights_repo, make_signal):
     """
     No hay weights activos del optimizador.
     """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=10000.0,
-        positions={},
-    ))
+    mock_broker.get_portfolio = aret(_pdto(10000.0, {}))
+    weights_repo.get_active_weights = aret(None)
 
-    signal = SignalDTO(
-        symbol="AAPL",
+    signal = make_signal(
+        SignalTypeEnum.BUY,
         signal_source=SignalSourceEnum.VOLATILITY,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
     )
 
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(return_value=None)
-
-        order_size = await portfolio_service.compute_order_size(signal)
+    order_size = await portfolio_service.compute_order_size(signal)
 
-        assert order_size == 0.0
+    assert order_size == 0.0
 
 
 # ==================== TESTS DE VALIDACIÓN DE CONSTRAINTS ====================
 
 
-@pytest.mark.asyncio
-async def test_buy_with_constraints_validation(portfolio_service, mock_broker):
+async def test_buy_with_constraints_validation(
+    portfolio_service, mock_broker, weights_repo, make_signal, monkeypatch
+):
     """
     Señal BUY que debe pasar por validate_weights (constraints).
     """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=10000.0,
-        positions={},
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=100.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo, patch(
-        "src.domain.portfolio.portfolio_service.validate_weights"
-    ) as mock_validate:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.20})
-        )
-
-        mock_validate.return_value = {"AAPL": 0.20}
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        mock_validate.assert_called_once()
-
-        # Order size esperado: 20 units (10000 * 0.20 / 100)
-        assert pytest.approx(order_size, rel=1e-2) == 20.0
-
-
-# ==================== TEST DE MÚLTIPLES POSICIONES ====================
-
-
-@pytest.mark.asyncio
-async def test_multiple_positions_portfolio(portfolio_service, mock_broker, mock_extractor):
-    """
-    Portfolio con múltiples posiciones, señal para una de ellas.
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=5000.0,
-        positions={
-            "AAPL": 20.0,   # @ 150 = 3,000
-            "MSFT": 30.0,   # @ 200 = 6,000
-            "GOOGL": 10.0,  # @ 600 = 6,000
-        },
+    mock_broker.get_portfolio = aret(_pdto(10000.0, {}))
+    weights_repo.get_active_weights = aret(create_mock_weights_repo(
+        {"AAPL": 0.20}
     ))
 
-    signal = SignalDTO(
-        symbol="MSFT",
-        signal_source=SignalSourceEnum.TREND,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.9,
-        strength=SignalStrengthEnum.EXTREME,
-        price=200.0,
+    mock_validate = MagicMock(return_value={"AAPL": 0.20})
+    monkeypatch.setattr(
+        "src.domain.portfolio.portfolio_service.validate_weights",
+        mock_validate,
     )
 
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({
-                "AAPL": 0.30,
-                "MSFT": 0.40,
-                "GOOGL": 0.30,
-            })
-        )
-
-        async def get_price_side_effect(symbol, **_):
-            """Retorna precios diferentes según el símbolo."""
-            prices = {
-                "AAPL": 150.0,
-                "MSFT": 200.0,
-                "GOOGL": 600.0,
-            }
-            return prices.get(symbol, 100.0)
+    signal = make_signal(SignalTypeEnum.BUY, price=100.0)
 
-        mock_extractor.get_lastest_price = get_price_side_effect
+    order_size = await portfolio_service.compute_order_size(signal)
 
-        order_size = await portfolio_service.compute_order_size(signal)
+    mock_validate.assert_called_once()
 
-        # Total portfolio: 5000 + (20*150) + (30*200) + (10*600)
-        #                = 5000 + 3000 + 6000 + 6000 = 20000
-        # Target for MSFT: 20000 * 0.40 = 8000
-        # Current MSFT value: 30 * 200 = 6000
-        # Need: 8000 - 6000 = 2000
-        # Order size: 2000 / 200 = 10 units
-        expected_order = 2000.0 / 200.0
-        assert pytest.approx(order_size, rel=1e-2) == expected_order
+    # Order size esperado: 20 units (10000 * 0.20 / 100)
+    assert pytest.approx(order_size, rel=1e-2) == 20.0
 
 
 # ==================== TEST DE EXCEPCIÓN ====================
 
 
-@pytest.mark.asyncio
 async def test_exception_handling(portfolio_service, mock_broker):
     """
     Se lanza una excepción durante el proceso.
     """
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
-    )
-
     mock_broker.get_portfolio = AsyncMock(
         side_effect=Exception("Broker connection error")
     )
 
     with pytest.raises(Exception, match="Broker connection error"):
-        await portfolio_service.compute_order_size(signal)
-
-
-# ==================== TESTS DE CASH LIMITADO ====================
-
-
-@pytest.mark.asyncio
-async def test_buy_signal_insufficient_cash(portfolio_service, mock_broker, mock_extractor):
-    """
-    Señal BUY con cash insuficiente para alcanzar el target completo.
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=300.0,  # Solo $300 disponible
-        positions={
-            "AAPL": 50.0,  # $7,500
-            "MSFT": 10.0,  # $2,000
-        },
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.9,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.80, "MSFT": 0.20})
-        )
-
-        async def get_price_side_effect(symbol, **_):
-            prices = {"AAPL": 150.0, "MSFT": 200.0}
-            return prices.get(symbol, 100.0)
-
-        mock_extractor.get_lastest_price = get_price_side_effect
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        # Total value: 300 + 7500 + 2000 = 9800
-        # Target: 9800 * 0.80 = 7840
-        # Current: 7500
-        # Necesita: 340
-        # Solo tiene: 300
-        # Debería comprar: 300 / 150 = 2 units
-        expected_order = 300.0 / 150.0
-        assert pytest.approx(order_size, rel=1e-2) == expected_order
-
-
-@pytest.mark.asyncio
-async def test_buy_signal_no_cash_available(portfolio_service, mock_broker, mock_extractor):
-    """
-    Señal BUY pero NO hay cash disponible (cash = 0).
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=0.0,  # Sin cash
-        positions={"AAPL": 50.0},  # $7,500
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.9,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.80})
-        )
+        await portfolio_service.compute_order_size(BUY_AAPL_STRONG)
 
-        mock_extractor.get_lastest_price = AsyncMock(return_value=150.0)
 
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        # Sin cash, no puede comprar nada
-        assert order_size == 0.0
-
-
-@pytest.mark.asyncio
-async def test_buy_signal_partial_cash_multiple_symbols(portfolio_service, mock_broker, mock_extractor):
-    """
-    Señal BUY con cash limitado en portfolio con múltiples posiciones.
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=500.0,  # $500 disponible
-        positions={
-            "AAPL": 10.0,   # $1,500
-            "MSFT": 5.0,    # $1,000
-            "GOOGL": 2.0,   # $1,200
-        },
-    ))
-
-    signal = SignalDTO(
-        symbol="MSFT",
-        signal_source=SignalSourceEnum.TREND,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.85,
-        strength=SignalStrengthEnum.STRONG,
-        price=200.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({
-                "AAPL": 0.30,
-                "MSFT": 0.40,
-                "GOOGL": 0.30,
-            })
-        )
-
-        async def get_price_side_effect(symbol, **_):
-            prices = {
-                "AAPL": 150.0,
-                "MSFT": 200.0,
-                "GOOGL": 600.0,
-            }
-            return prices.get(symbol, 100.0)
-
-        mock_extractor.get_lastest_price = get_price_side_effect
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        # Total: 500 + 1500 + 1000 + 1200 = 4200
-        # Target MSFT: 4200 * 0.40 = 1680
-        # Current MSFT: 1000
-        # Necesita: 680
-        # Solo tiene: 500
-        # Compra: 500 / 200 = 2.5 units
-        expected_order = 500.0 / 200.0
-        assert pytest.approx(order_size, rel=1e-2) == expected_order
-
-
-@pytest.mark.asyncio
-async def test_buy_signal_exact_cash_needed(portfolio_service, mock_broker, mock_extractor):
-    """
-    Señal BUY donde el cash disponible es exactamente lo que se necesita.
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=1000.0,
-        positions={"AAPL": 20.0},
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.95,
-        strength=SignalStrengthEnum.EXTREME,
-        price=150.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo(
-                {"AAPL": 1.00})  # 100% en AAPL
-        )
-
-        mock_extractor.get_lastest_price = AsyncMock(return_value=150.0)
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        # Total: 1000 + 3000 = 4000
-        # Target: 4000 * 1.00 = 4000
-        # Current: 3000
-        # Necesita: 1000
-        # Tiene: 1000
-        # Compra: 1000 / 150 = 6.67 units
-        expected_order = 1000.0 / 150.0
-        assert pytest.approx(order_size, rel=1e-2) == expected_order
-
-
-@pytest.mark.asyncio
-async def test_buy_signal_negative_cash_balance(portfolio_service, mock_broker, mock_extractor):
-    """
-    Señal BUY con cash balance negativo (edge case raro pero posible).
-    """
-    mock_broker.get_portfolio = AsyncMock(return_value=PortfolioDTO(
-        cash_balance=-100.0,  # Cash negativo
-        positions={"AAPL": 50.0},
-    ))
-
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.BUY,
-        confidence=0.8,
-        strength=SignalStrengthEnum.STRONG,
-        price=150.0,
-    )
-
-    with patch(
-        "src.domain.portfolio.portfolio_service.PortfolioWeightsRepository"
-    ) as MockWeightsRepo:
-
-        mock_weights_repo = MockWeightsRepo.return_value
-        mock_weights_repo.get_active_weights = AsyncMock(
-            return_value=create_mock_weights_repo({"AAPL": 0.90})
-        )
-
-        mock_extractor.get_lastest_price = AsyncMock(return_value=150.0)
-
-        order_size = await portfolio_service.compute_order_size(signal)
-
-        assert order_size == 0.0
-
-
-@pytest.mark.asyncio
 async def test_hold_signal_no_action(portfolio_service):
     """
     Señal HOLD (no se espera acción de compra o venta).
     """
-    signal = SignalDTO(
-        symbol="AAPL",
-        signal_source=SignalSourceEnum.MOMENTUM,
-        signal_type=SignalTypeEnum.HOLD,
-        confidence=0.5,
-        strength=SignalStrengthEnum.MODERATE,
-        price=150.0,
-    )
-
-    order_size = await portfolio_service.compute_order_size(signal)
+    order_size = await portfolio_service.compute_order_size(HOLD_SIGNAL)
 
     assert order_size == 0.0
 
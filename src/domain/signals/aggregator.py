@@ -1,6 +1,8 @@
 import logging
+from bisect import bisect_right
 from datetime import datetime
-from typing import Iterable, List, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Iterable, List, Dict, Mapping, Optional, Tuple
 
 from src.domain.signals.dtos.signal_dto import SignalDTO
 from src.commons.enums.signal_enums import (
@@ -11,6 +13,43 @@ from src.commons.enums.signal_enums import (
 
 logger = logging.getLogger(__name__)
 
+# Miembros de enums como globals del módulo: evitamos el lookup en EnumMeta
+# en cada comparación del loop de agregación.
+_BUY = SignalTypeEnum.BUY
+_SELL = SignalTypeEnum.SELL
+_EXIT = SignalTypeEnum.EXIT
+_HOLD = SignalTypeEnum.HOLD
+_ALERT = SignalTypeEnum.ALERT
+_EXTREME = SignalStrengthEnum.EXTREME
+_RISK = SignalSourceEnum.RISK
+
+# Fuentes cuyas ALERTs matizan riesgo (volumen, volatilidad, riesgo)
+_RISK_SOURCES = frozenset({
+    SignalSourceEnum.VOLUME,
+    SignalSourceEnum.VOLATILITY,
+    _RISK,
+})
+_DIRECTIONAL = frozenset({_BUY, _SELL, _EXIT, _HOLD})
+
+# Contexto sin alertas de riesgo (caso común): singleton de solo lectura
+_NO_RISK_CONTEXT: Mapping[str, Any] = MappingProxyType({
+    "has_risk_alerts": False,
+    "high_volatility": False,
+    "volume_spike": False,
+    "risk_events": False,
+    "extreme_conditions": False,
+    "risk_alerts_count": 0,
+})
+
+# Score agregado → strength: WEAK < 0.7 ≤ MODERATE < 1.2 ≤ STRONG < 1.8 ≤ EXTREME
+_STRENGTH_THRESHOLDS = (0.7, 1.2, 1.8)
+_STRENGTH_LEVELS = (
+    SignalStrengthEnum.WEAK,
+    SignalStrengthEnum.MODERATE,
+    SignalStrengthEnum.STRONG,
+    _EXTREME,
+)
+
 
 class SignalAggregator:
     """
@@ -35,39 +74,130 @@ class SignalAggregator:
     MIN_SCORE: float = 0.4    # score mínimo para animarse a tomar acción
     MIN_MARGIN: float = 0.15  # diferencia mínima entre el mejor y el segundo
 
-    def aggregate(self, signals: Iterable[SignalDTO]) -> Optional[SignalDTO]:
+    def aggregate(
+        self,
+        signals: Iterable[SignalDTO],
+        now: Optional[datetime] = None,
+    ) -> Optional[SignalDTO]:
+        """
+        `now` es el timestamp de la señal agregada; el pipeline puede pasar
+        el del bar para que el resultado sea determinístico.
+        """
         signals = [s for s in signals if s is not None]
 
         if not signals:
             logger.info("🔇 SignalAggregator: no signals to aggregate")
             return None
 
+        # Fast path: una sola señal direccional (caso común). Sin alertas ni
+        # competencia, best_score = su score y second_score = 0, así que las
+        # reglas de consenso se reducen a comparar contra los umbrales.
+        if len(signals) == 1:
+            only = signals[0]
+            signal_type = only.signal_type
+            score = only.confidence * self.STRENGTH_WEIGHTS.get(only.strength, 1.0)
+            if (
+                signal_type in _DIRECTIONAL
+                and score >= self.MIN_SCORE
+                and score >= self.MIN_MARGIN
+            ):
+                chosen_type = _SELL if signal_type == _EXIT else signal_type
+                logger.info(
+                    f"✅ Única señal → {chosen_type.value.upper()} "
+                    f"(score={score:.3f})"
+                )
+                return self._build_aggregated_signal(
+                    chosen_type=chosen_type,
+                    base_signal=only,
+                    signals_count=1,
+                    final_score=score,
+                    type_counts={signal_type.value: 1},
+                    source_counts={only.signal_source.value: 1},
+                    min_expires=only.expires_at,
+                    risk_context=_NO_RISK_CONTEXT,
+                    now=now,
+                )
+
         # ============================
-        #   0) Procesar ALERTS por source
+        #   0) Una sola pasada sobre las señales
         # ============================
-        alert_signals: List[SignalDTO] = [
-            s for s in signals if s.signal_type == SignalTypeEnum.ALERT
-        ]
+        # Clasificamos ALERTs, sumamos score por tipo normalizado (EXIT cuenta
+        # como SELL), contamos tipos/fuentes y buscamos la expiración más
+        # cercana y las mejores señales, todo en el mismo recorrido.
 
         # Alertas que SÍ matizan riesgo (volumen, volatilidad, riesgo)
-        risk_alerts: List[SignalDTO] = [
-            s
-            for s in alert_signals
-            if s.signal_source in {
-                SignalSourceEnum.VOLUME,
-                SignalSourceEnum.VOLATILITY,
-                SignalSourceEnum.RISK,
-            }
-        ]
-
-        # Alertas informativas (estructura, tendencia, etc.) que no afectan ejecución
-        ignored_alerts: List[SignalDTO] = [
-            s for s in alert_signals if s not in risk_alerts
-        ]
-
-        if ignored_alerts:
+        risk_alerts: List[SignalDTO] = []
+        # Alertas informativas (estructura, tendencia, etc.) que no afectan
+        # ejecución: solo interesa cuántas hay
+        ignored_alerts_count = 0
+
+        has_non_alert = False
+        # Score acumulado por tipo normalizado (BUY / SELL / HOLD)
+        buy_score = sell_score = hold_score = 0.0
+        best_by_type: Dict[SignalTypeEnum, Tuple[float, SignalDTO]] = {}
+        best_directional: Optional[SignalDTO] = None
+        best_directional_score = 0.0
+        best_alert: Optional[SignalDTO] = None
+        best_alert_score = 0.0
+
+        type_counts: Dict[str, int] = {}
+        source_counts: Dict[str, int] = {}
+        min_expires: Optional[datetime] = None
+
+        # Métodos ligados a locales: el loop no resuelve atributos de
+        # `self` ni de los dicts/listas en cada iteración.
+        # Mismo cálculo que `_score`, pero inline: una sola vez por señal.
+        weight_of = self.STRENGTH_WEIGHTS.get
+        type_count = type_counts.get
+        source_count = source_counts.get
+        add_risk_alert = risk_alerts.append
+        best_of_type = best_by_type.get
+
+        for s in signals:
+            score = s.confidence * weight_of(s.strength, 1.0)
+            signal_type = s.signal_type
+
+            t = signal_type.value
+            type_counts[t] = type_count(t, 0) + 1
+            src = s.signal_source.value
+            source_counts[src] = source_count(src, 0) + 1
+
+            expires_at = s.expires_at
+            if expires_at is not None and (
+                min_expires is None or expires_at < min_expires
+            ):
+                min_expires = expires_at
+
+            if signal_type == _ALERT:
+                if s.signal_source in _RISK_SOURCES:
+                    add_risk_alert(s)
+                else:
+                    ignored_alerts_count += 1
+                if best_alert is None or score > best_alert_score:
+                    best_alert, best_alert_score = s, score
+                continue
+
+            has_non_alert = True
+            if signal_type not in _DIRECTIONAL:
+                continue
+
+            normalized_type = _SELL if signal_type == _EXIT else signal_type
+            if normalized_type == _BUY:
+                buy_score += score
+            elif normalized_type == _SELL:
+                sell_score += score
+            else:
+                hold_score += score
+
+            best = best_of_type(normalized_type)
+            if best is None or score > best[0]:
+                best_by_type[normalized_type] = (score, s)
+            if best_directional is None or score > best_directional_score:
+                best_directional, best_directional_score = s, score
+
+        if ignored_alerts_count:
             logger.info(
-                f"ℹ️ Ignorando {len(ignored_alerts)} ALERT(s) no operativas "
+                f"ℹ️ Ignorando {ignored_alerts_count} ALERT(s) no operativas "
                 f"para la capa de riesgo."
             )
 
@@ -76,74 +206,50 @@ class SignalAggregator:
         # ============================
         #  1) Ignorar ALERTs para el voto operable
         # ============================
-        non_alert_signals: List[SignalDTO] = [
-            s for s in signals if s.signal_type != SignalTypeEnum.ALERT
-        ]
-
         # Si solo hay ALERTs → HOLD, pero con contexto de riesgo seteado
-        if not non_alert_signals:
-            best_alert = max(signals, key=self._score)
+        if not has_non_alert:
             logger.info(
                 f"📌 Solo ALERTs presentes, decisión operativa → HOLD "
                 f"(mejor ALERT conf={best_alert.confidence})"
             )
             return self._build_aggregated_signal(
-                chosen_type=SignalTypeEnum.HOLD,
+                chosen_type=_HOLD,
                 base_signal=best_alert,
-                signals=signals,
-                final_score=self._score(best_alert),
+                signals_count=len(signals),
+                final_score=best_alert_score,
+                type_counts=type_counts,
+                source_counts=source_counts,
+                min_expires=min_expires,
                 risk_context=risk_context,
+                now=now,
             )
 
         # ============================
         #  2) Direccionales relevantes para la decisión
         # ============================
-        directional_types = {
-            SignalTypeEnum.BUY,
-            SignalTypeEnum.SELL,
-            SignalTypeEnum.EXIT,
-            SignalTypeEnum.HOLD,
-        }
-
-        directional_signals: List[SignalDTO] = [
-            s for s in non_alert_signals if s.signal_type in directional_types
-        ]
-
-        if not directional_signals:
+        if best_directional is None:
             logger.info("🔇 SignalAggregator: no directional signals")
             return None
 
-        # === 2.1) Sumamos score por tipo normalizado (EXIT cuenta como SELL) ===
-        score_by_type: Dict[SignalTypeEnum, float] = {}
-
-        for s in directional_signals:
-            score = self._score(s)
-
-            normalized_type = (
-                SignalTypeEnum.SELL
-                if s.signal_type == SignalTypeEnum.EXIT
-                else s.signal_type
+        # Mejor y segundo score: compare-and-swap entre los tres tipos
+        if buy_score >= sell_score:
+            best_type, best_score, second_score = (
+                _BUY, buy_score, sell_score
             )
-
-            score_by_type[normalized_type] = (
-                score_by_type.get(normalized_type, 0.0) + score
+        else:
+            best_type, best_score, second_score = (
+                _SELL, sell_score, buy_score
             )
-
-        # Ordenamos por score total
-        sorted_types = sorted(
-            score_by_type.items(),
-            key=lambda kv: kv[1],
-            reverse=True,
-        )
-
-        best_type, best_score = sorted_types[0]
-        second_score = sorted_types[1][1] if len(sorted_types) > 1 else 0.0
+        if hold_score > best_score:
+            best_type, best_score, second_score = (
+                _HOLD, hold_score, best_score
+            )
+        elif hold_score > second_score:
+            second_score = hold_score
 
         logger.info(
-            "📊 Aggregation scores → "
-            + ", ".join(
-                f"{t.value}: {round(v, 3)}" for t, v in score_by_type.items()
-            )
+            f"📊 Aggregation scores → buy: {round(buy_score, 3)}, "
+            f"sell: {round(sell_score, 3)}, hold: {round(hold_score, 3)}"
         )
 
         # === 2.2) Decisión: ¿hay ganador claro? ===
@@ -152,7 +258,7 @@ class SignalAggregator:
                 f"🤝 Sin consenso claro (best_score={best_score:.3f}, "
                 f"second={second_score:.3f}) → HOLD"
             )
-            chosen_type = SignalTypeEnum.HOLD
+            chosen_type = _HOLD
         else:
             chosen_type = best_type  # BUY / SELL / HOLD
             logger.info(
@@ -163,40 +269,32 @@ class SignalAggregator:
         # === 2.3) Overlay de riesgo con ALERTS de volumen/volatilidad/riesgo ===
         # Regla conservadora: si hay condiciones EXTREME de riesgo, frenamos BUY.
         if (
-            chosen_type == SignalTypeEnum.BUY
+            chosen_type == _BUY
             and risk_context.get("extreme_conditions")
         ):
             logger.info(
                 "⚠️ Contexto EXTREME (volatilidad/volumen/riesgo). "
                 "Regla conservadora: degradamos BUY → HOLD."
             )
-            chosen_type = SignalTypeEnum.HOLD
+            chosen_type = _HOLD
 
         # ============================
         #  3) Elegimos una señal base del tipo ganador
         # ============================
-        def _normalized_type(s: SignalDTO) -> SignalTypeEnum:
-            if s.signal_type == SignalTypeEnum.EXIT:
-                return SignalTypeEnum.SELL
-            return s.signal_type
-
-        same_type_signals = [
-            s for s in directional_signals if _normalized_type(s) == chosen_type
-        ]
-
-        if same_type_signals:
-            base_signal = max(same_type_signals, key=lambda s: self._score(s))
-        else:
-            # fallback defensivo (no debería pasar)
-            base_signal = max(directional_signals,
-                              key=lambda s: self._score(s))
+        best = best_by_type.get(chosen_type)
+        # fallback defensivo (no debería pasar)
+        base_signal = best[1] if best is not None else best_directional
 
         return self._build_aggregated_signal(
             chosen_type=chosen_type,
             base_signal=base_signal,
-            signals=signals,
+            signals_count=len(signals),
             final_score=best_score,
+            type_counts=type_counts,
+            source_counts=source_counts,
+            min_expires=min_expires,
             risk_context=risk_context,
+            now=now,
         )
 
     # ======================================================
@@ -204,52 +302,38 @@ class SignalAggregator:
     # ======================================================
 
     def _score(self, s: SignalDTO) -> float:
-        strength_weight = self.STRENGTH_WEIGHTS.get(s.strength, 1.0)
-        return float(s.confidence) * float(strength_weight)
+        # confidence ya es float (validado por el DTO)
+        return s.confidence * self.STRENGTH_WEIGHTS.get(s.strength, 1.0)
 
     def _strength_from_score(self, score: float) -> SignalStrengthEnum:
-        if score >= 1.8:
-            return SignalStrengthEnum.EXTREME
-        if score >= 1.2:
-            return SignalStrengthEnum.STRONG
-        if score >= 0.7:
-            return SignalStrengthEnum.MODERATE
-        return SignalStrengthEnum.WEAK
+        # score >= umbral → siguiente nivel (bisect_right respeta el >=)
+        return _STRENGTH_LEVELS[bisect_right(_STRENGTH_THRESHOLDS, score)]
 
     def _build_risk_context(
         self,
         risk_alerts: List[SignalDTO],
-    ) -> Dict[str, any]:
+    ) -> Mapping[str, Any]:
         """
         Resume el contexto de riesgo a partir de ALERTs de volumen/volatilidad/riesgo.
         No decide nada por sí mismo, solo etiqueta el régimen.
         """
         if not risk_alerts:
-            return {
-                "has_risk_alerts": False,
-                "high_volatility": False,
-                "volume_spike": False,
-                "risk_events": False,
-                "extreme_conditions": False,
-                "risk_alerts_count": 0,
-            }
-
-        has_high_vol = any(
-            (a.meta or {}).get("kind") == "atr_spike"
-            for a in risk_alerts
-        )
-        has_vol_spike = any(
-            (a.meta or {}).get("kind") == "volume_spike"
-            for a in risk_alerts
-        )
-        has_risk = any(
-            a.signal_source == SignalSourceEnum.RISK
-            for a in risk_alerts
-        )
-        has_extreme = any(
-            a.strength == SignalStrengthEnum.EXTREME
-            for a in risk_alerts
-        )
+            return _NO_RISK_CONTEXT
+
+        # Una sola pasada; cortamos apenas están los cuatro flags en True
+        has_high_vol = has_vol_spike = has_risk = has_extreme = False
+        for a in risk_alerts:
+            kind = a.meta.get("kind") if a.meta else None
+            if kind == "atr_spike":
+                has_high_vol = True
+            elif kind == "volume_spike":
+                has_vol_spike = True
+            if a.signal_source == _RISK:
+                has_risk = True
+            if a.strength == _EXTREME:
+                has_extreme = True
+            if has_high_vol and has_vol_spike and has_risk and has_extreme:
+                break
 
         return {
             "has_risk_alerts": True,
@@ -264,20 +348,27 @@ class SignalAggregator:
         self,
         chosen_type: SignalTypeEnum,
         base_signal: SignalDTO,
-        signals: List[SignalDTO],
+        signals_count: int,
         final_score: float,
-        risk_context: Optional[Dict[str, any]] = None,
+        type_counts: Dict[str, int],
+        source_counts: Dict[str, int],
+        min_expires: Optional[datetime] = None,
+        risk_context: Optional[Mapping[str, Any]] = None,
+        now: Optional[datetime] = None,
     ) -> SignalDTO:
         """
         Construye un SignalDTO "resumen" usando una señal base
         y agregando info al meta.
+
+        Los conteos y la expiración mínima ya vienen calculados desde
+        `aggregate`, así que acá no se recorre la lista de señales.
         """
 
         # Confidence agregada (no pasa de 1.0).
         # Para HOLD ponemos 1.0 → "estamos tranquilos de no hacer nada".
         aggregated_confidence = (
             1.0
-            if chosen_type == SignalTypeEnum.HOLD
+            if chosen_type == _HOLD
             else max(
                 min(final_score, 1.0),
                 float(base_signal.confidence),
@@ -287,38 +378,28 @@ class SignalAggregator:
         aggregated_strength = self._strength_from_score(final_score)
 
         # Elegimos la expiración más cercana (conservador)
-        valid_expires = [
-            s.expires_at for s in signals if s.expires_at is not None]
-        expires_at = min(
-            valid_expires) if valid_expires else base_signal.expires_at
-
-        # Meta: trazabilidad de qué se usó
-        meta = base_signal.meta.copy() if base_signal.meta else {}
-
-        # Conteo por tipo de señal (BUY/SELL/etc.)
-        type_counts: Dict[str, int] = {}
-        for s in signals:
-            t = s.signal_type.value
-            type_counts[t] = type_counts.get(t, 0) + 1
+        expires_at = (
+            min_expires if min_expires is not None else base_signal.expires_at
+        )
 
-        # Conteo por fuente (momentum/volatility/etc.)
-        source_counts: Dict[str, int] = {}
-        for s in signals:
-            src = s.signal_source.value
-            source_counts[src] = source_counts.get(src, 0) + 1
-
-        meta["aggregated"] = True
-        meta["source_signals_count"] = len(signals)
-        meta["source_types"] = type_counts
-        meta["source_sources"] = source_counts
-        meta["aggregator_info"] = {
-            "chosen_type": chosen_type.value,
-            "final_score": final_score,
+        # Meta: trazabilidad de qué se usó. Un solo dict nuevo; las claves del
+        # agregador pisan las de la señal base, que no se muta.
+        meta = {
+            **(base_signal.meta or {}),
+            "aggregated": True,
+            "source_signals_count": signals_count,
+            "source_types": type_counts,
+            "source_sources": source_counts,
+            "aggregator_info": {
+                "chosen_type": chosen_type.value,
+                "final_score": final_score,
+            },
         }
         if risk_context is not None:
             meta["risk_context"] = risk_context
 
-        return SignalDTO(
+        # Todos los campos salen de señales ya validadas → sin revalidar
+        return SignalDTO.from_validated(
             id=None,
             symbol=base_signal.symbol,
             signal_source=base_signal.signal_source,
@@ -329,6 +410,6 @@ class SignalAggregator:
             target_price=base_signal.target_price,
             stop_loss=base_signal.stop_loss,
             meta=meta,
-            created_at=datetime.now(),
+            created_at=now if now is not None else datetime.now(),
             expires_at=expires_at,
         )
@@ -5,7 +5,7 @@ from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, S
 
 
 class SignalDTO(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     id: Optional[str] = None
     symbol: str
     signal_source: SignalSourceEnum
@@ -18,3 +18,14 @@ class SignalDTO(BaseModel):
     meta: Optional[Dict[str, Any]] = None
     created_at: Optional[datetime] = None
     expires_at: Optional[datetime] = None
+
+    @classmethod
+    def from_validated(cls, **data: Any) -> "SignalDTO":
+        """
+        Construye el DTO sin pasar por la validación de pydantic.
+
+        Solo para código interno que ya entrega tipos correctos (enums,
+        floats, datetimes y confidence en [0, 1]). Lo que entra desde afuera
+        (DB, API) tiene que seguir usando el constructor normal.
+        """
+        return cls.model_construct(**data)
@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class SignalInputs:
+    """
+    Snapshot struct-of-arrays de las columnas que leen los intérpretes.
+
+    El orquestador lo arma una vez por símbolo y se comparte entre todos
+    los intérpretes: cada uno lee ndarrays crudos en vez de ir al
+    BlockManager de pandas por cada columna / `in df.columns`.
+    Las columnas ausentes en el df simplemente no aparecen en `cols`.
+    """
+
+    n: int
+    cols: Dict[str, np.ndarray]
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        columns: Iterable[str],
+        lookback: Optional[int] = None,
+    ) -> "SignalInputs":
+        """
+        `lookback` recorta cada columna a sus últimas filas (las únicas que
+        miran los intérpretes); `n` queda como el largo del recorte.
+        """
+        present = frozenset(df.columns)
+        n = len(df)
+        if lookback is not None and lookback < n:
+            n = lookback
+        return cls(
+            n=n,
+            cols={c: df[c].to_numpy()[-n:] for c in columns if c in present},
+        )
+
+    @cached_property
+    def last_row(self) -> Dict[str, Any]:
+        """
+        Último valor de cada columna del snapshot. Se arma una sola vez y
+        lo comparten todos los intérpretes de la pasada.
+        """
+        if self.n == 0:
+            return {}
+        return {c: values[-1] for c, values in self.cols.items()}
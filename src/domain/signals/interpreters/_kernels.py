@@ -0,0 +1,223 @@
+"""
+Kernels numéricos de los intérpretes.
+
+Solo trabajan con floats / ndarrays (NaN = dato ausente) y devuelven códigos
+enteros; armar los SignalDTO queda del lado de Python.
+"""
+import numpy as np
+
+from src.commons.njit import njit, NUMBA_AVAILABLE
+
+# Códigos de salida
+NO_SIGNAL = -1
+BUY = 0
+SELL = 1
+
+WEAK = 0
+MODERATE = 1
+STRONG = 2
+
+# Slots de momentum_decisions
+RSI_SLOT = 0
+MACD_SLOT = 1
+WILLR_SLOT = 2
+STOCH_SLOT = 3
+
+
+@njit(cache=True)
+def momentum_decisions(rsi, macd_block, willr, stoch):
+    """
+    Árbol de umbrales de RSI / MACD / Williams %R / Stochastic RSI.
+
+    `macd_block` es el bloque 2x2 de las dos últimas filas
+    [[macd_prev, signal_prev], [macd_curr, signal_curr]].
+
+    Devuelve (types, confidences, strengths), un slot por indicador:
+    types en {NO_SIGNAL, BUY, SELL}, strengths en {WEAK, MODERATE, STRONG}.
+    """
+    types = np.full(4, NO_SIGNAL, dtype=np.int8)
+    confidences = np.zeros(4)
+    strengths = np.zeros(4, dtype=np.int8)
+
+    # RSI: sobreventa → BUY, sobrecompra → SELL
+    if rsi == rsi:
+        if rsi < 30:
+            types[RSI_SLOT] = BUY
+            confidences[RSI_SLOT] = min(1.0, (30 - rsi) / 30)
+            strengths[RSI_SLOT] = STRONG if rsi < 20 else MODERATE
+        elif rsi > 70:
+            types[RSI_SLOT] = SELL
+            confidences[RSI_SLOT] = min(1.0, (rsi - 70) / 30)
+            strengths[RSI_SLOT] = STRONG if rsi > 80 else MODERATE
+
+    # MACD: cruce de la línea sobre / bajo la señal
+    if not np.isnan(macd_block).any():
+        macd_prev, macd_sig_prev = macd_block[0, 0], macd_block[0, 1]
+        macd_curr, macd_sig_curr = macd_block[1, 0], macd_block[1, 1]
+        if macd_curr > macd_sig_curr and macd_prev <= macd_sig_prev:
+            types[MACD_SLOT] = BUY
+            confidences[MACD_SLOT] = 0.75
+            strengths[MACD_SLOT] = STRONG
+        elif macd_curr < macd_sig_curr and macd_prev >= macd_sig_prev:
+            types[MACD_SLOT] = SELL
+            confidences[MACD_SLOT] = 0.75
+            strengths[MACD_SLOT] = STRONG
+
+    # Williams %R: señal débil / complemento
+    if willr == willr:
+        if willr < -80:
+            types[WILLR_SLOT] = BUY
+            confidences[WILLR_SLOT] = 0.5
+            strengths[WILLR_SLOT] = WEAK
+        elif willr > -20:
+            types[WILLR_SLOT] = SELL
+            confidences[WILLR_SLOT] = 0.5
+            strengths[WILLR_SLOT] = WEAK
+
+    # Stochastic RSI
+    if stoch == stoch:
+        if stoch < 0.2:
+            types[STOCH_SLOT] = BUY
+            confidences[STOCH_SLOT] = 0.55
+            strengths[STOCH_SLOT] = WEAK
+        elif stoch > 0.8:
+            types[STOCH_SLOT] = SELL
+            confidences[STOCH_SLOT] = 0.55
+            strengths[STOCH_SLOT] = WEAK
+
+    return types, confidences, strengths
+
+
+@njit(cache=True)
+def ema_cross_last(fast, slow):
+    """
+    Cruce de medias en la última muestra: +1 golden (fast cruza arriba),
+    -1 death (fast cruza abajo), 0 sin cruce o con NaN en las dos últimas.
+    """
+    fast_curr, fast_prev = fast[-1], fast[-2]
+    slow_curr, slow_prev = slow[-1], slow[-2]
+
+    if (
+        fast_curr != fast_curr
+        or fast_prev != fast_prev
+        or slow_curr != slow_curr
+        or slow_prev != slow_prev
+    ):
+        return 0
+    if fast_curr > slow_curr and fast_prev <= slow_prev:
+        return 1
+    if fast_curr < slow_curr and fast_prev >= slow_prev:
+        return -1
+    return 0
+
+
+@njit(cache=True)
+def atr_ratio_last(atr, window=20):
+    """
+    ATR actual / media de las últimas `window` muestras (ignorando NaN).
+    NaN si falta el ATR actual o si la media no es positiva; un ATR de 0
+    es un dato válido (ratio 0, volatilidad mínima).
+    """
+    n = atr.shape[0]
+    current = atr[n - 1]
+    if current != current:
+        return np.nan
+
+    total = 0.0
+    count = 0
+    for i in range(max(0, n - window), n):
+        value = atr[i]
+        if value == value:
+            total += value
+            count += 1
+
+    if count == 0:
+        return np.nan
+    avg = total / count
+    if avg <= 0.0:
+        return np.nan
+    return current / avg
+
+
+@njit(cache=True)
+def volume_decisions(volume, avg_volume, obv_prev, obv_curr, close_prev, close_curr):
+    """
+    Spike de volumen y divergencia OBV / precio sobre la última barra.
+
+    Devuelve (multiplier, divergence): multiplier = volume / avg_volume
+    (NaN si falta algo o la media no es positiva) y divergence en
+    {NO_SIGNAL, BUY, SELL}: precio baja con OBV subiendo → BUY,
+    precio sube con OBV bajando → SELL.
+    """
+    multiplier = np.nan
+    if volume == volume and avg_volume == avg_volume and avg_volume > 0.0:
+        multiplier = volume / avg_volume
+
+    divergence = NO_SIGNAL
+    if (
+        obv_prev == obv_prev
+        and obv_curr == obv_curr
+        and close_prev == close_prev
+        and close_curr == close_curr
+    ):
+        price_up = close_curr > close_prev
+        obv_up = obv_curr > obv_prev
+        if price_up and not obv_up:
+            divergence = SELL
+        elif not price_up and obv_up:
+            divergence = BUY
+
+    return multiplier, divergence
+
+
+def momentum_decisions_batch(rsi, macd_block, willr, stoch):
+    """
+    Versión vectorizada de `momentum_decisions` para N símbolos.
+
+    Recibe arrays (N,) para rsi / willr / stoch y (N, 2, 2) para el bloque
+    MACD; devuelve (types, confidences, strengths) con forma (N, 4).
+    Las comparaciones contra NaN dan False, así que un dato ausente no dispara.
+    """
+    n = rsi.shape[0]
+    types = np.full((n, 4), NO_SIGNAL, dtype=np.int8)
+    confidences = np.zeros((n, 4))
+    strengths = np.zeros((n, 4), dtype=np.int8)
+
+    def _fill(slot, buy, sell, buy_conf, sell_conf, buy_strength, sell_strength):
+        types[:, slot] = np.where(buy, BUY, np.where(sell, SELL, NO_SIGNAL))
+        confidences[:, slot] = np.where(buy, buy_conf, np.where(sell, sell_conf, 0.0))
+        strengths[:, slot] = np.where(
+            buy, buy_strength, np.where(sell, sell_strength, WEAK)
+        )
+
+    # RSI
+    _fill(
+        RSI_SLOT,
+        rsi < 30,
+        rsi > 70,
+        np.minimum(1.0, (30 - rsi) / 30),
+        np.minimum(1.0, (rsi - 70) / 30),
+        np.where(rsi < 20, STRONG, MODERATE),
+        np.where(rsi > 80, STRONG, MODERATE),
+    )
+
+    # MACD: cruces sobre el bloque [prev, curr] × [línea, señal]
+    macd_prev, macd_sig_prev = macd_block[:, 0, 0], macd_block[:, 0, 1]
+    macd_curr, macd_sig_curr = macd_block[:, 1, 0], macd_block[:, 1, 1]
+    macd_buy = (macd_curr > macd_sig_curr) & (macd_prev <= macd_sig_prev)
+    macd_sell = (macd_curr < macd_sig_curr) & (macd_prev >= macd_sig_prev)
+    _fill(MACD_SLOT, macd_buy, macd_sell, 0.75, 0.75, STRONG, STRONG)
+
+    # Williams %R y Stochastic RSI
+    _fill(WILLR_SLOT, willr < -80, willr > -20, 0.5, 0.5, WEAK, WEAK)
+    _fill(STOCH_SLOT, stoch < 0.2, stoch > 0.8, 0.55, 0.55, WEAK, WEAK)
+
+    return types, confidences, strengths
+
+
+if NUMBA_AVAILABLE:
+    # Warmup: compila (o carga del cache) al importar y no en el primer tick
+    momentum_decisions(30.0, np.zeros((2, 2)), -50.0, 0.5)
+    ema_cross_last(np.zeros(2), np.zeros(2))
+    atr_ratio_last(np.ones(20))
+    volume_decisions(1.0, 1.0, 1.0, 1.0, 1.0, 1.0)
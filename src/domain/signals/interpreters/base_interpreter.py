@@ -1,19 +1,113 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+import numpy as np
 import pandas as pd
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
+from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, SignalSourceEnum
 
 
 class BaseStrategyInterpreter(ABC):
+    # Vida útil (días) de las señales que emite cada intérprete
+    TTL_DAYS: int
+
+    # Columnas del df que lee el intérprete (el orquestador arma el SoA con la unión)
+    COLUMNS: Tuple[str, ...] = ()
+
+    # Filas (desde el final) que necesita leer de cada columna
+    LOOKBACK: int = 1
+
+    # Indicadores de reglas que activan al intérprete. None = corre siempre
+    # y decide adentro (p.ej. Risk mira la config de riesgo, no las reglas)
+    REQUIRED_INDICATORS: Optional[FrozenSet[str]] = None
+
     @abstractmethod
     def interpret(
         self,
         df: pd.DataFrame,
         config: StrategyConfigDTO,
+        now: Optional[datetime] = None,
+        inputs: Optional[SignalInputs] = None,
     ) -> Optional[SignalDTO]:
         """
         Devuelve UNA señal de estrategia (buy/sell/hold) o None
         si no hay nada que hacer.
+
+        `now` lo pasa el orquestador (un único timestamp por batch);
+        si no viene se usa datetime.now().
+
+        `inputs` es el snapshot SoA compartido del orquestador; si no viene
+        se arma desde `df` con las `COLUMNS` del intérprete.
         """
         ...
+
+    def applies_to(self, config: StrategyConfigDTO) -> bool:
+        """
+        Si la estrategia usa algún indicador del intérprete. Lo evalúa el
+        orquestador antes de llamar a `interpret`, así cada intérprete no
+        repite el chequeo adentro.
+        """
+        required = self.REQUIRED_INDICATORS
+        return required is None or not required.isdisjoint(config.indicator_set)
+
+    @staticmethod
+    def _mk(
+        symbol: str,
+        source: SignalSourceEnum,
+        signal_type: SignalTypeEnum,
+        confidence: float,
+        strength: SignalStrengthEnum,
+        price: Optional[float],
+        meta: Dict[str, Any],
+        created_at: datetime,
+        expires_at: datetime,
+    ) -> SignalDTO:
+        """SignalDTO interno (tipos ya correctos) sin pasar por la validación."""
+        return SignalDTO.from_validated(
+            symbol=symbol,
+            signal_source=source,
+            signal_type=signal_type,
+            confidence=confidence,
+            strength=strength,
+            price=price,
+            meta=meta,
+            created_at=created_at,
+            expires_at=expires_at,
+        )
+
+    def _signal_window(self, now: Optional[datetime]) -> Tuple[datetime, datetime]:
+        """(created_at, expires_at) para las señales de esta pasada."""
+        if now is None:
+            now = datetime.now()
+        return now, now + timedelta(days=self.TTL_DAYS)
+
+    def _inputs(
+        self, df: pd.DataFrame, inputs: Optional[SignalInputs]
+    ) -> SignalInputs:
+        """SoA del orquestador, o uno propio con `COLUMNS` si se llama suelto."""
+        if inputs is None:
+            inputs = SignalInputs.from_frame(df, self.COLUMNS, self.LOOKBACK)
+        return inputs
+
+    @staticmethod
+    def _is_missing(value: Any) -> bool:
+        """
+        NaN/None para columnas que pueden no ser float (fvg_type, trend_signal).
+        Para columnas float alcanza con `math.isnan`.
+        """
+        return (
+            value is None
+            or value is pd.NA
+            or (isinstance(value, (float, np.floating)) and value != value)
+        )
+
+    @staticmethod
+    def _round2(value: float) -> float:
+        """
+        Redondeo a 2 decimales para los valores de `meta` (solo display).
+        Evita el paso por dtoa de `round(x, 2)`; puede diferir en el último
+        decimal en los empates exactos, que acá no importan.
+        """
+        return int(value * 100 + (0.5 if value >= 0 else -0.5)) / 100
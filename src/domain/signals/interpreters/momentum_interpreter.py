@@ -1,17 +1,48 @@
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from math import nan as NAN
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from src.domain.signals.interpreters.base_interpreter import BaseStrategyInterpreter
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
+from src.domain.signals.interpreters._kernels import (
+    momentum_decisions,
+    momentum_decisions_batch,
+    NO_SIGNAL,
+    BUY,
+    RSI_SLOT,
+    MACD_SLOT,
+    WILLR_SLOT,
+)
 from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, SignalSourceEnum
 
 logger = logging.getLogger(__name__)
 
-MOMENTUM_SIGNAL_TTL_DAYS = 180
+# Columnas de indicadores que lee el intérprete (orden fijo del snapshot)
+MOMENTUM_COLUMNS = (
+    "RSI_14",
+    "MACD_12_26_9",
+    "MACDs_12_26_9",
+    "WILLR_14",
+    "STOCHRSIk_14_14_3_3",
+)
+_MOMENTUM_COLUMN_SET = frozenset(MOMENTUM_COLUMNS)
+
+# Bloque MACD "ausente": todo NaN → el kernel no emite señal de MACD
+_EMPTY_MACD_BLOCK = np.full((2, 2), np.nan)
+
+# Códigos del kernel → enums (indexados por código)
+_SIGNAL_TYPES = (SignalTypeEnum.BUY, SignalTypeEnum.SELL)
+_STRENGTHS = (
+    SignalStrengthEnum.WEAK,
+    SignalStrengthEnum.MODERATE,
+    SignalStrengthEnum.STRONG,
+)
 
 
 class MomentumInterpreter(BaseStrategyInterpreter):
@@ -19,10 +50,17 @@ class MomentumInterpreter(BaseStrategyInterpreter):
     Interpreta indicadores de momentum: RSI, MACD, Williams %R y Stochastic RSI
     """
 
+    TTL_DAYS = 180
+    COLUMNS = MOMENTUM_COLUMNS + ("Close",)
+    LOOKBACK = 2
+    REQUIRED_INDICATORS = _MOMENTUM_COLUMN_SET
+
     def interpret(
         self,
         df: pd.DataFrame,
         config: StrategyConfigDTO,
+        now: Optional[datetime] = None,
+        inputs: Optional[SignalInputs] = None,
     ) -> List[SignalDTO]:
         logger.info("📈 Analizando momentum signals...")
         signals: List[SignalDTO] = []
@@ -30,251 +68,175 @@ class MomentumInterpreter(BaseStrategyInterpreter):
         if df.empty:
             return signals
 
-        # 1) Ver si la estrategia realmente usa indicadores de momentum
-        entry_rules = config.params.entry_rules
-        exit_rules = config.params.exit_rules
-        all_rules = entry_rules + exit_rules
-
-        momentum_indicators = {
-            "RSI_14",
-            "MACD_12_26_9",
-            "MACDs_12_26_9",
-            "WILLR_14",
-            "STOCHRSIk_14_14_3_3",
-        }
-
-        has_momentum_rules = any(
-            rule.indicator in momentum_indicators for rule in all_rules
+        price, rsi, macd_block, willr, stoch = self._read_inputs(
+            self._inputs(df, inputs)
         )
-        if not has_momentum_rules:
-            return signals
+        now, expires_at = self._signal_window(now)
 
-        latest = df.iloc[-1]
-        prev = df.iloc[-2] if len(df) >= 2 else latest
-
-        symbol = config.symbol
-        price = float(latest.get("Close")) if "Close" in df.columns else None
-        now = datetime.now()
-        expires_at = now + timedelta(days=MOMENTUM_SIGNAL_TTL_DAYS)
-
-        # ============================
-        #             RSI
-        # ============================
-        if "RSI_14" in df.columns and not pd.isna(latest.get("RSI_14")):
-            rsi = float(latest["RSI_14"])
-
-            # RSI oversold → posible BUY
-            if rsi < 30:
-                confidence = min(1.0, (30 - rsi) / 30)
-                strength = (
-                    SignalStrengthEnum.STRONG if rsi < 20 else SignalStrengthEnum.MODERATE
-                )
+        # Árbol de umbrales en el kernel (numba si está disponible)
+        types, confidences, strengths = momentum_decisions(
+            rsi, macd_block, willr, stoch
+        )
 
-                signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.MOMENTUM,
-                        signal_type=SignalTypeEnum.BUY,
-                        confidence=confidence,
-                        strength=strength,
-                        price=price,
-                        meta={
-                            "kind": "momentum",
-                            "indicator": "RSI_14",
-                            "condition": "oversold",
-                            "value": round(rsi, 2),
-                            "strategy_name": config.strategy_name,
-                        },
-                        created_at=now,
-                        expires_at=expires_at,
-                    )
-                )
+        signals = self._build_signals(
+            config, price, now, expires_at,
+            rsi, macd_block, willr, stoch,
+            types, confidences, strengths,
+        )
 
-            elif rsi > 70:
-                confidence = min(1.0, (rsi - 70) / 30)
-                strength = (
-                    SignalStrengthEnum.STRONG if rsi > 80 else SignalStrengthEnum.MODERATE
-                )
+        logger.info("✅ Momentum analysis: %d signals detectadas", len(signals))
+        return signals
 
-                signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.MOMENTUM,
-                        signal_type=SignalTypeEnum.SELL,
-                        confidence=confidence,
-                        strength=strength,
-                        price=price,
-                        meta={
-                            "kind": "momentum",
-                            "indicator": "RSI_14",
-                            "condition": "overbought",
-                            "value": round(rsi, 2),
-                            "strategy_name": config.strategy_name,
-                        },
-                        created_at=now,
-                        expires_at=expires_at,
-                    )
+    def interpret_batch(
+        self,
+        dfs: Dict[str, pd.DataFrame],
+        configs: Dict[str, StrategyConfigDTO],
+        now: Optional[datetime] = None,
+    ) -> Dict[str, List[SignalDTO]]:
+        """
+        Igual que `interpret`, pero para muchos símbolos a la vez: junta la
+        última fila de cada uno en arrays (N,) / (N, 2, 2) y evalúa los
+        umbrales vectorizados. Solo se arman DTOs donde algo disparó.
+        """
+        logger.info("📈 Analizando momentum signals para %d símbolos...", len(dfs))
+        results: Dict[str, List[SignalDTO]] = {symbol: [] for symbol in dfs}
+
+        active = [
+            symbol
+            for symbol, df in dfs.items()
+            if not df.empty and self.applies_to(configs[symbol])
+        ]
+        if not active:
+            return results
+
+        n = len(active)
+        prices: List[Optional[float]] = [None] * n
+        rsi = np.full(n, np.nan)
+        willr = np.full(n, np.nan)
+        stoch = np.full(n, np.nan)
+        macd_block = np.full((n, 2, 2), np.nan)
+
+        for i, symbol in enumerate(active):
+            prices[i], rsi[i], macd_block[i], willr[i], stoch[i] = (
+                self._read_inputs(
+                    SignalInputs.from_frame(dfs[symbol], self.COLUMNS, self.LOOKBACK)
                 )
+            )
 
-        # ============================
-        #             MACD
-        # ============================
-        if (
-            "MACD_12_26_9" in df.columns
-            and "MACDs_12_26_9" in df.columns
-            and len(df) >= 2
-        ):
-            macd_curr = latest.get("MACD_12_26_9")
-            macd_sig_curr = latest.get("MACDs_12_26_9")
-            macd_prev = prev.get("MACD_12_26_9")
-            macd_sig_prev = prev.get("MACDs_12_26_9")
-
-            if not any(
-                pd.isna(v) for v in [macd_curr, macd_sig_curr, macd_prev, macd_sig_prev]
-            ):
-                # Cruce alcista MACD sobre signal → BUY
-                if macd_curr > macd_sig_curr and macd_prev <= macd_sig_prev:
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.MOMENTUM,
-                            signal_type=SignalTypeEnum.BUY,
-                            confidence=0.75,
-                            strength=SignalStrengthEnum.STRONG,
-                            price=price,
-                            meta={
-                                "kind": "momentum",
-                                "indicator": "MACD",
-                                "event": "bullish_cross",
-                                "macd": float(macd_curr),
-                                "signal": float(macd_sig_curr),
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
-                    )
-                # Cruce bajista MACD bajo signal → SELL
-                elif macd_curr < macd_sig_curr and macd_prev >= macd_sig_prev:
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.MOMENTUM,
-                            signal_type=SignalTypeEnum.SELL,
-                            confidence=0.75,
-                            strength=SignalStrengthEnum.STRONG,
-                            price=price,
-                            meta={
-                                "kind": "momentum",
-                                "indicator": "MACD",
-                                "event": "bearish_cross",
-                                "macd": float(macd_curr),
-                                "signal": float(macd_sig_curr),
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
-                    )
-
-        # ============================
-        #          Williams %R
-        # ============================
-        if "WILLR_14" in df.columns and not pd.isna(latest.get("WILLR_14")):
-            willr = float(latest["WILLR_14"])
-
-            if willr < -80:
-                # Sobreventa → BUY débil / complemento
-                signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.MOMENTUM,
-                        signal_type=SignalTypeEnum.BUY,
-                        confidence=0.5,
-                        strength=SignalStrengthEnum.WEAK,
-                        price=price,
-                        meta={
-                            "kind": "momentum",
-                            "indicator": "WILLR_14",
-                            "condition": "oversold",
-                            "value": round(willr, 2),
-                            "strategy_name": config.strategy_name,
-                        },
-                        created_at=now,
-                        expires_at=expires_at,
-                    )
-                )
-            elif willr > -20:
-                # Sobrecompra → SELL débil
-                signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.MOMENTUM,
-                        signal_type=SignalTypeEnum.SELL,
-                        confidence=0.5,
-                        strength=SignalStrengthEnum.WEAK,
-                        price=price,
-                        meta={
-                            "kind": "momentum",
-                            "indicator": "WILLR_14",
-                            "condition": "overbought",
-                            "value": round(willr, 2),
-                            "strategy_name": config.strategy_name,
-                        },
-                        created_at=now,
-                        expires_at=expires_at,
-                    )
-                )
+        types, confidences, strengths = momentum_decisions_batch(
+            rsi, macd_block, willr, stoch
+        )
 
-        # ============================
-        #         Stochastic RSI
-        # ============================
+        now, expires_at = self._signal_window(now)
+
+        for i in np.flatnonzero((types != NO_SIGNAL).any(axis=1)):
+            symbol = active[i]
+            results[symbol] = self._build_signals(
+                configs[symbol], prices[i], now, expires_at,
+                float(rsi[i]), macd_block[i], float(willr[i]), float(stoch[i]),
+                types[i], confidences[i], strengths[i],
+            )
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "✅ Momentum batch analysis: %d signals detectadas",
+                sum(len(v) for v in results.values()),
+            )
+        return results
+
+    # ======================================================
+    # Helpers
+    # ======================================================
+
+    @staticmethod
+    def _read_inputs(
+        inputs: SignalInputs,
+    ) -> Tuple[Optional[float], float, np.ndarray, float, float]:
+        """
+        Escalares de la última fila (y bloque MACD de las 2 últimas) leídos
+        directo del SoA, sin dispatch de pandas por valor.
+        Devuelve (price, rsi, macd_block, willr, stoch) con NaN si falta algo.
+        """
+        cols = inputs.cols
+
+        price = float(cols["Close"][-1]) if "Close" in cols else None
+
+        rsi = float(cols["RSI_14"][-1]) if "RSI_14" in cols else NAN
+        willr = float(cols["WILLR_14"][-1]) if "WILLR_14" in cols else NAN
+        stoch = (
+            float(cols["STOCHRSIk_14_14_3_3"][-1])
+            if "STOCHRSIk_14_14_3_3" in cols
+            else NAN
+        )
+
+        # MACD: bloque 2x2 (filas prev/curr × línea/señal);
+        # el kernel lo descarta entero con un único isnan().any().
         if (
-            "STOCHRSIk_14_14_3_3" in df.columns
-            and not pd.isna(latest.get("STOCHRSIk_14_14_3_3"))
+            "MACD_12_26_9" in cols
+            and "MACDs_12_26_9" in cols
+            and inputs.n >= 2
         ):
-            stoch = float(latest["STOCHRSIk_14_14_3_3"])
-
-            if stoch < 0.2:
-                signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.MOMENTUM,
-                        signal_type=SignalTypeEnum.BUY,
-                        confidence=0.55,
-                        strength=SignalStrengthEnum.WEAK,
-                        price=price,
-                        meta={
-                            "kind": "momentum",
-                            "indicator": "STOCHRSIk_14_14_3_3",
-                            "condition": "oversold",
-                            "value": round(stoch, 3),
-                            "strategy_name": config.strategy_name,
-                        },
-                        created_at=now,
-                        expires_at=expires_at,
-                    )
+            macd_block = np.column_stack(
+                (cols["MACD_12_26_9"][-2:], cols["MACDs_12_26_9"][-2:])
+            ).astype(float, copy=False)
+        else:
+            macd_block = _EMPTY_MACD_BLOCK
+
+        return price, rsi, macd_block, willr, stoch
+
+    def _build_signals(
+        self,
+        config: StrategyConfigDTO,
+        price: Optional[float],
+        now: datetime,
+        expires_at: datetime,
+        rsi: float,
+        macd_block: np.ndarray,
+        willr: float,
+        stoch: float,
+        types: np.ndarray,
+        confidences: np.ndarray,
+        strengths: np.ndarray,
+    ) -> List[SignalDTO]:
+        """Arma los SignalDTO de los slots del kernel que dispararon."""
+        signals: List[SignalDTO] = []
+
+        for slot in range(len(types)):
+            type_code = types[slot]
+            if type_code == NO_SIGNAL:
+                continue
+
+            is_buy = type_code == BUY
+            if slot == MACD_SLOT:
+                indicator_meta = {
+                    "indicator": "MACD",
+                    "event": "bullish_cross" if is_buy else "bearish_cross",
+                    "macd": float(macd_block[1, 0]),
+                    "signal": float(macd_block[1, 1]),
+                }
+            else:
+                indicator, value = (
+                    ("RSI_14", self._round2(rsi)) if slot == RSI_SLOT
+                    else ("WILLR_14", self._round2(willr)) if slot == WILLR_SLOT
+                    else ("STOCHRSIk_14_14_3_3", round(stoch, 3))
                 )
-            elif stoch > 0.8:
-                signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.MOMENTUM,
-                        signal_type=SignalTypeEnum.SELL,
-                        confidence=0.55,
-                        strength=SignalStrengthEnum.WEAK,
-                        price=price,
-                        meta={
-                            "kind": "momentum",
-                            "indicator": "STOCHRSIk_14_14_3_3",
-                            "condition": "overbought",
-                            "value": round(stoch, 3),
-                            "strategy_name": config.strategy_name,
-                        },
-                        created_at=now,
-                        expires_at=expires_at,
-                    )
+                indicator_meta = {
+                    "indicator": indicator,
+                    "condition": "oversold" if is_buy else "overbought",
+                    "value": value,
+                }
+
+            signals.append(
+                self._mk(
+                    config.symbol, SignalSourceEnum.MOMENTUM, _SIGNAL_TYPES[type_code],
+                    float(confidences[slot]), _STRENGTHS[strengths[slot]], price,
+                    {
+                        "kind": "momentum",
+                        **indicator_meta,
+                        "strategy_name": config.strategy_name,
+                    },
+                    now, expires_at,
                 )
+            )
 
-        logger.info(f"✅ Momentum analysis: {len(signals)} signals detectadas")
         return signals
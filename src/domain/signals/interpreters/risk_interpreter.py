@@ -1,17 +1,32 @@
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from math import isnan
+from datetime import datetime
+from types import MappingProxyType
+from typing import List, Optional
 
 import pandas as pd
 
 from src.domain.signals.interpreters.base_interpreter import BaseStrategyInterpreter
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
+from src.domain.signals.interpreters._kernels import atr_ratio_last
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, SignalSourceEnum
 
 logger = logging.getLogger(__name__)
 
-RISK_SIGNAL_TTL_DAYS = 90
+_OHLCV = frozenset(("Open", "High", "Low", "Close", "Volume"))
+
+# Parte estática de los meta (solo lectura; cada señal la copia con {**...})
+_HIGH_VOL_META = MappingProxyType(
+    {"kind": "volatility_warning", "condition": "high_volatility"}
+)
+_LOW_VOL_META = MappingProxyType(
+    {"kind": "volatility_warning", "condition": "low_volatility"}
+)
+_DATA_QUALITY_META = MappingProxyType(
+    {"kind": "data_quality", "issue": "low_indicator_density"}
+)
 
 
 class RiskInterpreter(BaseStrategyInterpreter):
@@ -20,10 +35,16 @@ class RiskInterpreter(BaseStrategyInterpreter):
     Generates ALERT or HOLD based on severity.
     """
 
+    TTL_DAYS = 90
+    COLUMNS = ("Close", "ATR_14")
+    LOOKBACK = 20
+
     def interpret(
         self,
         df: pd.DataFrame,
         config: StrategyConfigDTO,
+        now: Optional[datetime] = None,
+        inputs: Optional[SignalInputs] = None,
     ) -> List[SignalDTO]:
 
         logger.info("⚠️ Evaluating risk conditions...")
@@ -33,102 +54,83 @@ class RiskInterpreter(BaseStrategyInterpreter):
         if df.empty:
             return signals
 
+        inputs = self._inputs(df, inputs)
+        cols = inputs.cols
+
         # If strategy does NOT use ATR or risk, we don't emit signals
         uses_risk = (
             config.params.risk.stop_loss_pct is not None
             or config.params.risk.take_profit_pct is not None
-            or "ATR_14" in df.columns
+            or "ATR_14" in cols
         )
 
         if not uses_risk:
             return signals
 
-        latest = df.iloc[-1]
+        last = inputs.last_row
         symbol = config.symbol
-        now = datetime.now()
-        expires_at = now + timedelta(days=RISK_SIGNAL_TTL_DAYS)
-        price = float(latest.get("Close", 0))
+        now, expires_at = self._signal_window(now)
+        price = float(last.get("Close", 0))
 
         # ============================
         #        VOLATILIDAD (ATR)
         # ============================
 
-        if "ATR_14" in df.columns and len(df) >= 20:
-            current_atr = latest.get("ATR_14")
-            avg_atr = df["ATR_14"].tail(20).mean()
+        if "ATR_14" in cols and inputs.n >= self.LOOKBACK:
+            # Ratio contra la media de 20 en el kernel (NaN si no es usable)
+            atr_ratio = atr_ratio_last(cols["ATR_14"].astype(float, copy=False))
 
-            if current_atr and avg_atr and not pd.isna(current_atr) and not pd.isna(avg_atr):
-                atr_ratio = current_atr / avg_atr
+            if not isnan(atr_ratio):
 
                 # High risk → caution
                 if atr_ratio > 1.5:
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.RISK,
-                            signal_type=SignalTypeEnum.ALERT,
-                            confidence=0.75,
-                            strength=SignalStrengthEnum.STRONG,
-                            price=price,
-                            meta={
-                                "kind": "volatility_warning",
-                                "condition": "high_volatility",
-                                "atr_ratio": round(atr_ratio, 2),
+                        self._mk(
+                            symbol, SignalSourceEnum.RISK, SignalTypeEnum.ALERT,
+                            0.75, SignalStrengthEnum.STRONG, price,
+                            {
+                                **_HIGH_VOL_META,
+                                "atr_ratio": self._round2(atr_ratio),
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
 
                 # Extremely low volatility → HOLD (risk of false signal)
                 elif atr_ratio < 0.6:
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.RISK,
-                            signal_type=SignalTypeEnum.HOLD,
-                            confidence=0.6,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=price,
-                            meta={
-                                "kind": "volatility_warning",
-                                "condition": "low_volatility",
-                                "atr_ratio": round(atr_ratio, 2),
+                        self._mk(
+                            symbol, SignalSourceEnum.RISK, SignalTypeEnum.HOLD,
+                            0.6, SignalStrengthEnum.MODERATE, price,
+                            {
+                                **_LOW_VOL_META,
+                                "atr_ratio": self._round2(atr_ratio),
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
 
         # ============================
         #     CALIDAD DE DATOS
         # ============================
-        indicator_count = len([
-            col for col in df.columns
-            if col not in ["Open", "High", "Low", "Close", "Volume"]
-        ])
+        # Un solo set de columnas; la resta con OHLCV es aritmética de sets
+        indicator_count = len(frozenset(df.columns) - _OHLCV)
 
         if indicator_count < 10:
             signals.append(
-                SignalDTO(
-                    symbol=symbol,
-                    signal_source=SignalSourceEnum.RISK,
-                    signal_type=SignalTypeEnum.ALERT,
-                    confidence=0.4,
-                    strength=SignalStrengthEnum.WEAK,
-                    price=price,
-                    meta={
-                        "kind": "data_quality",
-                        "issue": "low_indicator_density",
+                self._mk(
+                    symbol, SignalSourceEnum.RISK, SignalTypeEnum.ALERT,
+                    0.4, SignalStrengthEnum.WEAK, price,
+                    {
+                        **_DATA_QUALITY_META,
                         "indicator_count": indicator_count,
                         "strategy_name": config.strategy_name,
                     },
-                    created_at=now,
-                    expires_at=expires_at,
+                    now, expires_at,
                 )
             )
 
-        logger.info(f"✅ Risk analysis: {len(signals)} risk signals generated")
+        logger.info("✅ Risk analysis: %d risk signals generated", len(signals))
         return signals
@@ -1,17 +1,65 @@
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from math import isnan
+from datetime import datetime
+from types import MappingProxyType
+from typing import List, Optional
 
 import pandas as pd
 
 from src.domain.signals.interpreters.base_interpreter import BaseStrategyInterpreter
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
 from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, SignalSourceEnum
 
 logger = logging.getLogger(__name__)
 
-STRUCTURE_SIGNAL_TTL_DAYS = 180
+_ZONE_INDICATORS = frozenset({
+    "main_support",
+    "main_resistance",
+    "zone_support_1",
+    "zone_support_2",
+    "zone_support_3",
+    "zone_resistance_1",
+    "zone_resistance_2",
+    "zone_resistance_3",
+})
+
+# Columnas que se leen de la última fila
+_LAST_ROW_COLUMNS = (
+    "fvg_type",
+    "fvg_size",
+    "fvg_start",
+    "fvg_end",
+    "Close",
+    "main_resistance",
+    "main_support",
+)
+
+# Parte estática de los meta (solo lectura; cada señal la copia con {**...})
+_FVG_BULLISH_META = MappingProxyType({"kind": "fair_value_gap", "direction": "bullish"})
+_FVG_BEARISH_META = MappingProxyType({"kind": "fair_value_gap", "direction": "bearish"})
+# fvg_type → (tipo de señal, meta estático); 1.0 / -1.0 hashean igual que 1 / -1
+_FVG_DISPATCH = {
+    1: (SignalTypeEnum.BUY, _FVG_BULLISH_META),
+    -1: (SignalTypeEnum.SELL, _FVG_BEARISH_META),
+}
+_BREAKOUT_UP_META = MappingProxyType(
+    {"kind": "breakout", "direction": "up", "zone_type": "main_resistance"}
+)
+_BREAKOUT_DOWN_META = MappingProxyType(
+    {"kind": "breakout", "direction": "down", "zone_type": "main_support"}
+)
+_RESISTANCE_PROXIMITY_META = MappingProxyType({
+    "kind": "zone_proximity",
+    "direction": "resistance_approach",
+    "zone_type": "main_resistance",
+})
+_SUPPORT_PROXIMITY_META = MappingProxyType({
+    "kind": "zone_proximity",
+    "direction": "support_approach",
+    "zone_type": "main_support",
+})
 
 
 class StructureInterpreter(BaseStrategyInterpreter):
@@ -19,10 +67,20 @@ class StructureInterpreter(BaseStrategyInterpreter):
     Interpreta estructura de mercado: Fair Value Gaps, zonas y breakouts
     """
 
+    TTL_DAYS = 180
+    COLUMNS = _LAST_ROW_COLUMNS
+    REQUIRED_INDICATORS = _ZONE_INDICATORS
+
+    def applies_to(self, config: StrategyConfigDTO) -> bool:
+        # Los FVG se reconocen por prefijo (`fvg_*`), no por un set fijo
+        return config.has_fvg_rules or super().applies_to(config)
+
     def interpret(
         self,
         df: pd.DataFrame,
         config: StrategyConfigDTO,
+        now: Optional[datetime] = None,
+        inputs: Optional[SignalInputs] = None,
     ) -> List[SignalDTO]:
         logger.info("🏗️ Analyzing market structure...")
         signals: List[SignalDTO] = []
@@ -30,198 +88,124 @@ class StructureInterpreter(BaseStrategyInterpreter):
         if df.empty:
             return signals
 
-        entry_rules = config.params.entry_rules
-        exit_rules = config.params.exit_rules
-        all_rules = entry_rules + exit_rules
-
-        has_fvg_rules = any(
-            rule.indicator.startswith("fvg_")
-            for rule in all_rules
-        )
-
-        zone_indicators = {
-            "main_support",
-            "main_resistance",
-            "zone_support_1",
-            "zone_support_2",
-            "zone_support_3",
-            "zone_resistance_1",
-            "zone_resistance_2",
-            "zone_resistance_3",
-        }
-        has_zone_rules = any(
-            rule.indicator in zone_indicators for rule in all_rules)
-
-        if not has_fvg_rules and not has_zone_rules:
-            return signals
+        # Qué bloques corren; que aplique alguno ya lo filtró `applies_to`
+        has_fvg_rules = config.has_fvg_rules
+        has_zone_rules = not _ZONE_INDICATORS.isdisjoint(config.indicator_set)
 
-        latest = df.iloc[-1]
+        last = self._inputs(df, inputs).last_row
         symbol = config.symbol
-        now = datetime.now()
-        expires_at = now + timedelta(days=STRUCTURE_SIGNAL_TTL_DAYS)
+        now, expires_at = self._signal_window(now)
 
         # ============================
         #       FAIR VALUE GAPS
         # ============================
-        if has_fvg_rules and "fvg_type" in df.columns:
-            fvg_type = latest.get("fvg_type")
-            if not pd.isna(fvg_type):
-                fvg_size = latest.get("fvg_size")
-                gap_start = latest.get("fvg_start")
-                gap_end = latest.get("fvg_end")
-
-                if fvg_type == 1:
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.STRUCTURE,
-                            signal_type=SignalTypeEnum.BUY,
-                            confidence=0.7,
-                            strength=SignalStrengthEnum.STRONG,
-                            price=float(latest.get("Close")),
-                            meta={
-                                "kind": "fair_value_gap",
-                                "direction": "bullish",
-                                "gap_size": float(fvg_size) if fvg_size is not None else None,
-                                "gap_start": gap_start,
-                                "gap_end": gap_end,
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
-                    )
-                elif fvg_type == -1:
+        if has_fvg_rules and "fvg_type" in last:
+            fvg_type = last["fvg_type"]
+            if not self._is_missing(fvg_type):
+                fvg_size = last.get("fvg_size")
+                gap_start = last.get("fvg_start")
+                gap_end = last.get("fvg_end")
+
+                entry = _FVG_DISPATCH.get(fvg_type)
+                if entry is not None:
+                    signal_type, fvg_meta = entry
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.STRUCTURE,
-                            signal_type=SignalTypeEnum.SELL,
-                            confidence=0.7,
-                            strength=SignalStrengthEnum.STRONG,
-                            price=float(latest.get("Close")),
-                            meta={
-                                "kind": "fair_value_gap",
-                                "direction": "bearish",
+                        self._mk(
+                            symbol, SignalSourceEnum.STRUCTURE, signal_type,
+                            0.7, SignalStrengthEnum.STRONG, float(last["Close"]),
+                            {
+                                **fvg_meta,
                                 "gap_size": float(fvg_size) if fvg_size is not None else None,
                                 "gap_start": gap_start,
                                 "gap_end": gap_end,
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
 
         # ============================
         #        ZONAS / BREAKOUTS
         # ============================
-        if has_zone_rules and "Close" in df.columns:
-            close = latest["Close"]
+        if has_zone_rules:
+            close = float(last["Close"])
 
             # Breakout sobre resistencia principal
             if (
-                "main_resistance" in df.columns
-                and not pd.isna(latest.get("main_resistance"))
+                "main_resistance" in last
+                and not isnan(last["main_resistance"])
             ):
-                main_resistance = latest["main_resistance"]
+                main_resistance = float(last["main_resistance"])
 
                 # breakout “fuerte”
                 if close > main_resistance * 1.002:  # +0.2%
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.STRUCTURE,
-                            signal_type=SignalTypeEnum.BUY,
-                            confidence=0.8,
-                            strength=SignalStrengthEnum.STRONG,
-                            price=float(close),
-                            meta={
-                                "kind": "breakout",
-                                "direction": "up",
-                                "zone_type": "main_resistance",
-                                "zone_value": float(main_resistance),
+                        self._mk(
+                            symbol, SignalSourceEnum.STRUCTURE, SignalTypeEnum.BUY,
+                            0.8, SignalStrengthEnum.STRONG, close,
+                            {
+                                **_BREAKOUT_UP_META,
+                                "zone_value": main_resistance,
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
-                else:
-                    # proximidad a resistencia
+                elif main_resistance > 0:
+                    # proximidad a resistencia (se divide solo acá y con
+                    # nivel > 0: un nivel en 0 no tira abajo todo el intérprete)
                     dist = abs(close - main_resistance) / main_resistance
                     if dist <= 0.005:  # 0.5%
                         signals.append(
-                            SignalDTO(
-                                symbol=symbol,
-                                signal_source=SignalSourceEnum.STRUCTURE,
-                                signal_type=SignalTypeEnum.ALERT,
-                                confidence=0.5,
-                                strength=SignalStrengthEnum.MODERATE,
-                                price=float(close),
-                                meta={
-                                    "kind": "zone_proximity",
-                                    "direction": "resistance_approach",
-                                    "zone_type": "main_resistance",
-                                    "zone_value": float(main_resistance),
+                            self._mk(
+                                symbol, SignalSourceEnum.STRUCTURE, SignalTypeEnum.ALERT,
+                                0.5, SignalStrengthEnum.MODERATE, close,
+                                {
+                                    **_RESISTANCE_PROXIMITY_META,
+                                    "zone_value": main_resistance,
                                     "distance_pct": dist * 100,
                                     "strategy_name": config.strategy_name,
                                 },
-                                created_at=now,
-                                expires_at=expires_at,
+                                now, expires_at,
                             )
                         )
 
             # Breakdown sobre soporte principal
             if (
-                "main_support" in df.columns
-                and not pd.isna(latest.get("main_support"))
+                "main_support" in last
+                and not isnan(last["main_support"])
             ):
-                main_support = latest["main_support"]
+                main_support = float(last["main_support"])
 
                 if close < main_support * 0.998:  # -0.2%
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.STRUCTURE,
-                            signal_type=SignalTypeEnum.SELL,
-                            confidence=0.8,
-                            strength=SignalStrengthEnum.STRONG,
-                            price=float(close),
-                            meta={
-                                "kind": "breakout",
-                                "direction": "down",
-                                "zone_type": "main_support",
-                                "zone_value": float(main_support),
+                        self._mk(
+                            symbol, SignalSourceEnum.STRUCTURE, SignalTypeEnum.SELL,
+                            0.8, SignalStrengthEnum.STRONG, close,
+                            {
+                                **_BREAKOUT_DOWN_META,
+                                "zone_value": main_support,
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
-                else:
+                elif main_support > 0:
                     dist = abs(close - main_support) / main_support
                     if dist <= 0.005:
                         signals.append(
-                            SignalDTO(
-                                symbol=symbol,
-                                signal_source=SignalSourceEnum.STRUCTURE,
-                                signal_type=SignalTypeEnum.ALERT,
-                                confidence=0.5,
-                                strength=SignalStrengthEnum.MODERATE,
-                                price=float(close),
-                                meta={
-                                    "kind": "zone_proximity",
-                                    "direction": "support_approach",
-                                    "zone_type": "main_support",
-                                    "zone_value": float(main_support),
+                            self._mk(
+                                symbol, SignalSourceEnum.STRUCTURE, SignalTypeEnum.ALERT,
+                                0.5, SignalStrengthEnum.MODERATE, close,
+                                {
+                                    **_SUPPORT_PROXIMITY_META,
+                                    "zone_value": main_support,
                                     "distance_pct": dist * 100,
                                     "strategy_name": config.strategy_name,
                                 },
-                                created_at=now,
-                                expires_at=expires_at,
+                                now, expires_at,
                             )
                         )
 
-        logger.info(f"✅ Structure analysis: {len(signals)} signals detected")
+        logger.info("✅ Structure analysis: %d signals detected", len(signals))
         return signals
@@ -1,17 +1,63 @@
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from math import isnan
+from datetime import datetime
+from types import MappingProxyType
+from typing import List, Optional
 
 import pandas as pd
 
 from src.domain.signals.interpreters.base_interpreter import BaseStrategyInterpreter
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
+from src.domain.signals.interpreters._kernels import ema_cross_last
 from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, SignalSourceEnum
 
 logger = logging.getLogger(__name__)
 
-TREND_SIGNAL_TTL_DAYS = 180
+_TREND_INDICATORS = frozenset({
+    "EMA_5",
+    "EMA_8",
+    "ADX_14",
+    "DMP_14",
+    "DMN_14",
+    "trend_signal",
+})
+
+# Columnas que se leen de la última fila
+_LAST_ROW_COLUMNS = (
+    "EMA_5",
+    "EMA_8",
+    "ADX_14",
+    "DMP_14",
+    "DMN_14",
+    "trend_signal",
+    "Close",
+)
+
+# Parte estática de los meta (solo lectura; cada señal la copia con {**...})
+_GOLDEN_CROSS_META = MappingProxyType(
+    {"kind": "ema_cross", "pair": "5_8", "direction": "golden"}
+)
+_DEATH_CROSS_META = MappingProxyType(
+    {"kind": "ema_cross", "pair": "5_8", "direction": "death"}
+)
+_UPTREND_META = MappingProxyType(
+    {"kind": "custom_trend", "direction": "bullish", "signal": "uptrend_confirmed"}
+)
+_DOWNTREND_META = MappingProxyType(
+    {"kind": "custom_trend", "direction": "bearish", "signal": "downtrend_confirmed"}
+)
+
+# Código (+1 / -1) → (tipo de señal, meta estático)
+_EMA_CROSS_DISPATCH = {
+    1: (SignalTypeEnum.BUY, _GOLDEN_CROSS_META),
+    -1: (SignalTypeEnum.SELL, _DEATH_CROSS_META),
+}
+_TREND_SIGNAL_DISPATCH = {
+    1: (SignalTypeEnum.BUY, _UPTREND_META),
+    -1: (SignalTypeEnum.SELL, _DOWNTREND_META),
+}
 
 
 class TrendInterpreter(BaseStrategyInterpreter):
@@ -20,10 +66,17 @@ class TrendInterpreter(BaseStrategyInterpreter):
     Genera señales de tipo BUY / SELL / ALERT según la información de tendencia.
     """
 
+    TTL_DAYS = 180
+    COLUMNS = _LAST_ROW_COLUMNS
+    LOOKBACK = 2
+    REQUIRED_INDICATORS = _TREND_INDICATORS
+
     def interpret(
         self,
         df: pd.DataFrame,
         config: StrategyConfigDTO,
+        now: Optional[datetime] = None,
+        inputs: Optional[SignalInputs] = None,
     ) -> List[SignalDTO]:
         logger.info("📊 Analizando trend signals...")
         signals: List[SignalDTO] = []
@@ -31,162 +84,89 @@ class TrendInterpreter(BaseStrategyInterpreter):
         if df.empty:
             return signals
 
-        entry_rules = config.params.entry_rules
-        exit_rules = config.params.exit_rules
-        all_rules = entry_rules + exit_rules
-
-        trend_indicators = {
-            "EMA_5",
-            "EMA_8",
-            "ADX_14",
-            "DMP_14",
-            "DMN_14",
-            "trend_signal",
-        }
-
-        uses_trend = any(
-            rule.indicator in trend_indicators for rule in all_rules)
-        if not uses_trend:
-            return signals
-
-        latest = df.iloc[-1]
+        inputs = self._inputs(df, inputs)
+        cols = inputs.cols
+        last = inputs.last_row
         symbol = config.symbol
-        now = datetime.now()
-        expires_at = now + timedelta(days=TREND_SIGNAL_TTL_DAYS)
-        close_price = float(latest.get(
-            "Close")) if "Close" in df.columns else None
+        now, expires_at = self._signal_window(now)
+        close_price = float(last["Close"]) if "Close" in last else None
 
         # ============================
         #      EMA 5 / EMA 8
         # ============================
         if (
-            all(col in df.columns for col in ["EMA_5", "EMA_8"])
-            and len(df) >= 2
+            "EMA_5" in last
+            and "EMA_8" in last
+            and inputs.n >= 2
         ):
-            ema5_curr = latest.get("EMA_5")
-            ema8_curr = latest.get("EMA_8")
-            ema5_prev = df.iloc[-2].get("EMA_5")
-            ema8_prev = df.iloc[-2].get("EMA_8")
-
-            if all(
-                val is not None and not pd.isna(val)
-                for val in [ema5_curr, ema8_curr, ema5_prev, ema8_prev]
-            ):
-                # Golden cross → sesgo alcista
-                if ema5_curr > ema8_curr and ema5_prev <= ema8_prev:
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.TREND,
-                            signal_type=SignalTypeEnum.BUY,
-                            confidence=0.8,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=close_price,
-                            meta={
-                                "kind": "ema_cross",
-                                "pair": "5_8",
-                                "direction": "golden",
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
-                    )
-                # Death cross → sesgo bajista
-                elif ema5_curr < ema8_curr and ema5_prev >= ema8_prev:
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.TREND,
-                            signal_type=SignalTypeEnum.SELL,
-                            confidence=0.8,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=close_price,
-                            meta={
-                                "kind": "ema_cross",
-                                "pair": "5_8",
-                                "direction": "death",
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
+            # +1 golden / -1 death / 0 sin cruce, sobre las dos últimas muestras
+            cross = ema_cross_last(
+                cols["EMA_5"][-2:].astype(float, copy=False),
+                cols["EMA_8"][-2:].astype(float, copy=False),
+            )
+
+            # Golden cross → sesgo alcista / death cross → sesgo bajista
+            entry = _EMA_CROSS_DISPATCH.get(cross)
+            if entry is not None:
+                signal_type, cross_meta = entry
+                signals.append(
+                    self._mk(
+                        symbol, SignalSourceEnum.TREND, signal_type,
+                        0.8, SignalStrengthEnum.MODERATE, close_price,
+                        {
+                            **cross_meta,
+                            "strategy_name": config.strategy_name,
+                        },
+                        now, expires_at,
                     )
+                )
 
         # ============================
         #      ADX + DMI
         # ============================
-        if "ADX_14" in df.columns and not pd.isna(latest.get("ADX_14")):
-            adx = latest["ADX_14"]
+        if "ADX_14" in last and not isnan(last["ADX_14"]):
+            adx = last["ADX_14"]
             if adx > 25:  # tendencia “válida”
-                dmp = latest.get("DMP_14", 0)
-                dmn = latest.get("DMN_14", 0)
+                dmp = last.get("DMP_14", 0)
+                dmn = last.get("DMN_14", 0)
                 direction = "bullish" if dmp > dmn else "bearish"
+                strong = adx > 40
 
                 # Lo tratamos como contexto de alerta, no como señal dura de entrada/salida
                 signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.TREND,
-                        signal_type=SignalTypeEnum.ALERT,
-                        confidence=0.7 if adx > 40 else 0.6,
-                        strength=SignalStrengthEnum.STRONG if adx > 40 else SignalStrengthEnum.MODERATE,
-                        price=close_price,
-                        meta={
+                    self._mk(
+                        symbol, SignalSourceEnum.TREND, SignalTypeEnum.ALERT,
+                        0.7 if strong else 0.6,
+                        SignalStrengthEnum.STRONG if strong else SignalStrengthEnum.MODERATE,
+                        close_price,
+                        {
                             "kind": "trend_strength",
-                            "adx": round(float(adx), 2),
+                            "adx": self._round2(float(adx)),
                             "direction": direction,
                             "strategy_name": config.strategy_name,
                         },
-                        created_at=now,
-                        expires_at=expires_at,
+                        now, expires_at,
                     )
                 )
 
         # ============================
         #      trend_signal custom
         # ============================
-        if "trend_signal" in df.columns and not pd.isna(latest.get("trend_signal")):
-            ts = latest["trend_signal"]
-
-            if ts == 1:
-                signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.TREND,
-                        signal_type=SignalTypeEnum.BUY,
-                        confidence=0.85,
-                        strength=SignalStrengthEnum.STRONG,
-                        price=close_price,
-                        meta={
-                            "kind": "custom_trend",
-                            "direction": "bullish",
-                            "signal": "uptrend_confirmed",
-                            "strategy_name": config.strategy_name,
-                        },
-                        created_at=now,
-                        expires_at=expires_at,
-                    )
-                )
-            elif ts == -1:
+        if "trend_signal" in last and not self._is_missing(last["trend_signal"]):
+            entry = _TREND_SIGNAL_DISPATCH.get(last["trend_signal"])
+            if entry is not None:
+                signal_type, trend_meta = entry
                 signals.append(
-                    SignalDTO(
-                        symbol=symbol,
-                        signal_source=SignalSourceEnum.TREND,
-                        signal_type=SignalTypeEnum.SELL,
-                        confidence=0.85,
-                        strength=SignalStrengthEnum.STRONG,
-                        price=close_price,
-                        meta={
-                            "kind": "custom_trend",
-                            "direction": "bearish",
-                            "signal": "downtrend_confirmed",
+                    self._mk(
+                        symbol, SignalSourceEnum.TREND, signal_type,
+                        0.85, SignalStrengthEnum.STRONG, close_price,
+                        {
+                            **trend_meta,
                             "strategy_name": config.strategy_name,
                         },
-                        created_at=now,
-                        expires_at=expires_at,
+                        now, expires_at,
                     )
                 )
 
-        logger.info(f"✅ Trend analysis: {len(signals)} signals generados")
+        logger.info("✅ Trend analysis: %d signals generados", len(signals))
         return signals
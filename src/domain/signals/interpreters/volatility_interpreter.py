@@ -1,17 +1,45 @@
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from math import isnan
+from datetime import datetime
+from types import MappingProxyType
+from typing import List, Optional
 
 import pandas as pd
 
 from src.domain.signals.interpreters.base_interpreter import BaseStrategyInterpreter
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
+from src.domain.signals.interpreters._kernels import atr_ratio_last
 from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, SignalSourceEnum
 
 logger = logging.getLogger(__name__)
 
-VOLATILITY_SIGNAL_TTL_DAYS = 90
+_VOLATILITY_INDICATORS = frozenset({"ATR_14", "BBL_20_2.0", "BBU_20_2.0"})
+
+# Columnas que se leen de la última fila
+_LAST_ROW_COLUMNS = ("BBL_20_2.0", "BBU_20_2.0", "Close")
+_BB_COLUMNS = frozenset(_LAST_ROW_COLUMNS)
+
+# Parte estática de los meta (solo lectura; cada señal la copia con {**...})
+_BB_LOWER_META = MappingProxyType({
+    "kind": "bollinger_band",
+    "position": "lower_band",
+    "interpretation": "oversold_potential_reversal",
+})
+_BB_UPPER_META = MappingProxyType({
+    "kind": "bollinger_band",
+    "position": "upper_band",
+    "interpretation": "overbought_pullback_likely",
+})
+_ATR_SPIKE_META = MappingProxyType({
+    "kind": "atr_spike",
+    "interpretation": "high_volatility_regime",
+})
+_ATR_CONTRACTION_META = MappingProxyType({
+    "kind": "atr_contraction",
+    "interpretation": "low_volatility_breakout_warning",
+})
 
 
 class VolatilityInterpreter(BaseStrategyInterpreter):
@@ -19,10 +47,17 @@ class VolatilityInterpreter(BaseStrategyInterpreter):
     Genera señales basadas en volatilidad usando ATR y Bollinger Bands.
     """
 
+    TTL_DAYS = 90
+    COLUMNS = _LAST_ROW_COLUMNS + ("ATR_14",)
+    LOOKBACK = 20
+    REQUIRED_INDICATORS = _VOLATILITY_INDICATORS
+
     def interpret(
         self,
         df: pd.DataFrame,
         config: StrategyConfigDTO,
+        now: Optional[datetime] = None,
+        inputs: Optional[SignalInputs] = None,
     ) -> List[SignalDTO]:
         logger.info("⚡ Analizando volatility signals...")
         signals: List[SignalDTO] = []
@@ -30,131 +65,88 @@ class VolatilityInterpreter(BaseStrategyInterpreter):
         if df.empty:
             return signals
 
-        entry_rules = config.params.entry_rules
-        exit_rules = config.params.exit_rules
-        all_rules = entry_rules + exit_rules
-
-        volatility_indicators = {
-            "ATR_14",
-            "BBL_20_2.0",
-            "BBU_20_2.0",
-        }
-
-        uses_volatility = any(
-            rule.indicator in volatility_indicators for rule in all_rules)
-        if not uses_volatility:
-            return signals
-
-        latest = df.iloc[-1]
+        inputs = self._inputs(df, inputs)
+        cols = inputs.cols
+        last = inputs.last_row
         symbol = config.symbol
-        now = datetime.now()
-        expires_at = now + timedelta(days=VOLATILITY_SIGNAL_TTL_DAYS)
-        close_price = float(latest.get(
-            "Close")) if "Close" in df.columns else None
+        now, expires_at = self._signal_window(now)
+        close_price = float(last["Close"]) if "Close" in last else None
 
         # ============================
         #        BOLLINGER BANDS
         # ============================
-        if all(c in df.columns for c in ["BBL_20_2.0", "BBU_20_2.0", "Close"]):
-            bb_lower = latest.get("BBL_20_2.0")
-            bb_upper = latest.get("BBU_20_2.0")
-            close = latest.get("Close")
+        if _BB_COLUMNS <= last.keys():
+            bb_lower = last["BBL_20_2.0"]
+            bb_upper = last["BBU_20_2.0"]
+            close = last["Close"]
 
-            if bb_lower and bb_upper and close and not pd.isna(close):
+            if not (isnan(bb_lower) or isnan(bb_upper) or isnan(close)):
                 # Precio bajo → potencial rebote
                 if close <= bb_lower:
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.VOLATILITY,
-                            signal_type=SignalTypeEnum.BUY,
-                            confidence=0.65,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=close_price,
-                            meta={
-                                "kind": "bollinger_band",
-                                "position": "lower_band",
-                                "interpretation": "oversold_potential_reversal",
+                        self._mk(
+                            symbol, SignalSourceEnum.VOLATILITY, SignalTypeEnum.BUY,
+                            0.65, SignalStrengthEnum.MODERATE, close_price,
+                            {
+                                **_BB_LOWER_META,
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
 
                 # Precio alto → posible corrección
                 elif close >= bb_upper:
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.VOLATILITY,
-                            signal_type=SignalTypeEnum.SELL,
-                            confidence=0.65,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=close_price,
-                            meta={
-                                "kind": "bollinger_band",
-                                "position": "upper_band",
-                                "interpretation": "overbought_pullback_likely",
+                        self._mk(
+                            symbol, SignalSourceEnum.VOLATILITY, SignalTypeEnum.SELL,
+                            0.65, SignalStrengthEnum.MODERATE, close_price,
+                            {
+                                **_BB_UPPER_META,
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
 
         # ============================
         #             ATR
         # ============================
-        if "ATR_14" in df.columns and len(df) >= 20:
-            current_atr = latest.get("ATR_14")
-            avg_atr = df["ATR_14"].tail(20).mean()
+        if "ATR_14" in cols and inputs.n >= self.LOOKBACK:
+            # Ratio contra la media de 20 en el kernel (NaN si no es usable)
+            atr_factor = atr_ratio_last(cols["ATR_14"].astype(float, copy=False))
 
-            if current_atr and avg_atr and not pd.isna(current_atr) and not pd.isna(avg_atr):
-                atr_factor = current_atr / avg_atr
+            if not isnan(atr_factor):
 
                 if atr_factor > 1.5:
                     # Volatilidad expandiéndose → riesgo pero oportunidad
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.VOLATILITY,
-                            signal_type=SignalTypeEnum.ALERT,
-                            confidence=0.7,
-                            strength=SignalStrengthEnum.EXTREME,
-                            price=close_price,
-                            meta={
-                                "kind": "atr_spike",
-                                "atr_ratio": round(atr_factor, 2),
-                                "interpretation": "high_volatility_regime",
+                        self._mk(
+                            symbol, SignalSourceEnum.VOLATILITY, SignalTypeEnum.ALERT,
+                            0.7, SignalStrengthEnum.EXTREME, close_price,
+                            {
+                                **_ATR_SPIKE_META,
+                                "atr_ratio": self._round2(atr_factor),
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
 
                 elif atr_factor < 0.7:
                     # Contracción → posible squeeze → breakout pronto
                     signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.VOLATILITY,
-                            signal_type=SignalTypeEnum.ALERT,
-                            confidence=0.6,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=close_price,
-                            meta={
-                                "kind": "atr_contraction",
-                                "atr_ratio": round(atr_factor, 2),
-                                "interpretation": "low_volatility_breakout_warning",
+                        self._mk(
+                            symbol, SignalSourceEnum.VOLATILITY, SignalTypeEnum.ALERT,
+                            0.6, SignalStrengthEnum.MODERATE, close_price,
+                            {
+                                **_ATR_CONTRACTION_META,
+                                "atr_ratio": self._round2(atr_factor),
                                 "strategy_name": config.strategy_name,
                             },
-                            created_at=now,
-                            expires_at=expires_at,
+                            now, expires_at,
                         )
                     )
 
-        logger.info(
-            f"✅ Volatility analysis: {len(signals)} signals detectados")
+        logger.info("✅ Volatility analysis: %d signals detectados", len(signals))
         return signals
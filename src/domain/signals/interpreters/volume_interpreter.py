@@ -1,17 +1,44 @@
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from math import nan as NAN
+from types import MappingProxyType
+from datetime import datetime
+from typing import List, Optional
 
 import pandas as pd
 
 from src.domain.signals.interpreters.base_interpreter import BaseStrategyInterpreter
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
+from src.domain.signals.interpreters._kernels import volume_decisions, BUY, SELL
 from src.commons.enums.signal_enums import SignalTypeEnum, SignalStrengthEnum, SignalSourceEnum
 
 logger = logging.getLogger(__name__)
 
-VOLUME_SIGNAL_TTL_DAYS = 60
+_VOLUME_INDICATORS = frozenset({
+    "Volume",
+    "SMA_20_VOL",
+    "avg_volume",
+    "OBV",
+    "volume_spike",
+})
+
+# Parte estática de los meta (solo lectura; cada señal la copia con {**...})
+_SPIKE_META = MappingProxyType(
+    {"kind": "volume_spike", "interpretation": "unusual_volume_high_interest"}
+)
+_BEARISH_DIVERGENCE_META = MappingProxyType({
+    "kind": "obv_divergence",
+    "price_direction": "up",
+    "volume_direction": "down",
+    "interpretation": "up_move_on_weak_volume",
+})
+_BULLISH_DIVERGENCE_META = MappingProxyType({
+    "kind": "obv_divergence",
+    "price_direction": "down",
+    "volume_direction": "up",
+    "interpretation": "down_move_on_strong_volume",
+})
 
 
 class VolumeInterpreter(BaseStrategyInterpreter):
@@ -20,137 +47,100 @@ class VolumeInterpreter(BaseStrategyInterpreter):
     Solo genera señales si la estrategia usa indicadores de volumen.
     """
 
+    TTL_DAYS = 60
+    COLUMNS = ("Volume", "SMA_20_VOL", "OBV", "Close")
+    LOOKBACK = 2
+    REQUIRED_INDICATORS = _VOLUME_INDICATORS
+
     def interpret(
         self,
         df: pd.DataFrame,
         config: StrategyConfigDTO,
+        now: Optional[datetime] = None,
+        inputs: Optional[SignalInputs] = None,
     ) -> List[SignalDTO]:
         logger.info("📦 Analizando volume signals...")
         signals: List[SignalDTO] = []
 
-        if df.empty or "Volume" not in df.columns:
+        if df.empty:
             return signals
 
-        entry_rules = config.params.entry_rules
-        exit_rules = config.params.exit_rules
-        all_rules = entry_rules + exit_rules
-
-        volume_indicators = {
-            "Volume",
-            "SMA_20_VOL",
-            "avg_volume",
-            "OBV",
-            "volume_spike",
-        }
-
-        uses_volume = any(
-            rule.indicator in volume_indicators for rule in all_rules)
-        if not uses_volume:
+        # Solo se leen las 2 últimas filas: indexamos los ndarrays del SoA
+        # en vez de armar Series con df.iloc[-1] / df.iloc[-2]
+        inputs = self._inputs(df, inputs)
+        cols = inputs.cols
+        if "Volume" not in cols:
             return signals
 
-        latest = df.iloc[-1]
+        sma_vol = cols.get("SMA_20_VOL")
+        obv = cols.get("OBV")
+        close = cols.get("Close")
+        has_pair = inputs.n >= 2
+
+        # Escalares para el kernel (NaN = dato ausente)
+        multiplier, divergence = volume_decisions(
+            float(cols["Volume"][-1]),
+            float(sma_vol[-1]) if sma_vol is not None else NAN,
+            float(obv[-2]) if obv is not None and has_pair else NAN,
+            float(obv[-1]) if obv is not None else NAN,
+            float(close[-2]) if close is not None and has_pair else NAN,
+            float(close[-1]) if close is not None else NAN,
+        )
+        price = float(close[-1]) if close is not None else None
+
         symbol = config.symbol
-        now = datetime.now()
-        expires_at = now + timedelta(days=VOLUME_SIGNAL_TTL_DAYS)
+        now, expires_at = self._signal_window(now)
 
         # ============================
         #        VOLUME SPIKE
         # ============================
-        if "SMA_20_VOL" in df.columns and not pd.isna(latest.get("SMA_20_VOL")):
-            current_vol = latest.get("Volume", 0.0)
-            avg_vol = latest["SMA_20_VOL"]
-
-            if avg_vol and avg_vol > 0 and not pd.isna(current_vol):
-                multiplier = float(current_vol / avg_vol)
-
-                if multiplier > 2.0:
-                    confidence = max(
-                        0.6, min(0.95, 0.5 + (multiplier - 2.0) * 0.15))
-                    strength = (
-                        SignalStrengthEnum.EXTREME
-                        if multiplier >= 4
-                        else SignalStrengthEnum.STRONG
-                    )
-
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.VOLUME,
-                            signal_type=SignalTypeEnum.ALERT,
-                            confidence=confidence,
-                            strength=strength,
-                            price=float(latest.get("Close")
-                                        ) if "Close" in df.columns else None,
-                            meta={
-                                "kind": "volume_spike",
-                                "multiplier": round(multiplier, 2),
-                                "interpretation": "unusual_volume_high_interest",
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
-                    )
+        # multiplier NaN (sin datos) nunca supera el umbral
+        if multiplier > 2.0:
+            confidence = max(
+                0.6, min(0.95, 0.5 + (multiplier - 2.0) * 0.15))
+            strength = (
+                SignalStrengthEnum.EXTREME
+                if multiplier >= 4
+                else SignalStrengthEnum.STRONG
+            )
+
+            signals.append(
+                self._mk(
+                    symbol, SignalSourceEnum.VOLUME, SignalTypeEnum.ALERT,
+                    confidence, strength, price,
+                    {
+                        **_SPIKE_META,
+                        "multiplier": self._round2(multiplier),
+                        "strategy_name": config.strategy_name,
+                    },
+                    now, expires_at,
+                )
+            )
 
         # ============================
         #        OBV DIVERGENCE
         # ============================
-        if "OBV" in df.columns and len(df) >= 2 and "Close" in df.columns:
-            obv_curr = latest.get("OBV")
-            obv_prev = df.iloc[-2].get("OBV")
-            price_curr = latest.get("Close")
-            price_prev = df.iloc[-2].get("Close")
-
-            if all(
-                val is not None and not pd.isna(val)
-                for val in [obv_curr, obv_prev, price_curr, price_prev]
-            ):
-                price_up = price_curr > price_prev
-                obv_up = obv_curr > obv_prev
-
-                # Precio sube pero OBV baja → debilidad
-                if price_up and not obv_up:
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.VOLUME,
-                            signal_type=SignalTypeEnum.SELL,
-                            confidence=0.65,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=float(price_curr),
-                            meta={
-                                "kind": "obv_divergence",
-                                "price_direction": "up",
-                                "volume_direction": "down",
-                                "interpretation": "up_move_on_weak_volume",
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
-                    )
-
-                # Precio baja pero OBV sube → fortaleza oculta
-                elif (not price_up) and obv_up:
-                    signals.append(
-                        SignalDTO(
-                            symbol=symbol,
-                            signal_source=SignalSourceEnum.VOLUME,
-                            signal_type=SignalTypeEnum.BUY,
-                            confidence=0.65,
-                            strength=SignalStrengthEnum.MODERATE,
-                            price=float(price_curr),
-                            meta={
-                                "kind": "obv_divergence",
-                                "price_direction": "down",
-                                "volume_direction": "up",
-                                "interpretation": "down_move_on_strong_volume",
-                                "strategy_name": config.strategy_name,
-                            },
-                            created_at=now,
-                            expires_at=expires_at,
-                        )
-                    )
-
-        logger.info(f"✅ Volume analysis: {len(signals)} signals detectados")
+        # Precio sube pero OBV baja → debilidad
+        if divergence == SELL:
+            signals.append(
+                self._mk(
+                    symbol, SignalSourceEnum.VOLUME, SignalTypeEnum.SELL,
+                    0.65, SignalStrengthEnum.MODERATE, price,
+                    {**_BEARISH_DIVERGENCE_META, "strategy_name": config.strategy_name},
+                    now, expires_at,
+                )
+            )
+
+        # Precio baja pero OBV sube → fortaleza oculta
+        elif divergence == BUY:
+            signals.append(
+                self._mk(
+                    symbol, SignalSourceEnum.VOLUME, SignalTypeEnum.BUY,
+                    0.65, SignalStrengthEnum.MODERATE, price,
+                    {**_BULLISH_DIVERGENCE_META, "strategy_name": config.strategy_name},
+                    now, expires_at,
+                )
+            )
+
+        logger.info("✅ Volume analysis: %d signals detectados", len(signals))
         return signals
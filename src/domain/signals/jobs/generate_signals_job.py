@@ -1,16 +1,31 @@
 import logging
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 import asyncio
+import numpy as np
+import pandas as pd
 from ..signals_service import SignalService
+from ..signals_bus import signal_bus
+from ..dtos.signal_dto import SignalDTO
 from src.domain.etl.services.pipeline_service import FeaturePipelineService
 from src.infrastructure.database.client import PostgresClient
 
 
 logger = logging.getLogger(__name__)
 
+# Se quedan en float64: precios que terminan en SignalDTO.price / órdenes,
+# niveles que se comparan contra Close y OBV (acumulado, pierde precisión)
+_FLOAT64_COLUMNS = frozenset((
+    "Open", "High", "Low", "Close",
+    "main_support", "main_resistance",
+    "fvg_start", "fvg_end",
+    "OBV",
+))
+
 
 class GenerateSignalsJob:
+    # Símbolos procesados a la vez (acota la carga sobre la DB / el proveedor)
+    MAX_CONCURRENCY = 8
 
     def __init__(self, db_client: PostgresClient, pipeline: FeaturePipelineService, signals: SignalService) -> None:
         self.db_client = db_client
@@ -24,10 +39,48 @@ class GenerateSignalsJob:
         end = datetime.now()
         start = end - timedelta(hours=200)
 
-        for symbol in symbols:
-            logger.info("Processing symbol: %s", symbol)
-            df = await self.pipeline.start(symbols=symbol, indicators=[], timeframe="1h", start=start, end=end)
-            await self.signals.generate_for_symbol(symbol=symbol, df=df.ohlcv)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+        async def process(symbol: str) -> Optional[SignalDTO]:
+            async with semaphore:
+                logger.info("Processing symbol: %s", symbol)
+                try:
+                    df = await self.pipeline.start(symbols=symbol, indicators=[], timeframe="1h", start=start, end=end)
+                    return await self.signals.generate_for_symbol(
+                        symbol=symbol, df=self._downcast(df.ohlcv), publish=False)
+                except Exception:
+                    # Un símbolo que falla no cancela al resto del batch
+                    logger.exception("Error processing symbol: %s", symbol)
+                    return None
+
+        results = await asyncio.gather(*(process(symbol) for symbol in symbols))
+
+        # Una sola publicación para todo el batch (generate_for_symbol puede
+        # devolver None o [] cuando no hay señal)
+        signals: List[SignalDTO] = [r for r in results if isinstance(r, SignalDTO)]
+        signal_bus.on_next_batch(signals)
+        logger.info("Published %d signals for %d symbols", len(signals), len(symbols))
 
         logger.info("Finished StrategyPerTickerJob at %s",
                     datetime.now().isoformat())
+
+    @staticmethod
+    def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Indicadores float64 → float32 e int64 → el entero más chico que
+        alcance, en un frame nuevo (no pisa el del pipeline). Los
+        intérpretes solo comparan y sacan ratios de estos indicadores;
+        precios, niveles y OBV (_FLOAT64_COLUMNS) quedan en float64.
+        Datetime / categóricas no se tocan.
+        """
+        dtypes = dict.fromkeys(
+            (
+                c for c in df.select_dtypes(include="float64").columns
+                if c not in _FLOAT64_COLUMNS
+            ),
+            np.float32,
+        )
+        for c in df.select_dtypes(include="int64").columns:
+            dtypes[c] = pd.to_numeric(df[c], downcast="integer").dtype
+
+        return df.astype(dtypes) if dtypes else df
@@ -1,4 +1,30 @@
+from typing import Iterable, List
+
 from rx.subject import Subject
 from src.domain.signals.dtos.signal_dto import SignalDTO
 
-signal_bus: Subject = Subject()
+
+class SignalBus(Subject):
+    """
+    Subject de señales con publicación por lotes.
+
+    `on_next_batch` emite la lista completa en `batches` (para suscriptores
+    que persisten en bloque, un solo executemany) y después cada señal en
+    el stream normal, así los suscriptores señal-a-señal no cambian.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: Subject = Subject()
+
+    def on_next_batch(self, signals: Iterable[SignalDTO]) -> None:
+        batch: List[SignalDTO] = [s for s in signals if s is not None]
+        if not batch:
+            return
+
+        self.batches.on_next(batch)
+        for signal in batch:
+            self.on_next(signal)
+
+
+signal_bus: SignalBus = SignalBus()
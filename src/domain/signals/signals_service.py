@@ -1,13 +1,19 @@
+import asyncio
 import logging
+import time
+from datetime import datetime, timedelta
+from itertools import chain
 import pandas as pd
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 
 from src.domain.strategies.dtos.config_dto import StrategyConfigDTO
 from src.domain.signals.dtos.signal_dto import SignalDTO
+from src.domain.signals.dtos.signal_inputs import SignalInputs
 from src.infrastructure.database.repositories.symbol_strategy_repository import SymbolStrategyRepository
 from src.infrastructure.database.client import PostgresClient
 from src.domain.signals.aggregator import SignalAggregator
 from src.domain.signals.signals_bus import signal_bus
+from src.domain.strategies.strategy_bus import strategy_bus
 
 # interpreters
 from src.domain.signals.interpreters.base_interpreter import BaseStrategyInterpreter
@@ -20,12 +26,26 @@ from src.domain.signals.interpreters.risk_interpreter import RiskInterpreter
 
 logger = logging.getLogger(__name__)
 
+# Invariante del pipeline: los intérpretes asumen OHLC presente
+_OHLC = frozenset(("Open", "High", "Low", "Close"))
+
 
 class SignalService:
     """
     Genera señales en tiempo real basadas en la estrategia activa.
     """
 
+    # Vida útil (segundos) de la config activa cacheada por (symbol, timeframe)
+    CONFIG_TTL_SECONDS = 300
+
+    # Antigüedad máxima de la última barra por timeframe. Holgado a propósito:
+    # el índice es tz-naive en hora del exchange (puede diferir de la del
+    # server), pero alcanza para saltear fines de semana / feriados.
+    MAX_DATA_AGE = {
+        "1h": timedelta(hours=12),
+        "1d": timedelta(days=4),
+    }
+
     def __init__(self, db_client: PostgresClient, aggregator: SignalAggregator):
         self.db_client = db_client
         self.aggregator = aggregator
@@ -39,24 +59,49 @@ class SignalService:
             VolatilityInterpreter(),
         ]
 
+        # Unión (sin duplicados, orden estable) de las columnas que leen
+        # los intérpretes: el SoA se arma una sola vez por símbolo
+        self._input_columns = tuple(
+            dict.fromkeys(chain.from_iterable(i.COLUMNS for i in self.interpreters))
+        )
+
+        # Ventana más larga que lee algún intérprete (ATR de 20 barras)
+        self._lookback = max(i.LOOKBACK for i in self.interpreters)
+
+        # (symbol, timeframe) → (monotonic al cargar, config o None,
+        # intérpretes que aplican a esa config)
+        self._config_cache: Dict[
+            Tuple[str, str],
+            Tuple[float, Optional[StrategyConfigDTO], Tuple[BaseStrategyInterpreter, ...]],
+        ] = {}
+        strategy_bus.subscribe(on_next=self._on_strategy_updated)
+
     async def generate_for_symbol(
         self,
         symbol: str,
         df: pd.DataFrame,
         timeframe: str = "1h",
+        publish: bool = True,
     ) -> Optional[SignalDTO]:
+        """
+        Con `publish=False` no emite en signal_bus: el caller junta las
+        señales y las publica juntas con `signal_bus.on_next_batch`.
+        """
 
         if df.empty:
             logger.info(f"❌ Empty DF for {symbol}, no signal")
             return None
 
-        async with self.db_client.get_session() as session:
-            strategy_repo = SymbolStrategyRepository(session)
+        if not _OHLC.issubset(df.columns):
+            logger.error(f"❌ DF for {symbol} is missing OHLC columns, no signal")
+            return None
 
-            config: Optional[StrategyConfigDTO] = await strategy_repo.get_active_strategy_config(
-                symbol=symbol,
-                timeframe=timeframe,
-            )
+        # Datos viejos (fin de semana, feriado): no vale la pena ni abrir sesión
+        if self._is_stale(df, timeframe):
+            logger.info(f"💤 Stale data for {symbol}/{timeframe}, no signal")
+            return None
+
+        config, active = await self._get_active_config(symbol, timeframe)
 
         if not config:
             logger.info(
@@ -68,27 +113,32 @@ class SignalService:
 
         # ======== 1) Ejecutar interpreters ========
         all_signals: List[SignalDTO] = []
+        # Un único timestamp para todas las señales de esta pasada
+        now = datetime.now()
+        inputs = SignalInputs.from_frame(df, self._input_columns, self._lookback)
+
+        # Son independientes entre sí (solo leen df / inputs / config):
+        # corren en threads y pandas/numpy sueltan el GIL en su código C
+        results = await asyncio.gather(
+            *(
+                self._run_interpreter(interpreter, df, config, now, inputs)
+                for interpreter in active
+            )
+        )
 
-        for interpreter in self.interpreters:
-            try:
-                result = interpreter.interpret(df=df, config=config)
-
-                if result:
-                    if isinstance(result, list):
-                        all_signals.extend(result)
-                    else:
-                        all_signals.append(result)
-
-            except Exception as e:
-                logger.error(
-                    f"⚠️ Error en {interpreter.__class__.__name__}: {e}")
+        for result in results:
+            if result:
+                if isinstance(result, list):
+                    all_signals.extend(result)
+                else:
+                    all_signals.append(result)
 
         if not all_signals:
             logger.info("🤷 No signals detected")
             return []
 
         # ======== 2) Fusionar señales ========
-        best = self.aggregator.aggregate(all_signals)
+        best = self.aggregator.aggregate(all_signals, now=now)
 
         if not best:
             logger.info("🤝 Aggregator found no clear consensus → None")
@@ -99,6 +149,88 @@ class SignalService:
             f"({best.strength.value}, conf={best.confidence:.2f})"
         )
 
-        signal_bus.on_next(best)
+        if publish:
+            signal_bus.on_next(best)
 
         return best
+
+    @staticmethod
+    async def _run_interpreter(
+        interpreter: BaseStrategyInterpreter,
+        df: pd.DataFrame,
+        config: StrategyConfigDTO,
+        now: datetime,
+        inputs: SignalInputs,
+    ):
+        try:
+            return await asyncio.to_thread(
+                interpreter.interpret, df, config, now, inputs
+            )
+        except Exception as e:
+            logger.error(
+                f"⚠️ Error en {interpreter.__class__.__name__}: {e}")
+            return None
+
+    def _is_stale(self, df: pd.DataFrame, timeframe: str) -> bool:
+        """
+        True si la última barra es más vieja que MAX_DATA_AGE[timeframe].
+        Sin timestamp (índice reseteado, sin columna Datetime) o con un
+        timeframe desconocido no se descarta nada.
+        """
+        max_age = self.MAX_DATA_AGE.get(timeframe)
+        if max_age is None:
+            return False
+
+        if isinstance(df.index, pd.DatetimeIndex):
+            last_ts = df.index[-1]
+        elif "Datetime" in df.columns:
+            last_ts = pd.Timestamp(df["Datetime"].iat[-1])
+        else:
+            return False
+
+        if pd.isna(last_ts):
+            return False
+        if last_ts.tzinfo is not None:
+            last_ts = last_ts.tz_localize(None)
+
+        return last_ts < datetime.now() - max_age
+
+    async def _get_active_config(
+        self,
+        symbol: str,
+        timeframe: str,
+    ) -> Tuple[Optional[StrategyConfigDTO], Tuple[BaseStrategyInterpreter, ...]]:
+        """
+        Config activa con cache TTL en proceso: la estrategia cambia muy
+        poco, así que la mayoría de los ticks no abren sesión de DB.
+        También se cachea el "no hay estrategia" (None).
+
+        Junto con la config se resuelve (una vez por carga, no por tick)
+        qué intérpretes aplican: los que no comparten ningún indicador con
+        las reglas no se llaman.
+        """
+        key = (symbol, timeframe)
+        now = time.monotonic()
+
+        cached = self._config_cache.get(key)
+        if cached is not None and now - cached[0] < self.CONFIG_TTL_SECONDS:
+            return cached[1], cached[2]
+
+        async with self.db_client.get_session() as session:
+            strategy_repo = SymbolStrategyRepository(session)
+
+            config: Optional[StrategyConfigDTO] = await strategy_repo.get_active_strategy_config(
+                symbol=symbol,
+                timeframe=timeframe,
+            )
+
+        active = (
+            tuple(i for i in self.interpreters if i.applies_to(config))
+            if config is not None
+            else ()
+        )
+        self._config_cache[key] = (now, config, active)
+        return config, active
+
+    def _on_strategy_updated(self, key: Tuple[str, str]) -> None:
+        self._config_cache.pop(key, None)
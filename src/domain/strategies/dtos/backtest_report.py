@@ -2,9 +2,12 @@ from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BacktestReport:
-    """Backtest results report for a strategy run on a single asset."""
+    """
+    Backtest results report for a strategy run on a single asset.
+    Immutable once built (metadata dict contents aside).
+    """
 
     asset: str
     strategy_name: str
@@ -28,15 +31,19 @@ class BacktestReport:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
     def print_summary(self):
-        print(f"Backtest Report for {self.strategy_name} on {self.asset}:")
-        print(f"  Total Return: {self.total_return:.2%}")
-        print(f"  Sharpe Ratio: {self.sharpe_ratio:.2f}")
-        print(f"  Max Drawdown: {self.max_drawdown:.2%}")
-        print(f"  Win Rate: {self.win_rate:.2%}")
-        print(f"  Total Trades: {self.total_trades}")
+        lines = [
+            f"Backtest Report for {self.strategy_name} on {self.asset}:",
+            f"  Total Return: {self.total_return:.2%}",
+            f"  Sharpe Ratio: {self.sharpe_ratio:.2f}",
+            f"  Max Drawdown: {self.max_drawdown:.2%}",
+            f"  Win Rate: {self.win_rate:.2%}",
+            f"  Total Trades: {self.total_trades}",
+        ]
         if self.profit_factor is not None:
-            print(f"  Profit Factor: {self.profit_factor:.2f}")
+            lines.append(f"  Profit Factor: {self.profit_factor:.2f}")
         if self.expectancy is not None:
-            print(f"  Expectancy: {self.expectancy:.2f}")
+            lines.append(f"  Expectancy: {self.expectancy:.2f}")
         if self.average_trade_return is not None:
-            print(f"  Average Trade Return: {self.average_trade_return:.2%}")
+            lines.append(f"  Average Trade Return: {self.average_trade_return:.2%}")
+        # Una sola escritura a stdout por reporte
+        print("\n".join(lines))
@@ -1,4 +1,6 @@
-from typing import Optional, List, Literal, Dict, Union
+from functools import cached_property
+from itertools import chain
+from typing import FrozenSet, Optional, List, Literal, Dict, Union
 from pydantic import BaseModel
 
 
@@ -39,3 +41,19 @@ class StrategyConfigDTO(BaseModel):
     sharpe_ratio: Optional[float] = None
     max_drawdown_pct: Optional[float] = None
     return_pct: Optional[float] = None
+
+    @cached_property
+    def indicator_set(self) -> FrozenSet[str]:
+        """
+        Indicadores referenciados por las reglas de entrada/salida.
+        Se calcula una vez por config; los intérpretes lo consultan en cada bar.
+        """
+        return frozenset(
+            rule.indicator
+            for rule in chain(self.params.entry_rules, self.params.exit_rules)
+        )
+
+    @cached_property
+    def has_fvg_rules(self) -> bool:
+        """Si alguna regla usa indicadores de Fair Value Gap (`fvg_*`)."""
+        return any(indicator.startswith("fvg_") for indicator in self.indicator_set)
@@ -1,23 +1,50 @@
-from .sma_crossover import SMACrossoverStrategy
-from .sma_crossover_rsi_avgvol import SMACrossoverWithRSIAndAvgVolStrategy
-from .sma_crossover_rsi_vol_tpsl import SMACrossoverRSIVolWithTPSLStrategy
-from .macd import MACDStrategy
-from .rsi import RSIStrategy
-from .rsi_trend import RSIWithTrendSignalStrategy
-from .breakout_signal import BreakoutSignalStrategy
-from .fair_value_gap import FairValueGapStrategy
-from .volume_spike import VolumeSpikeEntryStrategy
-
-strategies = {
-    "SMACrossoverStrategy": SMACrossoverStrategy,
-    "SMACrossoverWithRSIAndAvgVolStrategy": SMACrossoverWithRSIAndAvgVolStrategy,
-    "SMACrossoverRSIVolWithTPSLStrategy": SMACrossoverRSIVolWithTPSLStrategy,
-    "MACDStrategy": MACDStrategy,
-    "RSIStrategy": RSIStrategy,
-    "RSIWithTrendSignalStrategy": RSIWithTrendSignalStrategy,
-    "BreakoutSignalStrategy": BreakoutSignalStrategy,
-    "FairValueGapStrategy": FairValueGapStrategy,
-    "VolumeSpikeEntryStrategy": VolumeSpikeEntryStrategy,
+from collections.abc import Mapping
+from importlib import import_module
+from typing import Dict, Iterator, Type
+
+# nombre → "módulo:Clase". Los módulos (backtesting, pandas_ta, ...) se
+# importan recién la primera vez que se pide la estrategia.
+_STRATEGY_PATHS: Dict[str, str] = {
+    "SMACrossoverStrategy": f"{__name__}.sma_crossover:SMACrossoverStrategy",
+    "SMACrossoverWithRSIAndAvgVolStrategy": f"{__name__}.sma_crossover_rsi_avgvol:SMACrossoverWithRSIAndAvgVolStrategy",
+    "SMACrossoverRSIVolWithTPSLStrategy": f"{__name__}.sma_crossover_rsi_vol_tpsl:SMACrossoverRSIVolWithTPSLStrategy",
+    "MACDStrategy": f"{__name__}.macd:MACDStrategy",
+    "RSIStrategy": f"{__name__}.rsi:RSIStrategy",
+    "RSIWithTrendSignalStrategy": f"{__name__}.rsi_trend:RSIWithTrendSignalStrategy",
+    "BreakoutSignalStrategy": f"{__name__}.breakout_signal:BreakoutSignalStrategy",
+    "FairValueGapStrategy": f"{__name__}.fair_value_gap:FairValueGapStrategy",
+    "VolumeSpikeEntryStrategy": f"{__name__}.volume_spike:VolumeSpikeEntryStrategy",
 }
 
+
+class _LazyRegistry(Mapping):
+    """
+    Mapping nombre → clase de estrategia que importa cada módulo en el
+    primer acceso y lo cachea. `keys()` / `in` / `len` no importan nada.
+    """
+
+    def __init__(self, paths: Dict[str, str]) -> None:
+        self._paths = paths
+        self._loaded: Dict[str, Type] = {}
+
+    def __getitem__(self, name: str) -> Type:
+        cls = self._loaded.get(name)
+        if cls is None:
+            module_path, cls_name = self._paths[name].split(":")
+            cls = getattr(import_module(module_path), cls_name)
+            self._loaded[name] = cls
+        return cls
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._paths
+
+
+strategies = _LazyRegistry(_STRATEGY_PATHS)
+
 __all__ = ["strategies"]
@@ -0,0 +1,103 @@
+"""
+Kernels de señales de las estrategias de backtesting.
+
+Evalúan las reglas de entrada / salida sobre la serie completa en `init()`
+y devuelven máscaras booleanas por barra; `next()` solo indexa la barra
+actual. Misma semántica que `backtesting.lib.crossover`: cruce estricto
+(a[i-1] < b[i-1] y a[i] > b[i]) y cualquier NaN da False.
+"""
+import numpy as np
+
+from src.commons.njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def crossover_mask(a, b):
+    """True en las barras donde `a` cruza por encima de `b`."""
+    out = np.zeros(a.shape[0], dtype=np.bool_)
+    if a.shape[0] > 1:
+        out[1:] = (a[:-1] < b[:-1]) & (a[1:] > b[1:])
+    return out
+
+
+@njit(cache=True)
+def sma_cross_signals(sma_fast, sma_slow, rsi, volume, avg_volume, rsi_entry_max, rsi_exit_min):
+    """
+    Reglas de la familia SMA + RSI + volumen.
+
+    Entrada: fast cruza arriba de slow, RSI < rsi_entry_max y
+    volumen > volumen promedio. Salida: slow cruza arriba de fast o
+    RSI > rsi_exit_min. Devuelve (entry_mask, exit_mask).
+    """
+    entry = (
+        crossover_mask(sma_fast, sma_slow)
+        & (rsi < rsi_entry_max)
+        & (volume > avg_volume)
+    )
+    exit_ = crossover_mask(sma_slow, sma_fast) | (rsi > rsi_exit_min)
+    return entry, exit_
+
+
+@njit(cache=True)
+def spike_signals(spike, cooldown):
+    """
+    Entradas / salidas de la estrategia de spikes en una pasada.
+
+    Recorre la serie con la misma máquina de estados que next(): entra con
+    spike si pasaron más de `cooldown` barras desde la última salida y sale
+    en la primera barra sin spike. Devuelve (entry_mask, exit_mask).
+    """
+    n = spike.shape[0]
+    entries = np.zeros(n, dtype=np.bool_)
+    exits = np.zeros(n, dtype=np.bool_)
+    in_position = False
+    last_exit = -cooldown - 1
+
+    for i in range(n):
+        if not in_position:
+            if spike[i] and i - last_exit > cooldown:
+                entries[i] = True
+                in_position = True
+        elif not spike[i]:
+            exits[i] = True
+            in_position = False
+            last_exit = i
+
+    return entries, exits
+
+
+@njit(cache=True)
+def sma_sliding(x, window):
+    """
+    SMA con suma deslizante en O(N) (pandas rolling().mean() equivalente).
+    Las primeras `window - 1` posiciones quedan en NaN; asume `x` sin NaN
+    (un NaN contamina la suma de ahí en adelante).
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return out
+
+    total = 0.0
+    for i in range(window):
+        total += x[i]
+    out[window - 1] = total / window
+    for i in range(window, n):
+        total += x[i] - x[i - window]
+        out[i] = total / window
+    return out
+
+
+def as_float(values) -> np.ndarray:
+    """Serie / _Array de backtesting → ndarray float64 contiguo para los kernels."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+if NUMBA_AVAILABLE:
+    # Warmup: compila (o carga del cache) al importar, al levantar la app,
+    # y no dentro del primer StrategyPerTickerJob
+    _zeros = np.zeros(2)
+    crossover_mask(_zeros, _zeros)
+    sma_cross_signals(_zeros, _zeros, _zeros, _zeros, _zeros, 60.0, 70.0)
+    spike_signals(np.zeros(2, dtype=np.bool_), 0)
+    sma_sliding(_zeros, 1)
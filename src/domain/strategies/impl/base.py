@@ -1,15 +1,121 @@
+from functools import lru_cache
+from itertools import chain
 from backtesting import Strategy
-from typing import ClassVar
+from typing import Any, ClassVar, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 from src.domain.strategies.dtos.config_dto import StrategyParamsDTO
+from src.domain.strategies.impl._signals import sma_sliding, as_float
+
+
+_OHLCV = ("Open", "High", "Low", "Close", "Volume")
+
+# Columnas que se pueden recalcular si faltan en el df: columna → (fuente, ventana)
+_SMA_FALLBACKS: Dict[str, Tuple[str, int]] = {
+    "SMA_5": ("Close", 5),
+    "SMA_8": ("Close", 8),
+    "SMA_20_VOL": ("Volume", 20),
+}
+
+
+def column_values(
+    df: pd.DataFrame,
+    column: str,
+    sma_of: Optional[str] = None,
+    window: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Columna del df como ndarray float64. Si falta, se recalcula como SMA
+    de `sma_of` con `window` (o de la entrada de _SMA_FALLBACKS); sin
+    fallback levanta AttributeError. Mismo criterio para backtesting.py
+    (`ConfigurableStrategy.column`) y para `vector_signals`.
+    """
+    if column in df.columns:
+        return as_float(df[column])
+    if sma_of is None or window is None:
+        sma_of, window = _SMA_FALLBACKS.get(column, (sma_of, window))
+    if sma_of is None or window is None:
+        raise AttributeError(f"Column '{column}' not in data")
+    return sma_sliding(as_float(df[sma_of]), window)
+
+
+@lru_cache(maxsize=None)
+def _config_dict(cls: type) -> Dict[str, Any]:
+    return cls.get_config().model_dump()
+
+
+@lru_cache(maxsize=None)
+def _required_columns(cls: type) -> Tuple[str, ...]:
+    config = cls.get_config()
+    referenced = chain.from_iterable(
+        (rule.indicator, rule.value) if isinstance(rule.value, str) else (rule.indicator,)
+        for rule in chain(config.entry_rules, config.exit_rules)
+    )
+    # dict.fromkeys: sin duplicados y conservando el orden
+    return tuple(dict.fromkeys(chain(_OHLCV, referenced, cls.EXTRA_COLUMNS)))
 
 
 class ConfigurableStrategy(Strategy):
     CONFIG: ClassVar[StrategyParamsDTO]
+    # Columnas que lee la estrategia y no aparecen en las reglas del CONFIG
+    EXTRA_COLUMNS: ClassVar[Tuple[str, ...]] = ()
 
     @classmethod
     def get_config(cls) -> StrategyParamsDTO:
         return cls.CONFIG
 
+    @classmethod
+    def config_dict(cls) -> Dict[str, Any]:
+        """
+        `model_dump()` del CONFIG, cacheado por clase (CONFIG es estático).
+        Es un dict compartido: no mutarlo.
+        """
+        return _config_dict(cls)
+
+    @classmethod
+    def required_columns(cls) -> Tuple[str, ...]:
+        """OHLCV + indicadores de las reglas (y sus `value` columna) + EXTRA_COLUMNS."""
+        return _required_columns(cls)
+
+    @classmethod
+    def vector_signals(
+        cls,
+        df: pd.DataFrame,
+        params: Dict[str, Any],
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]]:
+        """
+        Señales para VectorizedBacktestEngine: (entries, exits, sl, tp) por
+        barra, con sl / tp como niveles absolutos (None = sin nivel).
+        None = la estrategia no tiene versión vectorizada y corre en
+        backtesting.py.
+        """
+        return None
+
+    @classmethod
+    def has_vector_signals(cls) -> bool:
+        return cls.vector_signals.__func__ is not ConfigurableStrategy.vector_signals.__func__
+
+    def column(
+        self,
+        column: str,
+        name: Optional[str] = None,
+        sma_of: Optional[str] = None,
+        window: Optional[int] = None,
+    ):
+        """
+        Registra una columna del df como indicador pasando el array directo
+        (sin lambda). Si la columna falta se recalcula como SMA con la suma
+        deslizante: de `sma_of` / `window` o del fallback de la columna
+        (ver `column_values`).
+        """
+        name = name or column
+        if column in self.data.df.columns:
+            return self.I(np.asarray, getattr(self.data, column), name=name)
+        return self.I(
+            column_values, self.data.df, column, sma_of, window, name=name
+        )
+
     @property
     def params(self):
         raw = getattr(self, '_params', None)
@@ -1,4 +1,4 @@
-import pandas as pd
+import numpy as np
 from src.domain.strategies.impl.base import ConfigurableStrategy
 from src.domain.strategies.dtos.config_dto import StrategyParamsDTO, Condition, RiskSettings
 
@@ -43,19 +43,25 @@ class BreakoutSignalStrategy(ConfigurableStrategy):
             lambda: self.data.main_resistance, name="MainResistance"
         )
 
+        # Reglas evaluadas para todas las barras de una vez; `next()` solo
+        # indexa la barra actual. Sin resistencia (NaN) no hay entrada
+        # (la comparación da False) ni salida.
+        trend = np.asarray(self.trend_signal, dtype=float)
+        macd = np.asarray(self.macd, dtype=float)
+        macd_signal = np.asarray(self.macd_signal, dtype=float)
+        close = np.asarray(self.close, dtype=float)
+        resistance = np.asarray(self.main_resistance, dtype=float)
+
+        self._long_ok = (trend == 1) & (macd > macd_signal) & (close > resistance)
+        self._exit_ok = ~np.isnan(resistance) & (
+            (trend == -1) | (macd < macd_signal)
+        )
+
     def next(self):
-        if pd.isna(self.main_resistance[-1]):
-            return
+        bar = len(self.data) - 1
 
         if not self.position:
-            if (
-                self.trend_signal[-1] == 1
-                and self.macd[-1] > self.macd_signal[-1]
-                and self.close[-1] > self.main_resistance[-1]
-            ):
+            if self._long_ok[bar]:
                 self.buy()
-        elif (
-            self.trend_signal[-1] == -1
-            or self.macd[-1] < self.macd_signal[-1]
-        ):
+        elif self._exit_ok[bar]:
             self.position.close()
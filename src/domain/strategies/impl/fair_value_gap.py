@@ -1,4 +1,4 @@
-import pandas as pd
+import numpy as np
 from src.domain.strategies.impl.base import ConfigurableStrategy
 from src.domain.strategies.dtos.config_dto import (
     StrategyParamsDTO,
@@ -44,11 +44,18 @@ class FairValueGapStrategy(ConfigurableStrategy):
         },
     )
 
+    # Límites del gap: se leen en next() pero no están en las reglas
+    EXTRA_COLUMNS = ("fvg_start", "fvg_end")
+
     # === Atributos de implementación concreta ===
     use_momentum_filter = True
     risk_reward_ratio = 2.0  # RR 2:1
+    _RISK_PER_TRADE = 0.05  # igual a CONFIG.metadata["risk_per_trade"]
 
     def init(self):
+        # Un solo set de columnas en vez de probar atributos del proxy _Data
+        cols = frozenset(self.data.df.columns)
+
         self.fvg_type = self.I(lambda: self.data.fvg_type, name="FVG_Type")
         self.fvg_start = self.I(lambda: self.data.fvg_start, name="FVG_Start")
         self.fvg_end = self.I(lambda: self.data.fvg_end, name="FVG_End")
@@ -57,14 +64,12 @@ class FairValueGapStrategy(ConfigurableStrategy):
         # RSI
         self.rsi = (
             self.I(lambda: self.data.RSI_14, name="RSI")
-            if hasattr(self.data, "RSI_14")
+            if "RSI_14" in cols
             else None
         )
 
         # MACD
-        if hasattr(self.data, "MACD_12_26_9") and hasattr(
-            self.data, "MACDs_12_26_9"
-        ):
+        if "MACD_12_26_9" in cols and "MACDs_12_26_9" in cols:
             self.macd = self.I(lambda: self.data.MACD_12_26_9, name="MACD")
             self.macd_signal = self.I(
                 lambda: self.data.MACDs_12_26_9, name="MACD_Signal"
@@ -73,50 +78,52 @@ class FairValueGapStrategy(ConfigurableStrategy):
             self.macd = None
             self.macd_signal = None
 
+        self._long_entry, self._short_entry = self._entry_masks()
+
     # --------------------------------------------------------------------
 
-    def has_momentum_confirmation(self, fvg_type):
-        """Verifica confirmación de momentum si está habilitada"""
-        if not self.use_momentum_filter:
-            return True
-
-        # --- RSI ---
-        if self.rsi is not None:
-            rsi_val = self.rsi[-1]
-            if fvg_type == 1 and rsi_val <= 60:
-                return False
-            if fvg_type == -1 and rsi_val >= 40:
-                return False
-
-        # --- MACD ---
-        if self.macd is not None and self.macd_signal is not None:
-            macd_val, sig_val = self.macd[-1], self.macd_signal[-1]
-            if fvg_type == 1 and macd_val <= sig_val:
-                return False
-            if fvg_type == -1 and macd_val >= sig_val:
-                return False
-
-        return True
+    def _entry_masks(self):
+        """
+        Gap + confirmación de momentum (si está habilitada) para todas las
+        barras de una vez; no depende de la posición, así que `next()` solo
+        indexa la barra actual.
+
+        Los filtros descartan con `~(x <= umbral)`: igual que el chequeo
+        por barra, un RSI / MACD en NaN no bloquea la entrada.
+        """
+        fvg = np.asarray(self.fvg_type, dtype=float)
+        long_ok = fvg == 1
+        short_ok = fvg == -1
+
+        if self.use_momentum_filter:
+            # --- RSI ---
+            if self.rsi is not None:
+                rsi = np.asarray(self.rsi, dtype=float)
+                long_ok &= ~(rsi <= 60)
+                short_ok &= ~(rsi >= 40)
+
+            # --- MACD ---
+            if self.macd is not None and self.macd_signal is not None:
+                macd = np.asarray(self.macd, dtype=float)
+                sig = np.asarray(self.macd_signal, dtype=float)
+                long_ok &= ~(macd <= sig)
+                short_ok &= ~(macd >= sig)
+
+        return long_ok, short_ok
 
     # --------------------------------------------------------------------
 
-    def calculate_position_size(self, gap_size, current_price):
+    def calculate_position_size(self, gap_size):
         """
         Size debe cumplir:
         - entero >= 1   → válido
         """
-        risk_per_trade = 0.05
         stop_distance = gap_size * 0.5
 
-        if stop_distance <= 0:
-            return 1  # fallback seguro
-
-        raw_size = (risk_per_trade * self.equity) / stop_distance
-
-        # Size entero en rango seguro
-        size = int(max(1, min(1000, raw_size)))
-
-        return size
+        # stop <= 0 → fallback seguro; si no, size entero en [1, 1000]
+        return 1 if stop_distance <= 0.0 else max(
+            1, min(1000, int(self._RISK_PER_TRADE * self.equity / stop_distance))
+        )
 
     # --------------------------------------------------------------------
 
@@ -125,21 +132,22 @@ class FairValueGapStrategy(ConfigurableStrategy):
         current_fvg = self.fvg_type[-1]
         current_gap_size = self.fvg_size[-1]
 
-        if pd.isna(current_fvg) or pd.isna(current_gap_size):
+        # NaN != NaN: chequeo sin llamar a pd.isna en cada barra
+        if current_fvg != current_fvg or current_gap_size != current_gap_size:
             return
 
+        bar = len(self.data) - 1
+
         # ============================
         #       ENTRADA LONG
         # ============================
         if not self.position and current_fvg == 1:
-            if self.has_momentum_confirmation(1):
+            if self._long_entry[bar]:
 
-                position_size = self.calculate_position_size(
-                    current_gap_size, current_price
-                )
+                position_size = self.calculate_position_size(current_gap_size)
 
                 gap_start = self.fvg_start[-1]
-                if pd.isna(gap_start):
+                if gap_start != gap_start:
                     return
 
                 stop_loss = gap_start * 0.995
@@ -153,14 +161,12 @@ class FairValueGapStrategy(ConfigurableStrategy):
         #       ENTRADA SHORT
         # ============================
         elif not self.position and current_fvg == -1:
-            if self.has_momentum_confirmation(-1):
+            if self._short_entry[bar]:
 
-                position_size = self.calculate_position_size(
-                    current_gap_size, current_price
-                )
+                position_size = self.calculate_position_size(current_gap_size)
 
                 gap_start = self.fvg_start[-1]
-                if pd.isna(gap_start):
+                if gap_start != gap_start:
                     return
 
                 stop_loss = gap_start * 1.005
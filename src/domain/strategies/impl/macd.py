@@ -1,7 +1,7 @@
 import pandas as pd
-from backtesting.lib import crossover
 
 from src.domain.strategies.impl.base import ConfigurableStrategy
+from src.domain.strategies.impl._signals import crossover_mask, as_float
 from src.domain.strategies.dtos.config_dto import (
     StrategyParamsDTO,
     Condition,
@@ -34,15 +34,22 @@ class MACDStrategy(ConfigurableStrategy):
     )
 
     def init(self):
-        self.macd = self.I(lambda: self.data.MACD_12_26_9, name="MACD")
-        self.signal = self.I(
-            lambda: self.data.MACDs_12_26_9, name="MACD_Signal")
+        self.macd = self.column("MACD_12_26_9", name="MACD")
+        self.signal = self.column("MACDs_12_26_9", name="MACD_Signal")
+
+        # Cruces precalculados para todas las barras; next() solo indexa
+        macd, signal = as_float(self.macd), as_float(self.signal)
+        self._entry_mask = crossover_mask(macd, signal)
+        self._exit_mask = crossover_mask(signal, macd)
 
     def next(self):
+        bar = len(self.data) - 1
+
         # Entrada
-        if not self.position and crossover(self.macd, self.signal):
-            self.buy()
+        if not self.position:
+            if self._entry_mask[bar]:
+                self.buy()
 
         # Salida
-        elif self.position and crossover(self.signal, self.macd):
+        elif self._exit_mask[bar]:
             self.position.close()
@@ -34,10 +34,12 @@ class RSIWithTrendSignalStrategy(ConfigurableStrategy):
         self.trend_signal = self.I(
             lambda: self.data.trend_signal, name="Trend")
         self.last_exit_index = -np.inf
+        # Se lee una vez por backtest, no en cada barra
+        self._cooldown = self.CONFIG.risk.cooldown_period or 0
 
     def next(self):
         i = len(self.data) - 1
-        cooldown = getattr(self.CONFIG.risk, "cooldown_period", 0)
+        cooldown = self._cooldown
 
         # Entrada
         if (
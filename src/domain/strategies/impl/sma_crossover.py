@@ -1,5 +1,5 @@
-from backtesting.lib import crossover
-from src.domain.strategies.impl.base import ConfigurableStrategy
+from src.domain.strategies.impl.base import ConfigurableStrategy, column_values
+from src.domain.strategies.impl._signals import crossover_mask, as_float
 from src.domain.strategies.dtos.config_dto import (
     StrategyParamsDTO,
     Condition,
@@ -36,15 +36,28 @@ class SMACrossoverStrategy(ConfigurableStrategy):
         metadata={"description": "Cruce de medias móviles SMA_5 / SMA_8"},
     )
 
+    @classmethod
+    def vector_signals(cls, df, params):
+        sma_5, sma_8 = column_values(df, "SMA_5"), column_values(df, "SMA_8")
+        return crossover_mask(sma_5, sma_8), crossover_mask(sma_8, sma_5), None, None
+
     def init(self):
-        self.sma_5 = self.I(lambda: self.data.SMA_5, name="SMA_5")
-        self.sma_8 = self.I(lambda: self.data.SMA_8, name="SMA_8")
+        self.sma_5 = self.column("SMA_5")
+        self.sma_8 = self.column("SMA_8")
+
+        # Cruces precalculados para todas las barras; next() solo indexa
+        sma_5, sma_8 = as_float(self.sma_5), as_float(self.sma_8)
+        self._entry_mask = crossover_mask(sma_5, sma_8)
+        self._exit_mask = crossover_mask(sma_8, sma_5)
 
     def next(self):
+        bar = len(self.data) - 1
+
         # ENTRY
-        if not self.position and crossover(self.sma_5, self.sma_8):
-            self.buy()
+        if not self.position:
+            if self._entry_mask[bar]:
+                self.buy()
 
         # EXIT
-        elif self.position and crossover(self.sma_8, self.sma_5):
+        elif self._exit_mask[bar]:
             self.position.close()
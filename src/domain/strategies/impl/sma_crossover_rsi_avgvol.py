@@ -1,5 +1,5 @@
-from backtesting.lib import crossover
-from src.domain.strategies.impl.base import ConfigurableStrategy
+from src.domain.strategies.impl.base import ConfigurableStrategy, column_values
+from src.domain.strategies.impl._signals import sma_cross_signals, as_float
 from src.domain.strategies.dtos.config_dto import (
     StrategyParamsDTO,
     Condition,
@@ -67,27 +67,45 @@ class SMACrossoverWithRSIAndAvgVolStrategy(ConfigurableStrategy):
         },
     )
 
+    @classmethod
+    def vector_signals(cls, df, params):
+        entry, exit_ = sma_cross_signals(
+            column_values(df, "SMA_5"),
+            column_values(df, "SMA_8"),
+            as_float(df["RSI_14"]),
+            as_float(df["Volume"]),
+            column_values(df, "SMA_20_VOL"),
+            60.0,
+            70.0,
+        )
+        return entry, exit_, None, None
+
     def init(self):
-        self.volume = self.I(lambda: self.data.Volume)
-        self.avg_volume = self.I(
-            lambda: self.data.SMA_20_VOL, name="SMA_20_VOL"
+        self.volume = self.column("Volume")
+        self.avg_volume = self.column("SMA_20_VOL")
+        self.rsi = self.column("RSI_14")
+        self.sma_5 = self.column("SMA_5")
+        self.sma_8 = self.column("SMA_8")
+
+        # Reglas precalculadas para todas las barras; next() solo indexa
+        self._entry_mask, self._exit_mask = sma_cross_signals(
+            as_float(self.sma_5),
+            as_float(self.sma_8),
+            as_float(self.rsi),
+            as_float(self.volume),
+            as_float(self.avg_volume),
+            60.0,
+            70.0,
         )
-        self.rsi = self.I(lambda: self.data.RSI_14, name="RSI_14")
-        self.sma_5 = self.I(lambda: self.data.SMA_5, name="SMA_5")
-        self.sma_8 = self.I(lambda: self.data.SMA_8, name="SMA_8")
 
     def next(self):
+        bar = len(self.data) - 1
+
         # Entrada: cruce alcista + RSI bajo + volumen mayor al promedio
-        if (
-            not self.position
-            and crossover(self.sma_5, self.sma_8)
-            and self.rsi[-1] < 60
-            and self.volume[-1] > self.avg_volume[-1]
-        ):
-            self.buy()
+        if not self.position:
+            if self._entry_mask[bar]:
+                self.buy()
 
         # Salida: cruce bajista o RSI alto
-        elif self.position and (
-            crossover(self.sma_8, self.sma_5) or self.rsi[-1] > 70
-        ):
+        elif self._exit_mask[bar]:
             self.position.close()
@@ -1,5 +1,5 @@
-from backtesting.lib import crossover
-from src.domain.strategies.impl.base import ConfigurableStrategy
+from src.domain.strategies.impl.base import ConfigurableStrategy, column_values
+from src.domain.strategies.impl._signals import sma_cross_signals, as_float
 from src.domain.strategies.dtos.config_dto import (
     StrategyParamsDTO,
     Condition,
@@ -53,14 +53,41 @@ class SMACrossoverRSIVolWithTPSLStrategy(ConfigurableStrategy):
         },
     )
 
+    @classmethod
+    def vector_signals(cls, df, params):
+        entry, exit_ = sma_cross_signals(
+            column_values(df, "SMA_5"),
+            column_values(df, "SMA_8"),
+            as_float(df["RSI_14"]),
+            as_float(df["Volume"]),
+            column_values(df, "SMA_20_VOL"),
+            60.0,
+            70.0,
+        )
+        # Niveles fijos sobre el Close de la barra de señal, como en next()
+        close = as_float(df["Close"])
+        tp_pct = params.get("take_profit_pct", cls.CONFIG.risk.take_profit_pct)
+        sl_pct = params.get("stop_loss_pct", cls.CONFIG.risk.stop_loss_pct)
+        return entry, exit_, close * (1 - sl_pct), close * (1 + tp_pct)
+
     def init(self):
         # Indicators mapped exactly as used in CONFIG
-        self.volume = self.I(lambda: self.data.Volume)
-        self.avg_volume = self.I(
-            lambda: self.data.SMA_20_VOL, name="SMA_20_VOL")
-        self.rsi = self.I(lambda: self.data.RSI_14, name="RSI_14")
-        self.sma_5 = self.I(lambda: self.data.SMA_5, name="SMA_5")
-        self.sma_8 = self.I(lambda: self.data.SMA_8, name="SMA_8")
+        self.volume = self.column("Volume")
+        self.avg_volume = self.column("SMA_20_VOL")
+        self.rsi = self.column("RSI_14")
+        self.sma_5 = self.column("SMA_5")
+        self.sma_8 = self.column("SMA_8")
+
+        # Reglas precalculadas para todas las barras; next() solo indexa
+        self._entry_mask, self._exit_mask = sma_cross_signals(
+            as_float(self.sma_5),
+            as_float(self.sma_8),
+            as_float(self.rsi),
+            as_float(self.volume),
+            as_float(self.avg_volume),
+            60.0,
+            70.0,
+        )
 
         # Load configurable risk settings
         self.tp_pct = self.params.get(
@@ -69,22 +96,17 @@ class SMACrossoverRSIVolWithTPSLStrategy(ConfigurableStrategy):
             "stop_loss_pct", self.CONFIG.risk.stop_loss_pct)
 
     def next(self):
-        price = self.data.Close[-1]
+        bar = len(self.data) - 1
 
         # ENTRY
-        if (
-            not self.position
-            and crossover(self.sma_5, self.sma_8)
-            and self.rsi[-1] < 60
-            and self.volume[-1] > self.avg_volume[-1]
-        ):
-            stop_loss = price * (1 - self.sl_pct)
-            take_profit = price * (1 + self.tp_pct)
+        if not self.position:
+            if self._entry_mask[bar]:
+                price = self.data.Close[-1]
+                stop_loss = price * (1 - self.sl_pct)
+                take_profit = price * (1 + self.tp_pct)
 
-            self.buy(sl=stop_loss, tp=take_profit)
+                self.buy(sl=stop_loss, tp=take_profit)
 
         # EXIT
-        elif self.position and (
-            crossover(self.sma_8, self.sma_5) or self.rsi[-1] > 70
-        ):
+        elif self._exit_mask[bar]:
             self.position.close()
@@ -1,5 +1,6 @@
 import numpy as np
 from src.domain.strategies.impl.base import ConfigurableStrategy
+from src.domain.strategies.impl._signals import spike_signals
 from src.domain.strategies.dtos.config_dto import (
     StrategyParamsDTO,
     Condition,
@@ -39,22 +40,29 @@ class VolumeSpikeEntryStrategy(ConfigurableStrategy):
         metadata={"description": "Entrada basada en volumen extremo"},
     )
 
+    @classmethod
+    def vector_signals(cls, df, params):
+        # El cooldown lo aplica el engine con CONFIG.risk.cooldown_period
+        spike = df["volume_spike"].to_numpy().astype(bool)
+        return spike, ~spike, None, None
+
     def init(self):
-        self.spike = self.I(lambda: self.data.volume_spike, name="VolSpike")
-        self.last_exit_index = -np.inf
+        self.spike = self.column("volume_spike", name="VolSpike")
+        # Spike + cooldown resueltos en una pasada sobre toda la serie;
+        # next() solo indexa la barra actual
+        self._entry_mask, self._exit_mask = spike_signals(
+            np.asarray(self.spike).astype(bool),
+            int(self.CONFIG.risk.cooldown_period or 0),
+        )
 
     def next(self):
-        i = len(self.data) - 1
+        bar = len(self.data) - 1
 
         # ENTRY
-        if (
-            not self.position
-            and self.spike[-1]
-            and (i - self.last_exit_index) > self.CONFIG.risk.cooldown_period
-        ):
-            self.buy()
+        if not self.position:
+            if self._entry_mask[bar]:
+                self.buy()
 
         # EXIT
-        elif self.position and not self.spike[-1]:
+        elif self._exit_mask[bar]:
             self.position.close()
-            self.last_exit_index = i
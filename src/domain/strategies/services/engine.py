@@ -1,16 +1,86 @@
-from typing import List, Type, Dict, Any, Optional
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Tuple, Type, Dict, Any, Optional
+import numpy as np
 import pandas as pd
 from backtesting import Backtest
 from src.domain.strategies.dtos.backtest_report import BacktestReport
 from src.domain.strategies.services.registry import STRATEGY_REGISTRY
 from src.domain.strategies.impl.base import ConfigurableStrategy
+from src.domain.strategies.services.vector_engine import VectorizedBacktestEngine
+
+# El pool se abre desde un proceso con event loop y threads (BacktestService):
+# un fork heredaría locks tomados por otros threads. forkserver (o spawn
+# donde no existe) arranca los workers limpios.
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
 
 
 class BacktestEngine:
 
-    def __init__(self, cash: float = 200_000, commission: float = 0.001):
+    def __init__(
+        self,
+        cash: float = 200_000,
+        commission: float = 0.001,
+        max_workers: int = 1,
+        vectorized: bool = False,
+        strategy_names: Optional[List[str]] = None,
+    ):
+        """
+        max_workers > 1 corre las estrategias de cada activo en un pool de
+        procesos (Backtest.run() es CPU puro y no suelta el GIL).
+        Con 1 todo corre secuencial en el proceso actual.
+
+        vectorized=True corre en VectorizedBacktestEngine las estrategias
+        que tienen `vector_signals`; el resto sigue en backtesting.py.
+
+        `strategy_names` (default: todo el registry) se resuelve a clases
+        una sola vez acá; run_for_asset lo usa salvo que reciba otra lista.
+        """
         self.cash = cash
         self.commission = commission
+        self.max_workers = max_workers
+        self.vectorized = vectorized
+        self._vector = (
+            VectorizedBacktestEngine(cash=cash, commission=commission)
+            if vectorized else None
+        )
+        self._pool: Optional[Executor] = None
+        self._resolved_strategies = self._resolve(
+            strategy_names or STRATEGY_REGISTRY.keys()
+        )
+
+    @staticmethod
+    def _resolve(names: Iterable[str]) -> Tuple[Tuple[str, Type[ConfigurableStrategy]], ...]:
+        """(nombre, clase) de las estrategias registradas; ignora las desconocidas."""
+        return tuple(
+            (name, STRATEGY_REGISTRY[name])
+            for name in names
+            if name in STRATEGY_REGISTRY
+        )
+
+    @contextmanager
+    def pool(self) -> Iterator[None]:
+        """
+        Mantiene un único pool de procesos abierto para varias llamadas a
+        `run_for_asset` (p. ej. todos los símbolos de un research), en vez
+        de levantar procesos por activo. No-op si max_workers <= 1 o si ya
+        hay un pool abierto.
+        """
+        if self.max_workers <= 1 or self._pool is not None:
+            yield
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=_MP_CONTEXT
+        ) as executor:
+            self._pool = executor
+            try:
+                yield
+            finally:
+                self._pool = None
 
     def run_single(
         self,
@@ -20,7 +90,17 @@ class BacktestEngine:
         asset: str,
         params: Optional[Dict[str, Any]] = None,
     ) -> BacktestReport:
-        df = df.copy()
+        df = self._strategy_frame(df, strategy_cls)
+
+        # Sin versión vectorizada → backtesting.py
+        if self._vector is not None and strategy_cls.has_vector_signals():
+            return self._vector.run_single(
+                df=df,
+                strategy_cls=strategy_cls,
+                strategy_name=strategy_name,
+                asset=asset,
+                params=params,
+            )
 
         bt = Backtest(
             df,
@@ -49,7 +129,7 @@ class BacktestEngine:
             metadata={
                 "asset": asset,
                 "raw_stats": stats.to_dict(),
-                "strategy_config": strategy_cls.get_config().model_dump(),
+                "strategy_config": strategy_cls.config_dict(),
             },
         )
 
@@ -65,23 +145,95 @@ class BacktestEngine:
         """
         Corre backtest de varias estrategias sobre un único activo.
         """
-        names = strategy_names or list(STRATEGY_REGISTRY.keys())
+        strategies = (
+            self._resolve(strategy_names)
+            if strategy_names
+            else self._resolved_strategies
+        )
         params = strategy_params or {}
 
-        reports: List[BacktestReport] = []
+        if self.max_workers <= 1 or len(strategies) <= 1:
+            return [
+                self.run_single(
+                    df=df,
+                    strategy_cls=strategy_cls,
+                    strategy_name=name,
+                    asset=asset,
+                    params=params.get(name),
+                )
+                for name, strategy_cls in strategies
+            ]
 
-        for name in names:
-            strategy_cls = STRATEGY_REGISTRY.get(name)
-            if strategy_cls is None:
-                continue
+        with self.pool():
+            futures = [
+                self._pool.submit(
+                    _run_single_in_worker,
+                    self.cash,
+                    self.commission,
+                    self.vectorized,
+                    # Solo viajan (pickle) las columnas que usa la estrategia
+                    self._strategy_frame(df, strategy_cls),
+                    name,
+                    asset,
+                    params.get(name),
+                )
+                for name, strategy_cls in strategies
+            ]
+            # Mismo orden que `strategies`, igual que la versión secuencial
+            return [future.result() for future in futures]
+
+    def run_grid(
+        self,
+        df: pd.DataFrame,
+        strategy_cls: Type[ConfigurableStrategy],
+        grid: Dict[str, List[float]],
+    ) -> np.ndarray:
+        """
+        Barrido de SL / TP (ver VectorizedBacktestEngine.run_grid). Usa el
+        engine vectorizado aunque `vectorized` esté apagado: con
+        backtesting.py serían len(sl) × len(tp) corridas.
+        """
+        vector = self._vector or VectorizedBacktestEngine(
+            cash=self.cash, commission=self.commission
+        )
+        return vector.run_grid(self._strategy_frame(df, strategy_cls), strategy_cls, grid)
+
+    @staticmethod
+    def _strategy_frame(
+        df: pd.DataFrame,
+        strategy_cls: Type[ConfigurableStrategy],
+    ) -> pd.DataFrame:
+        """
+        Subset de columnas que lee la estrategia en vez de un df.copy()
+        completo (Backtest hace su propia copia shallow y no modifica el df).
+        Las columnas ausentes se omiten: cada estrategia decide qué hacer.
+        """
+        present = frozenset(df.columns)
+        return df[[c for c in strategy_cls.required_columns() if c in present]]
 
-            report = self.run_single(
-                df=df,
-                strategy_cls=strategy_cls,
-                strategy_name=name,
-                asset=asset,
-                params=params.get(name),
-            )
-            reports.append(report)
 
-        return reports
+def _run_single_in_worker(
+    cash: float,
+    commission: float,
+    vectorized: bool,
+    df: pd.DataFrame,
+    strategy_name: str,
+    asset: str,
+    params: Optional[Dict[str, Any]],
+) -> BacktestReport:
+    """
+    Punto de entrada de los procesos del pool: la estrategia viaja por
+    nombre y se resuelve en el worker contra STRATEGY_REGISTRY.
+    """
+    engine = BacktestEngine(cash=cash, commission=commission, vectorized=vectorized)
+    report = engine.run_single(
+        df=df,
+        strategy_cls=STRATEGY_REGISTRY[strategy_name],
+        strategy_name=strategy_name,
+        asset=asset,
+        params=params,
+    )
+    # La instancia de la estrategia arrastra broker + datos y no se persiste
+    # (el repo la descarta): no vale la pena picklearla de vuelta
+    report.metadata["raw_stats"].pop("_strategy", None)
+    return report
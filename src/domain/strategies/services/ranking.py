@@ -1,7 +1,27 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
 
-from typing import List
 from ..dtos.backtest_report import BacktestReport
 
+# Por debajo de esto sorted() con la key en tuple gana (overhead de numpy)
+_NUMPY_RANK_MIN = 16
+
+_RANK_DTYPE = np.dtype([("sharpe", "f8"), ("drawdown", "f8"), ("ret", "f8")])
+
+
+def _rank_key(report: BacktestReport) -> Tuple[float, float, float]:
+    """
+    Claves ascendentes (-sharpe, drawdown, -return). Una métrica NaN pasa
+    a +inf (la peor posición): NaN no es comparable y dejaría el orden de
+    sorted() y de lexsort dependiendo de dónde cayó.
+    """
+    return tuple(
+        math.inf if value != value else value
+        for value in (-report.sharpe_ratio, report.max_drawdown, -report.total_return)
+    )
+
 
 def rank_reports(reports: List[BacktestReport]) -> List[BacktestReport]:
     """
@@ -9,8 +29,19 @@ def rank_reports(reports: List[BacktestReport]) -> List[BacktestReport]:
       1) mayor Sharpe
       2) si empata, menor drawdown
       3) si empata, mayor total_return
+    Las métricas NaN quedan al final de su criterio.
     """
-    return sorted(
-        reports,
-        key=lambda r: (-r.sharpe_ratio, r.max_drawdown, -r.total_return),
+    if len(reports) < _NUMPY_RANK_MIN:
+        return sorted(
+            reports,
+            key=_rank_key,
+        )
+
+    keys = np.fromiter(
+        (_rank_key(r) for r in reports),
+        dtype=_RANK_DTYPE,
+        count=len(reports),
     )
+    # lexsort ordena por la última clave primero y es estable, como sorted()
+    order = np.lexsort((keys["ret"], keys["drawdown"], keys["sharpe"]))
+    return [reports[i] for i in order]
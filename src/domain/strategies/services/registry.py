@@ -1,8 +1,8 @@
-from typing import Dict, Type, List
+from typing import Mapping, Type, List
 from src.domain.strategies.impl.base import ConfigurableStrategy
 from ..impl import strategies as _strategies_dict
 
-STRATEGY_REGISTRY: Dict[str, Type[ConfigurableStrategy]] = _strategies_dict
+STRATEGY_REGISTRY: Mapping[str, Type[ConfigurableStrategy]] = _strategies_dict
 
 
 def list_strategy_names() -> List[str]:
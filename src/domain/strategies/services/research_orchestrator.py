@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, List, Optional, Union
 from src.domain.etl.dtos.enriched_data import EnrichedData
 from src.domain.strategies.dtos.backtest_report import BacktestReport
@@ -7,6 +8,7 @@ from src.infrastructure.database.repositories.symbol_strategy_repository import
     SymbolStrategyRepository,
 )
 from src.infrastructure.database.client import PostgresClient
+from src.domain.strategies.strategy_bus import strategy_bus
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,9 @@ class ResearchOrchestrator:
       - persistir mejor estrategia por símbolo
     """
 
+    # Filas por upsert batch mientras los backtests siguen corriendo
+    PERSIST_BATCH_SIZE = 50
+
     def __init__(
         self,
         backtest_service: BacktestService,
@@ -38,37 +43,70 @@ class ResearchOrchestrator:
         timeframe: Optional[str] = None,
     ) -> Dict[str, List[BacktestReport]]:
 
-        results = self.backtest_service.run_for_enriched(
-            data=data,
-            strategy_names=strategy_names,
-            strategy_params=strategy_params,
+        tf = timeframe or getattr(data, "timeframe", self.default_timeframe)
+        loop = asyncio.get_running_loop()
+        # Productor (backtests en un thread) → consumidor (persistencia acá)
+        finished: asyncio.Queue = asyncio.Queue()
+
+        def on_result(symbol: str, reports: List[BacktestReport]) -> None:
+            loop.call_soon_threadsafe(finished.put_nowait, (symbol, reports))
+
+        # El cómputo no bloquea el event loop; los símbolos que van
+        # terminando se persisten mientras el resto sigue corriendo
+        compute = asyncio.ensure_future(
+            asyncio.to_thread(
+                self.backtest_service.run_for_enriched,
+                data=data,
+                strategy_names=strategy_names,
+                strategy_params=strategy_params,
+                on_result=on_result,
+            )
         )
+        # Llega después de todos los on_result (mismo call_soon_threadsafe, FIFO)
+        compute.add_done_callback(lambda _: finished.put_nowait(None))
 
-        tf = timeframe or getattr(data, "timeframe", self.default_timeframe)
+        rows: List[dict] = []
+        while True:
+            item = await finished.get()
+            if item is None:
+                break
+
+            row = self._best_row(*item)
+            if row is not None:
+                rows.append(row)
+            if len(rows) >= self.PERSIST_BATCH_SIZE:
+                await self._persist(rows, tf)
+                rows = []
+
+        if rows:
+            await self._persist(rows, tf)
+
+        # Propaga una excepción del cómputo, si la hubo
+        return await compute
+
+    @staticmethod
+    def _best_row(symbol: str, reports: List[BacktestReport]) -> Optional[dict]:
+        if not reports:
+            logger.warning(
+                f"⚠️ No reports for {symbol}, nothing persisted"
+            )
+            return None
+
+        best = reports[0]
+        return {
+            "symbol": symbol,
+            "strategy_name": best.strategy_name,
+            # config_dict() está cacheado por clase
+            "params": get_strategy_class(best.strategy_name).config_dict(),
+            "metrics": best.metadata.get("raw_stats", {}),
+        }
 
+    async def _persist(self, rows: List[dict], timeframe: str) -> None:
+        # Un batch = una transacción / commit
         async with self.db_client.get_session() as session:
             repo = SymbolStrategyRepository(session)
+            await repo.upsert_best_strategies(timeframe=timeframe, rows=rows)
 
-            for symbol, reports in results.items():
-                if not reports:
-                    logger.warning(
-                        f"⚠️ No reports for {symbol}, nothing persisted"
-                    )
-                    continue
-
-                best = reports[0]
-                raw_stats = best.metadata.get("raw_stats", {})
-
-                strategy_cls = get_strategy_class(best.strategy_name)
-                config_dto = strategy_cls.get_config()
-                config_dict = config_dto.model_dump()
-
-                await repo.upsert_best_strategy(
-                    symbol=symbol,
-                    timeframe=tf,
-                    strategy_name=best.strategy_name,
-                    params=config_dict,
-                    metrics=raw_stats,
-                )
-
-        return results
+        # Recién después del commit: invalida caches de config activa
+        for row in rows:
+            strategy_bus.on_next((row["symbol"], timeframe))
@@ -1,4 +1,8 @@
-from typing import Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
 from src.domain.etl.dtos.enriched_data import EnrichedData
 from src.domain.strategies.dtos.backtest_report import BacktestReport
 from src.domain.strategies.services.engine import BacktestEngine
@@ -8,6 +12,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Precios de ejecución / SL / TP / P&L: se quedan en float64
+_PRICE_COLUMNS = frozenset(("Open", "High", "Low", "Close"))
+
+# (símbolo, reports rankeados) → se llama a medida que termina cada activo
+ResultCallback = Callable[[str, List[BacktestReport]], None]
+
 
 class BacktestService:
     def __init__(self, engine: BacktestEngine):
@@ -18,6 +28,7 @@ class BacktestService:
         data: Union[EnrichedData, Dict[str, EnrichedData]],
         strategy_names: Optional[List[str]] = None,
         strategy_params: Optional[Dict[str, Dict[str, float]]] = None,
+        on_result: Optional[ResultCallback] = None,
     ) -> Dict[str, List[BacktestReport]]:
         """
         Recibe:
@@ -26,31 +37,68 @@ class BacktestService:
 
         Devuelve siempre:
           { asset: [BacktestReport, ...] (rankeados) }
+
+        `on_result` recibe cada activo apenas termina (en el thread que lo
+        corrió), para que el caller pueda ir consumiendo antes del final.
         """
         if isinstance(data, EnrichedData):
             reports = self.engine.run_for_asset(
-                df=data.ohlcv,
+                df=self._downcast(data.ohlcv),
                 asset=data.asset,
                 strategy_names=strategy_names,
                 strategy_params=strategy_params,
             )
             ranked = rank_reports(reports)
+            if on_result is not None:
+                on_result(data.asset, ranked)
             return {data.asset: ranked}
 
         results: Dict[str, List[BacktestReport]] = {}
 
-        for sym, enriched in data.items():
-            try:
-                reports = self.engine.run_for_asset(
-                    df=enriched.ohlcv,
+        # Un solo pool de procesos para todo el research. Los threads solo
+        # reparten los activos y esperan sus futures, así el pool recibe
+        # trabajo de todos los símbolos a la vez (con max_workers=1 queda
+        # un único thread y todo es secuencial, como antes).
+        with self.engine.pool(), ThreadPoolExecutor(
+            max_workers=self.engine.max_workers
+        ) as threads:
+            futures = {
+                threads.submit(
+                    self.engine.run_for_asset,
+                    df=self._downcast(enriched.ohlcv),
                     asset=enriched.asset,
                     strategy_names=strategy_names,
                     strategy_params=strategy_params,
-                )
-                ranked = rank_reports(reports)
-                results[sym] = ranked
-            except Exception as e:
-                logger.error(f"❌ Backtest failed for {sym}: {e}")
-                results[sym] = []
-
-        return results
+                ): sym
+                for sym, enriched in data.items()
+            }
+
+            for future in as_completed(futures):
+                sym = futures[future]
+                try:
+                    results[sym] = rank_reports(future.result())
+                except Exception as e:
+                    logger.error(f"❌ Backtest failed for {sym}: {e}")
+                    results[sym] = []
+                if on_result is not None:
+                    on_result(sym, results[sym])
+
+        # Mismo orden que la entrada, no el de terminación
+        return {sym: results[sym] for sym in data}
+
+    @staticmethod
+    def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Indicadores y volumen float64 → float32, una vez por activo y antes
+        de repartirlo entre estrategias: la mitad de memoria por columna
+        (y de pickle hacia el pool). Las reglas solo comparan, así que
+        float32 alcanza; OHLC queda en float64 para no acumular error en
+        fills / P&L. Devuelve un df nuevo, el del caller no se toca.
+        """
+        floats = [
+            c for c in df.select_dtypes(include="float64").columns
+            if c not in _PRICE_COLUMNS
+        ]
+        if not floats:
+            return df
+        return df.astype(dict.fromkeys(floats, np.float32))
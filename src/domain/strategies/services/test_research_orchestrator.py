@@ -0,0 +1,147 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.domain.strategies.dtos.backtest_report import BacktestReport
+from src.domain.strategies.services import research_orchestrator as orchestrator_module
+from src.domain.strategies.services.research_orchestrator import ResearchOrchestrator
+from src.domain.strategies.strategy_bus import strategy_bus
+
+
+class StubBacktestService:
+    """Simula run_for_enriched: avisa cada símbolo por on_result y devuelve el dict."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def run_for_enriched(self, data, strategy_names=None, strategy_params=None, on_result=None):
+        for symbol, reports in self.results.items():
+            if on_result is not None:
+                on_result(symbol, reports)
+        return self.results
+
+
+class FailingBacktestService:
+    def run_for_enriched(self, data, strategy_names=None, strategy_params=None, on_result=None):
+        raise RuntimeError("backtest exploded")
+
+
+def create_report(symbol: str, strategy_name: str = "SMACrossoverStrategy") -> BacktestReport:
+    """Helper para crear reports de prueba."""
+    return BacktestReport(
+        asset=symbol,
+        strategy_name=strategy_name,
+        total_return=0.1,
+        sharpe_ratio=1.2,
+        max_drawdown=-0.05,
+        win_rate=0.6,
+        total_trades=10,
+        metadata={"raw_stats": {"Sharpe Ratio": 1.2}},
+    )
+
+
+@pytest.fixture
+def mock_db_client():
+    """Mock del cliente de base de datos."""
+    client = MagicMock()
+    session = AsyncMock()
+    client.get_session.return_value.__aenter__.return_value = session
+    client.get_session.return_value.__aexit__.return_value = None
+    return client
+
+
+@pytest.fixture
+def mock_repo(monkeypatch):
+    """Reemplaza SymbolStrategyRepository y get_strategy_class en el orquestador."""
+    repo = MagicMock()
+    repo.upsert_best_strategies = AsyncMock(return_value=[])
+    monkeypatch.setattr(
+        orchestrator_module, "SymbolStrategyRepository", MagicMock(return_value=repo)
+    )
+
+    strategy_cls = MagicMock()
+    strategy_cls.config_dict.return_value = {"strategy_name": "SMACrossoverStrategy"}
+    monkeypatch.setattr(
+        orchestrator_module, "get_strategy_class", MagicMock(return_value=strategy_cls)
+    )
+    return repo
+
+
+@pytest.fixture
+def bus_events():
+    events = []
+    subscription = strategy_bus.subscribe(on_next=events.append)
+    yield events
+    subscription.dispose()
+
+
+# ==================== TESTS DE PERSISTENCIA ====================
+
+
+async def test_run_and_persist_upserts_in_batches_and_returns_reports(
+    mock_db_client, mock_repo, bus_events, monkeypatch
+):
+    monkeypatch.setattr(ResearchOrchestrator, "PERSIST_BATCH_SIZE", 2)
+    results = {f"SYM{i}": [create_report(f"SYM{i}")] for i in range(5)}
+    orchestrator = ResearchOrchestrator(
+        backtest_service=StubBacktestService(results),
+        db_client=mock_db_client,
+    )
+
+    returned = await orchestrator.run_and_persist(data={}, timeframe="1h")
+
+    assert returned == results
+
+    calls = mock_repo.upsert_best_strategies.await_args_list
+    assert [len(call.kwargs["rows"]) for call in calls] == [2, 2, 1]
+    assert all(call.kwargs["timeframe"] == "1h" for call in calls)
+    assert [row["symbol"] for call in calls for row in call.kwargs["rows"]] == list(results)
+
+    # Una sesión por batch y una notificación por símbolo persistido
+    assert mock_db_client.get_session.call_count == 3
+    assert bus_events == [(symbol, "1h") for symbol in results]
+
+
+async def test_run_and_persist_skips_symbols_without_reports(
+    mock_db_client, mock_repo, bus_events
+):
+    results = {"AAPL": [create_report("AAPL")], "MSFT": []}
+    orchestrator = ResearchOrchestrator(
+        backtest_service=StubBacktestService(results),
+        db_client=mock_db_client,
+    )
+
+    returned = await orchestrator.run_and_persist(data={}, timeframe="1d")
+
+    assert returned == results
+    mock_repo.upsert_best_strategies.assert_awaited_once()
+    rows = mock_repo.upsert_best_strategies.await_args.kwargs["rows"]
+    assert [row["symbol"] for row in rows] == ["AAPL"]
+    assert rows[0]["metrics"] == {"Sharpe Ratio": 1.2}
+    assert bus_events == [("AAPL", "1d")]
+
+
+async def test_run_and_persist_without_results_does_not_open_session(
+    mock_db_client, mock_repo
+):
+    orchestrator = ResearchOrchestrator(
+        backtest_service=StubBacktestService({}),
+        db_client=mock_db_client,
+    )
+
+    returned = await orchestrator.run_and_persist(data={}, timeframe="1d")
+
+    assert returned == {}
+    mock_db_client.get_session.assert_not_called()
+    mock_repo.upsert_best_strategies.assert_not_awaited()
+
+
+async def test_run_and_persist_propagates_backtest_errors(mock_db_client, mock_repo):
+    orchestrator = ResearchOrchestrator(
+        backtest_service=FailingBacktestService(),
+        db_client=mock_db_client,
+    )
+
+    with pytest.raises(RuntimeError, match="backtest exploded"):
+        await orchestrator.run_and_persist(data={}, timeframe="1d")
+
+    mock_repo.upsert_best_strategies.assert_not_awaited()
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+backtesting = pytest.importorskip("backtesting")
+
+from src.domain.strategies.impl.sma_crossover import SMACrossoverStrategy
+from src.domain.strategies.impl.sma_crossover_rsi_vol_tpsl import (
+    SMACrossoverRSIVolWithTPSLStrategy,
+)
+from src.domain.strategies.impl.volume_spike import VolumeSpikeEntryStrategy
+from src.domain.strategies.services.vector_engine import (
+    VectorizedBacktestEngine,
+    _simulate,
+    _simulate_sl_tp_grid,
+)
+
+CASH = 100_000
+
+
+def rsi(close: pd.Series, window: int = 14) -> pd.Series:
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(window).mean()
+    loss = (-delta.clip(upper=0)).rolling(window).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    """
+    OHLCV sintético y determinístico: oscilación con tendencia, spikes de
+    volumen periódicos y una cola bajista sin spikes para cerrar en flat
+    (backtesting.py no cuenta la posición abierta al final como trade).
+    """
+    n, tail = 300, 40
+    rng = np.random.default_rng(2)
+    t = np.arange(n)
+
+    close = 100 + 0.05 * t + 4 * np.sin(t / 7) + rng.normal(0, 1.5, n)
+    close[-tail:] = close[-tail - 1] - 0.8 * np.arange(1, tail + 1)
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 0.3, n)
+    spread = np.abs(rng.normal(0, 0.8, n))
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+
+    volume = 1_000 + rng.integers(0, 1_000, n).astype(float)
+    volume[::17] *= 3
+    volume[-tail:] = 1_000.0
+
+    df = pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=pd.date_range("2024-01-01", periods=n, freq="D"),
+    )
+    df["SMA_5"] = df["Close"].rolling(5).mean()
+    df["SMA_8"] = df["Close"].rolling(8).mean()
+    df["SMA_20_VOL"] = df["Volume"].rolling(20).mean()
+    df["RSI_14"] = rsi(df["Close"])
+    df["volume_spike"] = df["Volume"] > 1.5 * df["SMA_20_VOL"]
+    return df
+
+
+def run_backtesting(df, strategy_cls):
+    bt = backtesting.Backtest(
+        df, strategy_cls, cash=CASH, commission=0.0, exclusive_orders=True
+    )
+    return bt.run()
+
+
+# ==================== PARIDAD CON BACKTESTING.PY ====================
+
+
+@pytest.mark.parametrize(
+    "strategy_cls",
+    [SMACrossoverStrategy, SMACrossoverRSIVolWithTPSLStrategy, VolumeSpikeEntryStrategy],
+)
+def test_run_single_matches_backtesting(ohlcv, strategy_cls):
+    stats = run_backtesting(ohlcv, strategy_cls)
+    report = VectorizedBacktestEngine(cash=CASH, commission=0.0).run_single(
+        df=ohlcv,
+        strategy_cls=strategy_cls,
+        strategy_name=strategy_cls.__name__,
+        asset="TEST",
+    )
+
+    assert stats["# Trades"] > 1
+    assert report.total_trades == stats["# Trades"]
+    # backtesting.py compra con el 99.99% del cash: diferencia de centavos
+    assert report.total_return == pytest.approx(stats["Return [%]"] / 100.0, abs=1e-3)
+
+
+def test_missing_sma_columns_fall_back_the_same_in_both_engines(ohlcv):
+    strategy_cls = SMACrossoverRSIVolWithTPSLStrategy
+    stripped = ohlcv.drop(columns=["SMA_5", "SMA_8", "SMA_20_VOL"])
+    engine = VectorizedBacktestEngine(cash=CASH, commission=0.0)
+
+    full = engine.run_single(ohlcv, strategy_cls, strategy_cls.__name__, "TEST")
+    report = engine.run_single(stripped, strategy_cls, strategy_cls.__name__, "TEST")
+    stats = run_backtesting(stripped, strategy_cls)
+
+    # Las SMA recalculadas son las mismas que trae el df
+    assert report.total_trades == full.total_trades
+    assert report.total_return == pytest.approx(full.total_return)
+    assert report.total_trades == stats["# Trades"]
+    assert report.total_return == pytest.approx(stats["Return [%]"] / 100.0, abs=1e-3)
+
+
+# ==================== GRID SL / TP ====================
+
+
+def test_grid_cell_matches_single_simulation(ohlcv):
+    entries, exits, _, _ = SMACrossoverRSIVolWithTPSLStrategy.vector_signals(ohlcv, {})
+    prices = [ohlcv[c].to_numpy(dtype=np.float64) for c in ("Open", "High", "Low", "Close")]
+    close = prices[3]
+    sl_pcts = np.array([0.01, 0.02, 0.05])
+    tp_pcts = np.array([0.02, 0.04])
+    n = len(ohlcv)
+
+    grid = _simulate_sl_tp_grid(
+        *prices, entries, exits, sl_pcts, tp_pcts, float(CASH), 0.001, 0
+    )
+
+    assert grid.shape == (3, 2)
+    for a, sl_pct in enumerate(sl_pcts):
+        for b, tp_pct in enumerate(tp_pcts):
+            equity, _ = _simulate(
+                *prices, entries, exits,
+                close * (1.0 - sl_pct), close * (1.0 + tp_pct),
+                float(CASH), 0.001, 0,
+                np.empty(n), np.empty(n),
+            )
+            assert grid[a, b] == pytest.approx(equity[-1])
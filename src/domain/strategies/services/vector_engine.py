@@ -0,0 +1,293 @@
+"""
+Backtester vectorizado para estrategias de reglas simples.
+
+En vez del loop de eventos de backtesting.py (un `next()` en Python por
+barra), la estrategia entrega sus señales ya calculadas para toda la serie
+(`ConfigurableStrategy.vector_signals`) y un único kernel recorre las barras
+llevando cash / posición / equity.
+
+Replica las reglas que usan nuestras estrategias en backtesting.py:
+  - solo largos, una posición a la vez, todo el cash disponible
+  - la señal de la barra i se ejecuta al open de la barra i + 1
+  - SL / TP intrabar (si el open ya pasó el nivel, se ejecuta al open)
+  - cooldown en barras desde la última salida por señal
+  - una posición abierta al final entra en el equity pero no en los trades
+
+Las métricas salen de la curva de equity; el Sharpe es el de retornos por
+barra anualizado con `periods_per_year`, así que no coincide exactamente
+con el de backtesting.py.
+"""
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from src.commons.njit import njit, prange, NUMBA_AVAILABLE
+from src.domain.strategies.dtos.backtest_report import BacktestReport
+from src.domain.strategies.impl.base import ConfigurableStrategy
+
+# Sin orden pendiente / comprar al próximo open / cerrar al próximo open
+_NO_ORDER = 0
+_BUY = 1
+_CLOSE = -1
+
+
+@njit(cache=True)
+def _simulate(open_, high, low, close, entries, exits, sl, tp, cash, commission, cooldown,
+              equity, trade_returns):
+    """
+    Devuelve (equity por barra, retornos de los trades cerrados).
+    `sl` / `tp` son niveles absolutos por barra de señal (NaN = sin nivel).
+    `equity` / `trade_returns` son buffers de largo n que se sobrescriben
+    (equity completo, trade_returns solo hasta la cantidad de trades).
+    """
+    n = close.shape[0]
+    n_trades = 0
+
+    units = 0.0
+    entry_cost = 0.0
+    stop = np.nan
+    target = np.nan
+
+    pending = _NO_ORDER
+    pending_sl = np.nan
+    pending_tp = np.nan
+    last_exit = -cooldown - 1
+
+    for i in range(n):
+        # 1) Orden de la barra anterior, al open
+        if pending == _BUY:
+            price = open_[i] * (1.0 + commission)
+            size = math.floor(cash / price)
+            if size > 0:
+                units = float(size)
+                entry_cost = price
+                cash -= units * price
+                stop = pending_sl
+                target = pending_tp
+        elif pending == _CLOSE:
+            price = open_[i] * (1.0 - commission)
+            cash += units * price
+            trade_returns[n_trades] = price / entry_cost - 1.0
+            n_trades += 1
+            units = 0.0
+        pending = _NO_ORDER
+
+        # 2) SL / TP dentro de la barra (el SL tiene prioridad)
+        if units > 0:
+            fill = np.nan
+            if stop == stop and low[i] <= stop:
+                fill = min(open_[i], stop)
+            elif target == target and high[i] >= target:
+                fill = max(open_[i], target)
+            if fill == fill:
+                price = fill * (1.0 - commission)
+                cash += units * price
+                trade_returns[n_trades] = price / entry_cost - 1.0
+                n_trades += 1
+                units = 0.0
+
+        equity[i] = cash + units * close[i]
+
+        # 3) Reglas de la barra (equivalente a next())
+        if units == 0:
+            if entries[i] and i - last_exit > cooldown:
+                pending = _BUY
+                pending_sl = sl[i]
+                pending_tp = tp[i]
+        elif exits[i]:
+            pending = _CLOSE
+            last_exit = i
+
+    return equity, trade_returns[:n_trades]
+
+
+@njit(cache=True, parallel=True)
+def _simulate_sl_tp_grid(open_, high, low, close, entries, exits, sl_pcts, tp_pcts,
+                         cash, commission, cooldown):
+    """
+    Equity final para cada combinación (sl_pcts[a], tp_pcts[b]) sobre las
+    mismas señales. Las celdas son independientes: se reparten con prange.
+    """
+    n = close.shape[0]
+    n_sl = sl_pcts.shape[0]
+    n_tp = tp_pcts.shape[0]
+    final = np.full((n_sl, n_tp), cash)
+    if n == 0:
+        return final
+
+    for cell in prange(n_sl * n_tp):
+        a = cell // n_tp
+        b = cell % n_tp
+        equity, _ = _simulate(
+            open_, high, low, close, entries, exits,
+            close * (1.0 - sl_pcts[a]),
+            close * (1.0 + tp_pcts[b]),
+            cash, commission, cooldown,
+            np.empty(n), np.empty(n),
+        )
+        final[a, b] = equity[n - 1]
+
+    return final
+
+
+class VectorizedBacktestEngine:
+    """
+    Misma interfaz de `run_single` que BacktestEngine para las estrategias
+    que implementan `vector_signals`.
+    """
+
+    def __init__(
+        self,
+        cash: float = 200_000,
+        commission: float = 0.001,
+        periods_per_year: float = 252.0,
+    ):
+        self.cash = cash
+        self.commission = commission
+        self.periods_per_year = periods_per_year
+        # Buffers de la simulación por thread: todas las estrategias de un
+        # activo tienen el mismo largo, así que se reusan entre corridas
+        self._local = threading.local()
+
+    def run_single(
+        self,
+        df: pd.DataFrame,
+        strategy_cls: Type[ConfigurableStrategy],
+        strategy_name: str,
+        asset: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> BacktestReport:
+        signals = strategy_cls.vector_signals(df, params or {})
+        if signals is None:
+            raise ValueError(
+                f"Estrategia '{strategy_name}' no tiene versión vectorizada"
+            )
+
+        n = len(df)
+        entries, exits, sl, tp = signals
+        nan_levels = np.full(n, np.nan)
+        equity_buf, returns_buf = self._buffers(n)
+
+        equity, trade_returns = _simulate(
+            df["Open"].to_numpy(dtype=np.float64),
+            df["High"].to_numpy(dtype=np.float64),
+            df["Low"].to_numpy(dtype=np.float64),
+            df["Close"].to_numpy(dtype=np.float64),
+            np.asarray(entries, dtype=np.bool_),
+            np.asarray(exits, dtype=np.bool_),
+            nan_levels if sl is None else np.asarray(sl, dtype=np.float64),
+            nan_levels if tp is None else np.asarray(tp, dtype=np.float64),
+            float(self.cash),
+            float(self.commission),
+            int(strategy_cls.get_config().risk.cooldown_period or 0),
+            equity_buf,
+            returns_buf,
+        )
+
+        stats = self._stats(equity, trade_returns)
+
+        return BacktestReport(
+            strategy_name=strategy_name,
+            total_return=stats["Return [%]"] / 100.0,
+            sharpe_ratio=stats["Sharpe Ratio"],
+            max_drawdown=stats["Max. Drawdown [%]"] / 100.0,
+            win_rate=stats["Win Rate [%]"] / 100.0,
+            total_trades=stats["# Trades"],
+            asset=asset,
+            equity_curve=equity.tolist(),
+            metadata={
+                "asset": asset,
+                "engine": "vectorized",
+                "raw_stats": stats,
+                "strategy_config": strategy_cls.config_dict(),
+            },
+        )
+
+    def run_grid(
+        self,
+        df: pd.DataFrame,
+        strategy_cls: Type[ConfigurableStrategy],
+        grid: Dict[str, List[float]],
+    ) -> np.ndarray:
+        """
+        Barrido de SL / TP en una sola pasada: las señales se calculan una
+        vez y el kernel simula todas las combinaciones de
+        grid["stop_loss_pct"] × grid["take_profit_pct"].
+        Devuelve la equity final con shape (len(sl), len(tp)).
+        """
+        signals = strategy_cls.vector_signals(df, {})
+        if signals is None:
+            raise ValueError(
+                f"Estrategia '{strategy_cls.__name__}' no tiene versión vectorizada"
+            )
+        entries, exits, _, _ = signals
+
+        return _simulate_sl_tp_grid(
+            df["Open"].to_numpy(dtype=np.float64),
+            df["High"].to_numpy(dtype=np.float64),
+            df["Low"].to_numpy(dtype=np.float64),
+            df["Close"].to_numpy(dtype=np.float64),
+            np.asarray(entries, dtype=np.bool_),
+            np.asarray(exits, dtype=np.bool_),
+            np.asarray(grid["stop_loss_pct"], dtype=np.float64),
+            np.asarray(grid["take_profit_pct"], dtype=np.float64),
+            float(self.cash),
+            float(self.commission),
+            int(strategy_cls.get_config().risk.cooldown_period or 0),
+        )
+
+    def _buffers(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (equity, trade_returns) de largo n, reusados mientras n no cambie.
+        Lo que devuelve _simulate son vistas: se consumen (stats / tolist)
+        antes de la próxima corrida.
+        """
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None or buffers[0].shape[0] != n:
+            buffers = (np.empty(n), np.empty(n))
+            self._local.buffers = buffers
+        return buffers
+
+    def _stats(self, equity: np.ndarray, trade_returns: np.ndarray) -> Dict[str, Any]:
+        """
+        Métricas con las mismas claves / unidades que los stats de
+        backtesting.py (lo que lee el repo al persistir).
+        """
+        if equity.size == 0:
+            equity = np.array([self.cash], dtype=np.float64)
+
+        returns = np.diff(equity) / equity[:-1]
+        std = returns.std() if returns.size > 1 else 0.0
+        sharpe = (
+            float(returns.mean() / std * np.sqrt(self.periods_per_year))
+            if std > 0 else 0.0
+        )
+
+        # Drawdown negativo, como "Max. Drawdown [%]" de backtesting.py
+        drawdown = equity / np.maximum.accumulate(equity) - 1.0
+        n_trades = int(trade_returns.size)
+
+        return {
+            "Equity Final [$]": float(equity[-1]),
+            "Return [%]": float(equity[-1] / self.cash - 1.0) * 100.0,
+            "Sharpe Ratio": sharpe,
+            "Max. Drawdown [%]": float(drawdown.min()) * 100.0,
+            "Win Rate [%]": (
+                float((trade_returns > 0).mean()) * 100.0 if n_trades else 0.0
+            ),
+            "# Trades": n_trades,
+        }
+
+
+if NUMBA_AVAILABLE:
+    # Warmup: compila (o carga del cache) al importar y no en el primer research
+    _prices = np.ones(2)
+    _flags = np.zeros(2, dtype=np.bool_)
+    _levels = np.full(2, np.nan)
+    _simulate(_prices, _prices, _prices, _prices, _flags, _flags, _levels, _levels,
+              1.0, 0.0, 0, np.empty(2), np.empty(2))
+    _simulate_sl_tp_grid(_prices, _prices, _prices, _prices, _flags, _flags,
+                         np.zeros(1), np.zeros(1), 1.0, 0.0, 0)
@@ -10,6 +10,8 @@ class StrategiesModule(containers.DeclarativeContainer):
 
     backtest_engine = providers.Factory(
         BacktestEngine,
+        max_workers=root.config.provided.backtest_max_workers,
+        vectorized=root.config.provided.backtest_vectorized,
     )
 
     backtest_service = providers.Factory(
@@ -0,0 +1,4 @@
+from rx.subject import Subject
+
+# Emite (symbol, timeframe) cada vez que cambia la estrategia activa
+strategy_bus: Subject = Subject()
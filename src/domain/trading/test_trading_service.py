@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 from src.domain.trading.trading_service import TradingService
@@ -80,7 +80,7 @@ def create_signal(
 
 
 @pytest.mark.asyncio
-async def test_buy_signal_creates_order(trading_service, mock_portfolio_service, mock_broker):
+async def test_buy_signal_creates_order(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     Señal BUY con order_size > 0 debe crear y ejecutar orden.
     """
@@ -90,40 +90,35 @@ async def test_buy_signal_creates_order(trading_service, mock_portfolio_service,
         price=150.0,
     )
 
-    mock_portfolio_service.compute_order_size = AsyncMock(return_value=10.0)
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    MockOrderRepo = mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ) as MockOrderRepo:
+    mock_signal_repo = MockSignalRepo.return_value
+    mock_signal_repo.save = AsyncMock()
 
-        mock_signal_repo = MockSignalRepo.return_value
-        mock_signal_repo.save = AsyncMock()
+    mock_order_repo = MockOrderRepo.return_value
+    mock_order_repo.save = AsyncMock()
 
-        mock_order_repo = MockOrderRepo.return_value
-        mock_order_repo.save = AsyncMock()
-
-        await trading_service.handle_signal(signal)
+    await trading_service.handle_signal(signal)
 
-        # Verificar que se calculó el order size
-        mock_portfolio_service.compute_order_size.assert_called_once_with(
-            signal)
+    # Verificar que se calculó el order size
+    mock_portfolio_service.compute_order_size.assert_called_once_with(
+        signal)
 
-        # Verificar que se envió la orden al broker
-        mock_broker.place_order.assert_called_once()
-        order_sent = mock_broker.place_order.call_args[0][0]
-        assert order_sent.symbol == "AAPL"
-        assert order_sent.quantity == 10.0
-        assert order_sent.order_type == OrderType.MARKET
+    # Verificar que se envió la orden al broker
+    mock_broker.place_order.assert_called_once()
+    order_sent = mock_broker.place_order.call_args[0][0]
+    assert order_sent.symbol == "AAPL"
+    assert order_sent.quantity == 10.0
+    assert order_sent.order_type == OrderType.MARKET
 
-        # Verificar que se guardó en DB
-        mock_signal_repo.save.assert_called_once()
-        mock_order_repo.save.assert_called_once()
+    # Verificar que se guardó en DB
+    mock_signal_repo.save.assert_called_once()
+    mock_order_repo.save.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_buy_signal_with_high_confidence(trading_service, mock_portfolio_service, mock_broker):
+async def test_buy_signal_with_high_confidence(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     Señal BUY con alta confianza procesa correctamente.
     """
@@ -137,29 +132,26 @@ async def test_buy_signal_with_high_confidence(trading_service, mock_portfolio_s
 
     mock_portfolio_service.compute_order_size = AsyncMock(return_value=5.0)
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ) as MockOrderRepo:
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    MockOrderRepo = mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-        MockSignalRepo.return_value.save = AsyncMock()
-        MockOrderRepo.return_value.save = AsyncMock()
+    MockSignalRepo.return_value.save = AsyncMock()
+    MockOrderRepo.return_value.save = AsyncMock()
 
-        await trading_service.handle_signal(signal)
+    await trading_service.handle_signal(signal)
 
-        mock_broker.place_order.assert_called_once()
-        order_sent = mock_broker.place_order.call_args[0][0]
-        assert order_sent.symbol == "MSFT"
-        assert order_sent.quantity == 5.0
-        assert order_sent.limit_price == 300.0
+    mock_broker.place_order.assert_called_once()
+    order_sent = mock_broker.place_order.call_args[0][0]
+    assert order_sent.symbol == "MSFT"
+    assert order_sent.quantity == 5.0
+    assert order_sent.limit_price == 300.0
 
 
 # ==================== TESTS DE SEÑALES SELL ====================
 
 
 @pytest.mark.asyncio
-async def test_sell_signal_creates_order(trading_service, mock_portfolio_service, mock_broker):
+async def test_sell_signal_creates_order(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     Señal SELL con order_size > 0 debe crear y ejecutar orden de venta.
     """
@@ -171,22 +163,19 @@ async def test_sell_signal_creates_order(trading_service, mock_portfolio_service
 
     mock_portfolio_service.compute_order_size = AsyncMock(return_value=15.0)
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ) as MockOrderRepo:
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    MockOrderRepo = mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-        MockSignalRepo.return_value.save = AsyncMock()
-        MockOrderRepo.return_value.save = AsyncMock()
+    MockSignalRepo.return_value.save = AsyncMock()
+    MockOrderRepo.return_value.save = AsyncMock()
 
-        await trading_service.handle_signal(signal)
+    await trading_service.handle_signal(signal)
 
-        mock_broker.place_order.assert_called_once()
-        order_sent = mock_broker.place_order.call_args[0][0]
-        assert order_sent.symbol == "AAPL"
-        assert order_sent.quantity == 15.0
-        assert order_sent.side == OrderSide.SELL
+    mock_broker.place_order.assert_called_once()
+    order_sent = mock_broker.place_order.call_args[0][0]
+    assert order_sent.symbol == "AAPL"
+    assert order_sent.quantity == 15.0
+    assert order_sent.side == OrderSide.SELL
 
 
 # ==================== TESTS DE SEÑALES SIN ACCIÓN ====================
@@ -257,7 +246,7 @@ async def test_none_signal_skipped(trading_service, mock_portfolio_service, mock
 
 
 @pytest.mark.asyncio
-async def test_signal_and_order_saved_to_db(trading_service, mock_portfolio_service, mock_broker):
+async def test_signal_and_order_saved_to_db(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     Tanto la señal como la orden ejecutada deben guardarse en DB.
     """
@@ -266,28 +255,25 @@ async def test_signal_and_order_saved_to_db(trading_service, mock_portfolio_serv
 
     mock_portfolio_service.compute_order_size = AsyncMock(return_value=2.0)
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ) as MockOrderRepo:
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    MockOrderRepo = mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-        mock_signal_repo = MockSignalRepo.return_value
-        mock_signal_repo.save = AsyncMock()
+    mock_signal_repo = MockSignalRepo.return_value
+    mock_signal_repo.save = AsyncMock()
 
-        mock_order_repo = MockOrderRepo.return_value
-        mock_order_repo.save = AsyncMock()
+    mock_order_repo = MockOrderRepo.return_value
+    mock_order_repo.save = AsyncMock()
 
-        await trading_service.handle_signal(signal)
+    await trading_service.handle_signal(signal)
 
-        # Verificar que se guardó la señal
-        mock_signal_repo.save.assert_called_once_with(signal)
+    # Verificar que se guardó la señal
+    mock_signal_repo.save.assert_called_once_with(signal)
 
-        # Verificar que se guardó la orden ejecutada
-        mock_order_repo.save.assert_called_once()
-        saved_order = mock_order_repo.save.call_args[0][0]
-        assert saved_order.status == OrderStatus.FILLED
-        assert saved_order.filled_quantity == 2.0
+    # Verificar que se guardó la orden ejecutada
+    mock_order_repo.save.assert_called_once()
+    saved_order = mock_order_repo.save.call_args[0][0]
+    assert saved_order.status == OrderStatus.FILLED
+    assert saved_order.filled_quantity == 2.0
 
 
 # ==================== TESTS DE MANEJO DE ERRORES ====================
@@ -317,7 +303,6 @@ async def test_broker_error_propagates(trading_service, mock_portfolio_service,
     """
     signal = create_signal(symbol="AAPL", signal_type=SignalTypeEnum.BUY)
 
-    mock_portfolio_service.compute_order_size = AsyncMock(return_value=10.0)
     mock_broker.place_order = AsyncMock(
         side_effect=Exception("Broker connection error")
     )
@@ -327,34 +312,29 @@ async def test_broker_error_propagates(trading_service, mock_portfolio_service,
 
 
 @pytest.mark.asyncio
-async def test_db_save_error_propagates(trading_service, mock_portfolio_service, mock_broker):
+async def test_db_save_error_propagates(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     Error al guardar en DB debe propagarse.
     """
     signal = create_signal(symbol="AAPL", signal_type=SignalTypeEnum.BUY)
 
-    mock_portfolio_service.compute_order_size = AsyncMock(return_value=10.0)
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ):
-
-        mock_signal_repo = MockSignalRepo.return_value
-        mock_signal_repo.save = AsyncMock(
-            side_effect=Exception("Database write error")
-        )
+    mock_signal_repo = MockSignalRepo.return_value
+    mock_signal_repo.save = AsyncMock(
+        side_effect=Exception("Database write error")
+    )
 
-        with pytest.raises(Exception, match="Database write error"):
-            await trading_service.handle_signal(signal)
+    with pytest.raises(Exception, match="Database write error"):
+        await trading_service.handle_signal(signal)
 
 
 # ==================== TESTS DE ORDEN EJECUTADA ====================
 
 
 @pytest.mark.asyncio
-async def test_executed_order_has_correct_attributes(trading_service, mock_portfolio_service, mock_broker):
+async def test_executed_order_has_correct_attributes(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     La orden ejecutada debe tener los atributos correctos del broker.
     """
@@ -376,27 +356,24 @@ async def test_executed_order_has_correct_attributes(trading_service, mock_portf
 
     mock_broker.place_order = AsyncMock(side_effect=broker_execution)
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ) as MockOrderRepo:
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    MockOrderRepo = mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-        MockSignalRepo.return_value.save = AsyncMock()
-        mock_order_repo = MockOrderRepo.return_value
-        mock_order_repo.save = AsyncMock()
+    MockSignalRepo.return_value.save = AsyncMock()
+    mock_order_repo = MockOrderRepo.return_value
+    mock_order_repo.save = AsyncMock()
 
-        await trading_service.handle_signal(signal)
+    await trading_service.handle_signal(signal)
 
-        saved_order = mock_order_repo.save.call_args[0][0]
-        assert saved_order.broker_id == "BROKER-12345"
-        assert saved_order.average_fill_price == 251.50
-        assert saved_order.filled_quantity == 8.0
-        assert saved_order.status == OrderStatus.FILLED
+    saved_order = mock_order_repo.save.call_args[0][0]
+    assert saved_order.broker_id == "BROKER-12345"
+    assert saved_order.average_fill_price == 251.50
+    assert saved_order.filled_quantity == 8.0
+    assert saved_order.status == OrderStatus.FILLED
 
 
 @pytest.mark.asyncio
-async def test_partial_fill_order(trading_service, mock_portfolio_service, mock_broker):
+async def test_partial_fill_order(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     Orden parcialmente ejecutada debe reflejar el fill parcial.
     """
@@ -417,29 +394,26 @@ async def test_partial_fill_order(trading_service, mock_portfolio_service, mock_
 
     mock_broker.place_order = AsyncMock(side_effect=partial_fill)
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ) as MockOrderRepo:
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    MockOrderRepo = mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-        MockSignalRepo.return_value.save = AsyncMock()
-        mock_order_repo = MockOrderRepo.return_value
-        mock_order_repo.save = AsyncMock()
+    MockSignalRepo.return_value.save = AsyncMock()
+    mock_order_repo = MockOrderRepo.return_value
+    mock_order_repo.save = AsyncMock()
 
-        await trading_service.handle_signal(signal)
+    await trading_service.handle_signal(signal)
 
-        saved_order = mock_order_repo.save.call_args[0][0]
-        assert saved_order.status == OrderStatus.PARTIALLY_FILLED
-        assert saved_order.filled_quantity == 75.0
-        assert saved_order.quantity == 100.0
+    saved_order = mock_order_repo.save.call_args[0][0]
+    assert saved_order.status == OrderStatus.PARTIALLY_FILLED
+    assert saved_order.filled_quantity == 75.0
+    assert saved_order.quantity == 100.0
 
 
 # ==================== TESTS DE MÚLTIPLES SÍMBOLOS ====================
 
 
 @pytest.mark.asyncio
-async def test_multiple_signals_different_symbols(trading_service, mock_portfolio_service, mock_broker):
+async def test_multiple_signals_different_symbols(trading_service, mock_portfolio_service, mock_broker, mocker):
     """
     Múltiples señales para diferentes símbolos deben procesarse correctamente.
     """
@@ -464,20 +438,17 @@ async def test_multiple_signals_different_symbols(trading_service, mock_portfoli
     mock_portfolio_service.compute_order_size = AsyncMock(
         side_effect=dynamic_order_size)
 
-    with patch(
-        "src.domain.trading.trading_service.SignalRepository"
-    ) as MockSignalRepo, patch(
-        "src.domain.trading.trading_service.OrderRepository"
-    ) as MockOrderRepo:
+    MockSignalRepo = mocker.patch("src.domain.trading.trading_service.SignalRepository")
+    MockOrderRepo = mocker.patch("src.domain.trading.trading_service.OrderRepository")
 
-        MockSignalRepo.return_value.save = AsyncMock()
-        MockOrderRepo.return_value.save = AsyncMock()
+    MockSignalRepo.return_value.save = AsyncMock()
+    MockOrderRepo.return_value.save = AsyncMock()
 
-        for signal in signals:
-            await trading_service.handle_signal(signal)
+    for signal in signals:
+        await trading_service.handle_signal(signal)
 
-        assert mock_broker.place_order.call_count == 3
-        assert mock_portfolio_service.compute_order_size.call_count == 3
+    assert mock_broker.place_order.call_count == 3
+    assert mock_portfolio_service.compute_order_size.call_count == 3
 
 
 # ==================== TESTS DE SEÑALES EXIT/ALERT ====================
@@ -84,6 +84,17 @@ class Settings(BaseSettings):
     scheduler_enabled: bool = Field(default=True)
     scheduler_timezone: str = Field(default="UTC")
 
+    # ============= BACKTESTING =============
+    backtest_max_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Processes for research backtests (1 = sequential)"
+    )
+    backtest_vectorized: bool = Field(
+        default=False,
+        description="Use the vectorized engine for strategies that support it"
+    )
+
     # ============ IOL CREDENTIALS =============
     iol_username: str = Field(
         ...,
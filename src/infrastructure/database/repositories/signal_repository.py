@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Mapping
 from typing import List, Optional
 from datetime import datetime
 
@@ -130,7 +131,7 @@ class SignalRepository:
         if isinstance(value, np.bool_):
             return bool(value)
 
-        if isinstance(value, dict):
+        if isinstance(value, Mapping):
             return {k: self._to_jsonable(v) for k, v in value.items()}
 
         if isinstance(value, (list, set, tuple)):
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, Union
+from typing import List, Optional, Union
 from datetime import datetime, date, timedelta
 import math
 
@@ -150,6 +150,65 @@ class SymbolStrategyRepository:
         # Desactivar anteriores
         await self.deactivate_all_for_symbol(symbol, timeframe)
 
+        model = self._build_model(
+            symbol=symbol,
+            timeframe=timeframe,
+            strategy_name=strategy_name,
+            params=params,
+            metrics=metrics,
+        )
+
+        self.session.add(model)
+        await self.session.commit()
+        await self.session.refresh(model)
+
+        self._log_saved(model)
+
+        return model
+
+    async def upsert_best_strategies(
+        self,
+        *,
+        timeframe: str,
+        rows: List[dict],
+    ) -> List[SymbolStrategyModel]:
+        """
+        Versión batch de upsert_best_strategy para muchos símbolos: un solo
+        UPDATE que desactiva las anteriores, un add_all y un único commit.
+        Cada row trae symbol / strategy_name / params / metrics.
+        """
+        if not rows:
+            return []
+
+        stmt = (
+            update(SymbolStrategyModel)
+            .where(
+                SymbolStrategyModel.symbol.in_([row["symbol"] for row in rows]),
+                SymbolStrategyModel.timeframe == timeframe,
+                SymbolStrategyModel.is_active.is_(True),
+            )
+            .values(is_active=False)
+        )
+        await self.session.execute(stmt)
+
+        models = [self._build_model(timeframe=timeframe, **row) for row in rows]
+        self.session.add_all(models)
+        await self.session.commit()
+
+        for model in models:
+            self._log_saved(model)
+
+        return models
+
+    def _build_model(
+        self,
+        *,
+        symbol: str,
+        timeframe: str,
+        strategy_name: str,
+        params: Union[StrategyParamsDTO, dict, None],
+        metrics: dict,
+    ) -> SymbolStrategyModel:
         # Métricas agregadas que usamos en columnas dedicadas
         sharpe = float(metrics.get("Sharpe Ratio", 0) or 0)
         max_dd = float(metrics.get("Max. Drawdown [%]", 0) or 0)
@@ -172,7 +231,7 @@ class SymbolStrategyRepository:
         params_json = self._to_jsonable(params_dict)
         metrics_json = self._to_jsonable(metrics_clean)
 
-        model = SymbolStrategyModel(
+        return SymbolStrategyModel(
             symbol=symbol,
             timeframe=timeframe,
             strategy_name=strategy_name,
@@ -184,17 +243,14 @@ class SymbolStrategyRepository:
             is_active=True,
         )
 
-        self.session.add(model)
-        await self.session.commit()
-        await self.session.refresh(model)
-
+    @staticmethod
+    def _log_saved(model: SymbolStrategyModel) -> None:
         logger.info(
-            f"💾 Saved best strategy for {symbol}/{timeframe}: "
-            f"{strategy_name} (Sharpe={sharpe:.2f}, Ret={ret_pct:.2f}%, DD={max_dd:.2f}%)"
+            f"💾 Saved best strategy for {model.symbol}/{model.timeframe}: "
+            f"{model.strategy_name} (Sharpe={model.sharpe_ratio:.2f}, "
+            f"Ret={model.return_pct:.2f}%, DD={model.max_drawdown_pct:.2f}%)"
         )
 
-        return model
-
     # ==========================
     #   JSON NORMALIZATION
     # ==========================